@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from infra.metrics import registry
+from services.auth_service import verify_api_key
+
+router = APIRouter(tags=['metrics'], dependencies=[Depends(verify_api_key)])
+
+
+@router.get(
+    '/metrics',
+    summary='Prometheus metrics',
+    description='Request, upstream, cache, sort and expansion metrics '
+    'in the Prometheus text exposition format.',
+    response_class=PlainTextResponse,
+)
+async def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        generate_latest(registry), media_type=CONTENT_TYPE_LATEST
+    )
@@ -1,19 +1,34 @@
 from http import HTTPStatus
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Body, Depends, Header, Query, Response
 
 from exceptions.errors import (
     BadRequestError,
     InternalServerError,
     NotFoundError,
+    ServiceUnavailableError,
+    TooManyRequestsError,
     UnauthorizedError,
     UnprocessableEntityError,
 )
-from schemas.examples.swapi_router_examples import SWAPI_EXAMPLES
+from infra.http_cache import (
+    EncodedBodyCache,
+    cache_control,
+    conditional_response,
+    etag_matches,
+    get_encoded_body_cache,
+    not_modified_response,
+)
+from schemas.examples.swapi_router_examples import (
+    SWAPI_BATCH_EXAMPLES,
+    SWAPI_EXAMPLES,
+)
+from schemas.swapi_batch_schema import SwapiBatchRequest, SwapiBatchResponse
 from schemas.swapi_query_params_schema import SwapiQueryParams
 from schemas.swapi_resources_schema import SwapiResponse
 from services.auth_service import verify_api_key
+from services.batch_swapi_data_service import BatchSwapiDataService
 from services.swapi_data_service import SwapiDataService
 
 SWAPI_RESPONSES: dict[int | str, dict[str, Any]] = {
@@ -22,6 +37,9 @@ SWAPI_RESPONSES: dict[int | str, dict[str, Any]] = {
         'description': 'SWAPI resource data. '
         'See [SWAPI docs](https://swapi.dev/documentation) for details.',
     },
+    HTTPStatus.NOT_MODIFIED: {
+        'description': 'The body matching If-None-Match has not changed',
+    },
     HTTPStatus.UNAUTHORIZED: {
         'model': UnauthorizedError.schema(),
         'description': 'Invalid or missing API key',
@@ -42,6 +60,14 @@ SWAPI_RESPONSES: dict[int | str, dict[str, Any]] = {
         'model': UnprocessableEntityError.schema(),
         'description': 'Unprocessable entity',
     },
+    HTTPStatus.TOO_MANY_REQUESTS: {
+        'model': TooManyRequestsError.schema(),
+        'description': 'Rate limit of the API key exceeded, see Retry-After',
+    },
+    HTTPStatus.SERVICE_UNAVAILABLE: {
+        'model': ServiceUnavailableError.schema(),
+        'description': 'SWAPI is failing and no cached copy is available',
+    },
 }
 
 router = APIRouter(
@@ -63,5 +89,58 @@ async def get_swapi_data(
     params: Annotated[
         SwapiQueryParams, Query(openapi_examples=SWAPI_EXAMPLES)
     ],
-) -> dict[str, Any]:
-    return await service.get_swapi_data(params)
+    encoded_cache: Annotated[
+        EncodedBodyCache, Depends(get_encoded_body_cache)
+    ],
+    if_none_match: Annotated[
+        str | None, Header(include_in_schema=False)
+    ] = None,
+    accept_encoding: Annotated[
+        str | None, Header(include_in_schema=False)
+    ] = None,
+) -> Response:
+    validator = service.get_validator(params)
+    if validator is not None and etag_matches(if_none_match, validator.etag):
+        return not_modified_response(
+            validator,
+            encoded_cache,
+            accept_encoding,
+            {'Cache-Control': cache_control(validator.fresh_until)},
+        )
+
+    body = await service.get_swapi_body(params)
+    headers = {'Cache-Control': cache_control(body.fresh_until)}
+    if service.cache_status is not None:
+        headers['X-Cache-Status'] = service.cache_status
+    return conditional_response(
+        body, encoded_cache, if_none_match, accept_encoding, headers
+    )
+
+
+@router.post(
+    '/batch',
+    summary='Query several SWAPI resources at once',
+    description='Resolve many SWAPI queries concurrently in one request. '
+    'Identical queries are resolved once and results keep the request '
+    'order, each with its own status and error.',
+    responses={
+        HTTPStatus.OK: {
+            'model': SwapiBatchResponse,
+            'description': 'Per-query results in request order',
+        },
+        HTTPStatus.UNAUTHORIZED: SWAPI_RESPONSES[HTTPStatus.UNAUTHORIZED],
+        HTTPStatus.TOO_MANY_REQUESTS: SWAPI_RESPONSES[
+            HTTPStatus.TOO_MANY_REQUESTS
+        ],
+        HTTPStatus.UNPROCESSABLE_ENTITY: SWAPI_RESPONSES[
+            HTTPStatus.UNPROCESSABLE_ENTITY
+        ],
+    },
+)
+async def get_swapi_batch(
+    service: Annotated[BatchSwapiDataService, Depends()],
+    batch: Annotated[
+        SwapiBatchRequest, Body(openapi_examples=SWAPI_BATCH_EXAMPLES)
+    ],
+) -> SwapiBatchResponse:
+    return await service.get_batch(batch.queries)
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import math
+import random
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Self
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.upstream_stub import StubRequest, StubServer
+from repositories.snapshot_repository import SnapshotRepository
+from schemas.swapi_query_params_schema import SwapiResource
+from services.pagination import SWAPI_PAGE_SIZE
+
+SWAPI_URL = 'https://swapi.dev/api/'
+
+RESOURCE_COUNTS = {
+    SwapiResource.PEOPLE: 82,
+    SwapiResource.PLANETS: 60,
+    SwapiResource.FILMS: 6,
+    SwapiResource.SPECIES: 37,
+    SwapiResource.VEHICLES: 39,
+    SwapiResource.STARSHIPS: 36,
+}
+
+_SEARCH_FIELDS = ('name', 'title', 'model')
+
+
+def _links(
+    rng: random.Random, resource: SwapiResource, count: int
+) -> list[str]:
+    ids = rng.sample(range(1, RESOURCE_COUNTS[resource] + 1), count)
+    return [f'{SWAPI_URL}{resource.value}/{item_id}/' for item_id in ids]
+
+
+def _record(
+    rng: random.Random, resource: SwapiResource, item_id: int
+) -> dict[str, Any]:
+    name = f'{resource.value.title()} {item_id}'
+    record: dict[str, Any] = {
+        'title' if resource == SwapiResource.FILMS else 'name': name,
+        'url': f'{SWAPI_URL}{resource.value}/{item_id}/',
+        'created': '2014-12-09T13:50:51.644000Z',
+        'edited': '2014-12-20T21:17:56.891000Z',
+    }
+    match resource:
+        case SwapiResource.PEOPLE:
+            record |= {
+                'height': str(rng.randint(60, 230)),
+                'mass': rng.choice(['unknown', str(rng.randint(20, 160))]),
+                'homeworld': _links(rng, SwapiResource.PLANETS, 1)[0],
+                'films': _links(rng, SwapiResource.FILMS, rng.randint(1, 4)),
+                'species': _links(rng, SwapiResource.SPECIES, 1),
+                'vehicles': _links(rng, SwapiResource.VEHICLES, 2),
+                'starships': _links(rng, SwapiResource.STARSHIPS, 2),
+            }
+        case SwapiResource.PLANETS:
+            record |= {
+                'diameter': str(rng.randint(0, 20000)),
+                'population': str(rng.randint(1000, 10**9)),
+                'residents': _links(rng, SwapiResource.PEOPLE, 3),
+                'films': _links(rng, SwapiResource.FILMS, 2),
+            }
+        case SwapiResource.FILMS:
+            record |= {
+                'episode_id': item_id,
+                'opening_crawl': 'It is a period of civil war. ' * 20,
+                'characters': _links(rng, SwapiResource.PEOPLE, 18),
+                'planets': _links(rng, SwapiResource.PLANETS, 3),
+            }
+        case _:
+            record |= {
+                'model': f'Model {item_id}',
+                'films': _links(rng, SwapiResource.FILMS, 2),
+            }
+    return record
+
+
+def generate_dataset(seed: int = 0) -> dict[str, list[dict[str, Any]]]:
+    rng = random.Random(seed)  # noqa: S311
+    return {
+        resource.value: [
+            _record(rng, resource, item_id) for item_id in range(1, count + 1)
+        ]
+        for resource, count in RESOURCE_COUNTS.items()
+    }
+
+
+def load_dataset(snapshot: Path | None) -> dict[str, list[dict[str, Any]]]:
+    if snapshot is not None and snapshot.exists():
+        return SnapshotRepository(snapshot).load()
+    return generate_dataset()
+
+
+class FakeSwapi(StubServer):
+    """Serves a full SWAPI dataset with configurable latency and errors."""
+
+    def __init__(
+        self,
+        dataset: dict[str, list[dict[str, Any]]],
+        *,
+        latency_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        super().__init__()
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.error_rate = error_rate
+        self.errors = 0
+        self._raw_dataset = dataset
+        self._dataset: dict[str, list[dict[str, Any]]] = {}
+        self._by_id: dict[tuple[str, str], bytes] = {}
+        self._random = random.Random(seed)  # noqa: S311
+
+    @property
+    def base_url(self) -> str:
+        return f'{self.address}/api/'
+
+    async def __aenter__(self) -> Self:
+        await super().__aenter__()
+        encoded = json.dumps(self._raw_dataset).replace(
+            SWAPI_URL, self.base_url
+        )
+        self._dataset = json.loads(encoded)
+        self._by_id = {
+            (resource, record['url'].rstrip('/').rsplit('/', 1)[-1]): (
+                json.dumps(record).encode()
+            )
+            for resource, records in self._dataset.items()
+            for record in records
+        }
+        return self
+
+    async def respond(self, request: StubRequest) -> tuple[int, bytes]:
+        delay = self.latency_seconds + self._random.uniform(
+            -self.jitter_seconds, self.jitter_seconds
+        )
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self._random.random() < self.error_rate:
+            self.errors += 1
+            return HTTPStatus.SERVICE_UNAVAILABLE, b'{"detail":"Unavailable"}'
+
+        url = urlsplit(request.target)
+        parts = url.path.strip('/').split('/')[1:]
+        if not parts or parts[0] not in self._dataset:
+            return HTTPStatus.NOT_FOUND, b'{"detail":"Not found"}'
+
+        if len(parts) > 1:
+            body = self._by_id.get((parts[0], parts[1]))
+            if body is None:
+                return HTTPStatus.NOT_FOUND, b'{"detail":"Not found"}'
+            return HTTPStatus.OK, body
+
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        return self._list(parts[0], query)
+
+    def _list(self, resource: str, query: dict[str, str]) -> tuple[int, bytes]:
+        records = self._dataset[resource]
+        term = query.get('search', '').lower()
+        if term:
+            records = [
+                record
+                for record in records
+                if any(
+                    term in str(record.get(field, '')).lower()
+                    for field in _SEARCH_FIELDS
+                )
+            ]
+
+        page = int(query.get('page', 1))
+        page_count = max(1, math.ceil(len(records) / SWAPI_PAGE_SIZE))
+        if page > page_count:
+            return HTTPStatus.NOT_FOUND, b'{"detail":"Not found"}'
+
+        start = (page - 1) * SWAPI_PAGE_SIZE
+        body = {
+            'count': len(records),
+            'next': self._page_url(resource, page + 1, term)
+            if page < page_count
+            else None,
+            'previous': self._page_url(resource, page - 1, term)
+            if page > 1
+            else None,
+            'results': records[start : start + SWAPI_PAGE_SIZE],
+        }
+        return HTTPStatus.OK, json.dumps(body).encode()
+
+    def _page_url(self, resource: str, page: int, term: str) -> str:
+        search = f'search={term}&' if term else ''
+        return f'{self.base_url}{resource}/?{search}page={page}'
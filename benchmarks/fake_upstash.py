@@ -0,0 +1,60 @@
+import asyncio
+import base64
+import json
+from http import HTTPStatus
+from typing import Any
+
+from fakeredis import FakeRedis
+
+from benchmarks.upstream_stub import StubRequest, StubServer
+
+
+def _encode(result: Any) -> Any:  # noqa: ANN401
+    if result is True:
+        return 'OK'
+    if isinstance(result, str) and result != 'OK':
+        return base64.b64encode(result.encode()).decode()
+    if isinstance(result, list):
+        return [_encode(item) for item in result]
+    return result
+
+
+class FakeUpstash(StubServer):
+    """Upstash REST API in front of an in-process fakeredis store."""
+
+    def __init__(self, token: str, latency_seconds: float = 0.0) -> None:
+        super().__init__()
+        self.token = token
+        self.latency_seconds = latency_seconds
+        self.store = FakeRedis(decode_responses=True)
+
+    async def respond(self, request: StubRequest) -> tuple[int, bytes]:
+        if request.headers.get('authorization') != f'Bearer {self.token}':
+            return HTTPStatus.UNAUTHORIZED, b'{"error":"Unauthorized"}'
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+        base64_encoded = request.headers.get('upstash-encoding') == 'base64'
+        commands = json.loads(request.body)
+        if request.target.rstrip('/').endswith('/pipeline'):
+            results = [
+                self._execute(c, base64_encoded=base64_encoded)
+                for c in commands
+            ]
+            return HTTPStatus.OK, json.dumps(results).encode()
+        return HTTPStatus.OK, json.dumps(
+            self._execute(commands, base64_encoded=base64_encoded)
+        ).encode()
+
+    def _execute(
+        self, command: list[Any], *, base64_encoded: bool
+    ) -> dict[str, Any]:
+        try:
+            result = self.store.execute_command(*command)
+        except Exception as e:  # noqa: BLE001
+            return {'error': str(e)}
+        if base64_encoded:
+            result = _encode(result)
+        elif result is True:
+            result = 'OK'
+        return {'result': result}
@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from benchmarks.upstream_stub import UpstreamStub
+from infra.http_client import create_http_client
+
+
+async def _measure(
+    requests: int,
+    concurrency: int,
+    call: Callable[[], Awaitable[httpx.Response]],
+) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def run_one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await call()
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[run_one() for _ in range(requests)])
+    return latencies
+
+
+async def _bench_client_per_request(
+    requests: int, concurrency: int, latency: float
+) -> tuple[list[float], UpstreamStub]:
+    async with UpstreamStub(latency) as upstream:
+        url = f'{upstream.base_url}people/'
+
+        async def call() -> httpx.Response:
+            async with httpx.AsyncClient() as client:
+                return await client.get(url)
+
+        return await _measure(requests, concurrency, call), upstream
+
+
+async def _bench_shared_client(
+    requests: int, concurrency: int, latency: float
+) -> tuple[list[float], UpstreamStub]:
+    async with UpstreamStub(latency) as upstream, create_http_client() as c:
+        url = f'{upstream.base_url}people/'
+
+        async def call() -> httpx.Response:
+            return await c.get(url)
+
+        return await _measure(requests, concurrency, call), upstream
+
+
+def _report(name: str, latencies: list[float], upstream: UpstreamStub) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(  # noqa: T201
+        f'{name:<20} requests={upstream.stats.requests:<6} '
+        f'connections={upstream.stats.connections:<6} '
+        f'p50={quantiles[49] * 1000:.2f}ms '
+        f'p95={quantiles[94] * 1000:.2f}ms'
+    )
+
+
+async def main(requests: int, concurrency: int, latency: float) -> None:
+    latencies, upstream = await _bench_client_per_request(
+        requests, concurrency, latency
+    )
+    _report('client-per-request', latencies, upstream)
+
+    latencies, upstream = await _bench_shared_client(
+        requests, concurrency, latency
+    )
+    _report('shared-client', latencies, upstream)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare per-request and shared httpx clients.'
+    )
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.latency))
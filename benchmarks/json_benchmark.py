@@ -0,0 +1,91 @@
+import argparse
+import json
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+
+from infra import json_codec
+
+
+def _expanded_person(number: int, films: int) -> dict[str, Any]:
+    film = {
+        'title': 'A New Hope',
+        'episode_id': 4,
+        'opening_crawl': 'It is a period of civil war. ' * 20,
+        'characters': [
+            f'https://swapi.dev/api/people/{n}/' for n in range(1, 40)
+        ],
+        'planets': [
+            f'https://swapi.dev/api/planets/{n}/' for n in range(1, 4)
+        ],
+        'url': 'https://swapi.dev/api/films/1/',
+    }
+    return {
+        'name': f'Person {number}',
+        'height': '172',
+        'mass': '77',
+        'homeworld': {
+            'name': 'Tatooine',
+            'residents': [
+                f'https://swapi.dev/api/people/{n}/' for n in range(1, 11)
+            ],
+            'url': 'https://swapi.dev/api/planets/1/',
+        },
+        'films': [film | {'episode_id': episode} for episode in range(films)],
+        'url': f'https://swapi.dev/api/people/{number}/',
+    }
+
+
+def _expand_all_page(people: int, films: int) -> dict[str, Any]:
+    return {
+        'count': 82,
+        'next': 'https://swapi.dev/api/people/?page=2',
+        'previous': None,
+        'results': [_expanded_person(n, films) for n in range(people)],
+    }
+
+
+def _time(fn: Callable[[], object], rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(people: int, films: int, rounds: int) -> None:
+    payload = _expand_all_page(people, films)
+    cached = json.dumps(payload)
+
+    paths: dict[str, Callable[[], object]] = {
+        'stdlib decode+encode': lambda: json.dumps(
+            jsonable_encoder(json.loads(cached))
+        ),
+        'codec decode+encode': lambda: json_codec.dumps_bytes(
+            json_codec.loads(cached)
+        ),
+        'raw cached body': cached.encode,
+    }
+
+    print(  # noqa: T201
+        f'expand=all page: {people} people x {films} films, '
+        f'{len(cached) / 1024:.0f} KiB, orjson={json_codec.orjson is not None}'
+    )
+    for name, path in paths.items():
+        seconds = _time(path, rounds)
+        print(f'{name:<22} {seconds * 1000:8.3f}ms')  # noqa: T201
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare JSON paths for cached expand=all responses'
+    )
+    parser.add_argument('--people', type=int, default=10)
+    parser.add_argument('--films', type=int, default=6)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+    main(args.people, args.films, args.rounds)
@@ -0,0 +1,373 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+from benchmarks.fake_swapi import FakeSwapi, load_dataset
+from benchmarks.fake_upstash import FakeUpstash
+from infra.settings import settings
+from schemas.swapi_query_params_schema import SwapiResource
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+UPSTASH_TOKEN = 'bench-token'  # noqa: S105
+API_KEY = 'bench-key'
+READY_TIMEOUT_SECONDS = 30.0
+
+type QueryParams = dict[str, str | int]
+type ScenarioParams = Callable[[int, list[int]], QueryParams]
+
+SEARCH_TERMS = ('a', 'sky', 'o', 'r2', 'people 1', 'da')
+
+SCENARIOS: dict[str, ScenarioParams] = {
+    'list': lambda n, _: {'resource': 'people', 'page': n % 9 + 1},
+    'id': lambda n, ids: {'resource': 'people', 'id': ids[n % len(ids)]},
+    'search': lambda n, _: {
+        'resource': 'people',
+        'search': SEARCH_TERMS[n % len(SEARCH_TERMS)],
+    },
+    'expand_all': lambda n, _: {
+        'resource': 'people',
+        'page': n % 9 + 1,
+        'expand': 'all',
+    },
+    'sort': lambda n, _: {
+        'resource': 'people',
+        'page': n % 9 + 1,
+        'sort_by': 'height',
+        'sort_order': 'desc',
+    },
+    'collection_sort': lambda n, _: {
+        'resource': 'people',
+        'page': n % 9 + 1,
+        'sort_by': 'height',
+        'sort_scope': 'collection',
+    },
+}
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    cache: str
+    requests: int
+    concurrency: int
+    errors: int
+    statuses: dict[str, int]
+    upstream_requests: int
+    seconds: float
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+@dataclass
+class StandIns:
+    swapi: FakeSwapi
+    upstash: FakeUpstash
+    people_ids: list[int]
+
+
+@dataclass
+class LoadTestConfig:
+    scenarios: list[str]
+    cache_modes: list[str]
+    requests: int
+    concurrency: int
+    latency: float
+    jitter: float
+    error_rate: float
+    redis_latency: float
+    workers: int
+    snapshot: str | None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+@asynccontextmanager
+async def run_app(
+    swapi: FakeSwapi, upstash: FakeUpstash, workers: int
+) -> AsyncIterator[str]:
+    """Runs ``main:app`` under uvicorn against the local stand-ins."""
+    port = _free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    env = os.environ | {
+        'SWAPI_BASE_URL': swapi.base_url,
+        'SWAPI_BACKEND': 'remote',
+        'API_GATEWAY_URL': base_url,
+        'CACHE_ENABLED': 'true',
+        'UPSTASH_REDIS_REST_URL': upstash.address,
+        'UPSTASH_REDIS_REST_TOKEN': UPSTASH_TOKEN,
+        'CACHE_WARMUP_ON_STARTUP': 'false',
+        'RATE_LIMIT_ENABLED': 'false',
+        'LOGURU_LEVEL': 'WARNING',
+    }
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        '-m',
+        'uvicorn',
+        'main:app',
+        '--port',
+        str(port),
+        '--workers',
+        str(workers),
+        '--log-level',
+        'warning',
+        env=env,
+    )
+    try:
+        await _wait_until_ready(base_url)
+        yield base_url
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+async def _wait_until_ready(base_url: str) -> None:
+    deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get(f'{base_url}/openapi.json')
+                if response.is_success:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    msg = f'API did not start at {base_url}'
+    raise TimeoutError(msg)
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    queries: list[QueryParams],
+    concurrency: int,
+) -> tuple[list[float], Counter[str], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    statuses: Counter[str] = Counter()
+
+    async def run_one(query: QueryParams) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.get('/api/v1/swapi', params=query)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[run_one(query) for query in queries])
+    return latencies, statuses, time.perf_counter() - started
+
+
+async def run_scenario(
+    name: str,
+    cache: str,
+    config: LoadTestConfig,
+    stand_ins: StandIns,
+) -> ScenarioResult:
+    swapi = stand_ins.swapi
+    stand_ins.upstash.store.flushall()
+    queries = [
+        SCENARIOS[name](n, stand_ins.people_ids)
+        for n in range(config.requests)
+    ]
+
+    async with (
+        run_app(swapi, stand_ins.upstash, config.workers) as base_url,
+        httpx.AsyncClient(
+            base_url=base_url,
+            headers={'X-API-Key': API_KEY},
+            timeout=settings.HTTP_TIMEOUT_SECONDS * 3,
+        ) as client,
+    ):
+        if cache == 'warm':
+            await _drive(client, queries, config.concurrency)
+
+        upstream_before = swapi.stats.requests
+        latencies, statuses, seconds = await _drive(
+            client, queries, config.concurrency
+        )
+
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    return ScenarioResult(
+        scenario=name,
+        cache=cache,
+        requests=len(latencies),
+        concurrency=config.concurrency,
+        errors=sum(
+            count
+            for status, count in statuses.items()
+            if not status.startswith('2')
+        ),
+        statuses=dict(statuses),
+        upstream_requests=swapi.stats.requests - upstream_before,
+        seconds=round(seconds, 3),
+        throughput_rps=round(len(latencies) / seconds, 1),
+        mean_ms=round(statistics.fmean(latencies) * 1000, 2),
+        p50_ms=round(quantiles[49] * 1000, 2),
+        p95_ms=round(quantiles[94] * 1000, 2),
+        p99_ms=round(quantiles[98] * 1000, 2),
+        max_ms=round(max(latencies) * 1000, 2),
+    )
+
+
+def _report(result: ScenarioResult, baseline: ScenarioResult | None) -> None:
+    line = (
+        f'{result.scenario:<16} {result.cache:<5} '
+        f'rps={result.throughput_rps:<8} '
+        f'p50={result.p50_ms:<8} p95={result.p95_ms:<8} '
+        f'p99={result.p99_ms:<8} errors={result.errors:<4} '
+        f'upstream={result.upstream_requests}'
+    )
+    if baseline is not None and baseline.p95_ms:
+        change = (result.p95_ms / baseline.p95_ms - 1) * 100
+        line += f' p95 vs baseline={change:+.1f}%'
+    print(line)  # noqa: T201
+
+
+def _load_baseline(path: Path | None) -> dict[tuple[str, str], ScenarioResult]:
+    if path is None:
+        return {}
+    data = json.loads(path.read_text())
+    return {
+        (item['scenario'], item['cache']): ScenarioResult(**item)
+        for item in data['results']
+    }
+
+
+async def main(
+    config: LoadTestConfig, output: Path | None, baseline: Path | None
+) -> Path:
+    dataset = load_dataset(Path(config.snapshot) if config.snapshot else None)
+    baseline_results = _load_baseline(baseline)
+    ids = [
+        int(record['url'].rstrip('/').rsplit('/', 1)[-1])
+        for record in dataset[SwapiResource.PEOPLE.value]
+    ]
+    results: list[ScenarioResult] = []
+
+    async with (
+        FakeSwapi(
+            dataset,
+            latency_seconds=config.latency,
+            jitter_seconds=config.jitter,
+            error_rate=config.error_rate,
+        ) as swapi,
+        FakeUpstash(UPSTASH_TOKEN, config.redis_latency) as upstash,
+    ):
+        stand_ins = StandIns(swapi, upstash, ids)
+        for name in config.scenarios:
+            for cache in config.cache_modes:
+                result = await run_scenario(name, cache, config, stand_ins)
+                _report(result, baseline_results.get((name, cache)))
+                results.append(result)
+
+    commit = _git_commit()
+    now = datetime.now(UTC)
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f'{now:%Y%m%dT%H%M%SZ}-{commit}.json'
+    output.write_text(
+        json.dumps(
+            {
+                'commit': commit,
+                'date': now.isoformat(),
+                'python': platform.python_version(),
+                'config': asdict(config),
+                'results': [asdict(result) for result in results],
+            },
+            indent=2,
+        )
+    )
+    print(f'Results saved to {output}')  # noqa: T201
+    return output
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Load test main:app against local SWAPI and Upstash '
+        'stand-ins.'
+    )
+    parser.add_argument(
+        '--scenario',
+        action='append',
+        choices=list(SCENARIOS),
+        help='scenario to run, may be repeated (default: all)',
+    )
+    parser.add_argument(
+        '--cache',
+        action='append',
+        choices=['cold', 'warm'],
+        help='cache state to run with, may be repeated (default: both)',
+    )
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--redis-latency', type=float, default=0.005)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument(
+        '--snapshot',
+        default=settings.SNAPSHOT_PATH,
+        help='SWAPI snapshot to serve, a synthetic dataset if missing',
+    )
+    parser.add_argument('--output', type=Path)
+    parser.add_argument(
+        '--baseline', type=Path, help='earlier results file to compare'
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(
+            LoadTestConfig(
+                scenarios=args.scenario or list(SCENARIOS),
+                cache_modes=args.cache or ['cold', 'warm'],
+                requests=args.requests,
+                concurrency=args.concurrency,
+                latency=args.latency,
+                jitter=args.jitter,
+                error_rate=args.error_rate,
+                redis_latency=args.redis_latency,
+                workers=args.workers,
+                snapshot=args.snapshot,
+            ),
+            args.output,
+            args.baseline,
+        )
+    )
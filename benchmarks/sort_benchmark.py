@@ -0,0 +1,98 @@
+import argparse
+import random
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from schemas.swapi_query_params_schema import SortOrder
+from services.sort_swapi_data_service import SortColumn
+
+INVALID_VALUES = (None, 'unknown', 'n/a')
+
+
+def row_sort_positions(
+    results: list[dict[str, Any]], sort_by: str, sort_order: SortOrder
+) -> list[int]:
+    """The row-by-row sort ``SortColumn`` replaced, as a reference."""
+
+    def sort_key(value: object) -> float | str:
+        if isinstance(value, str):
+            try:
+                return float(value.replace(',', ''))
+            except ValueError:
+                return value.lower()
+        return float(value) if isinstance(value, int | float) else 0.0
+
+    valid = [
+        (position, item)
+        for position, item in enumerate(results)
+        if item.get(sort_by) not in INVALID_VALUES
+    ]
+    invalid = [
+        position
+        for position, item in enumerate(results)
+        if item.get(sort_by) in INVALID_VALUES
+    ]
+    valid.sort(
+        key=lambda entry: sort_key(entry[1][sort_by]),
+        reverse=sort_order == SortOrder.DESC,
+    )
+    return [position for position, _ in valid] + invalid
+
+
+def make_records(count: int) -> list[dict[str, Any]]:
+    rng = random.Random(count)  # noqa: S311
+    return [
+        {
+            'name': f'Person {rng.randrange(count * 10)}',
+            'population': rng.choice(
+                ['unknown', 'n/a', f'{rng.randrange(10**9):,}']
+            ),
+        }
+        for _ in range(count)
+    ]
+
+
+def _time(fn: Callable[[], object], rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _paths(
+    records: list[dict[str, Any]], sort_by: str
+) -> dict[str, Callable[[], object]]:
+    column = SortColumn.from_records(records, sort_by)
+    return {
+        'row': lambda: row_sort_positions(records, sort_by, SortOrder.DESC),
+        'columnar cold': lambda: SortColumn.from_records(
+            records, sort_by
+        ).argsort(SortOrder.DESC),
+        'columnar warm': lambda: column.argsort(SortOrder.DESC),
+    }
+
+
+def main(sizes: list[int], rounds: int) -> None:
+    for size in sizes:
+        records = make_records(size)
+        for sort_by in ('name', 'population'):
+            print(f'{sort_by} x {size}:')  # noqa: T201
+            for name, path in _paths(records, sort_by).items():
+                seconds = _time(path, rounds)
+                print(f'  {name:<14} {seconds * 1000:8.3f}ms')  # noqa: T201
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare row and columnar sorts of SWAPI results'
+    )
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[100, 10_000, 100_000]
+    )
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    main(args.sizes, args.rounds)
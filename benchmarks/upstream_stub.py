@@ -0,0 +1,118 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Self
+
+_RESPONSE_BODY = json.dumps(
+    {'count': 1, 'next': None, 'previous': None, 'results': []}
+).encode()
+
+
+@dataclass
+class UpstreamStats:
+    connections: int = 0
+    requests: int = 0
+
+
+@dataclass
+class StubRequest:
+    method: str
+    target: str
+    headers: dict[str, str]
+    body: bytes
+
+
+class StubServer:
+    """Minimal HTTP/1.1 keep-alive server for benchmark stand-ins."""
+
+    def __init__(self) -> None:
+        self.stats = UpstreamStats()
+        self._server: asyncio.Server | None = None
+
+    @property
+    def address(self) -> str:
+        if self._server is None:
+            msg = f'{type(self).__name__} is not running'
+            raise RuntimeError(msg)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f'http://{host}:{port}'
+
+    async def __aenter__(self) -> Self:
+        self._server = await asyncio.start_server(
+            self._handle_connection, '127.0.0.1', 0
+        )
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def respond(self, request: StubRequest) -> tuple[int, bytes]:
+        raise NotImplementedError
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.stats.connections += 1
+        try:
+            while (request := await self._read_request(reader)) is not None:
+                self.stats.requests += 1
+                status, body = await self.respond(request)
+                writer.write(
+                    b'HTTP/1.1 %d %s\r\n'
+                    b'Content-Type: application/json\r\n'
+                    b'Connection: keep-alive\r\n'
+                    b'Content-Length: %d\r\n\r\n%s'
+                    % (
+                        status,
+                        HTTPStatus(status).phrase.encode(),
+                        len(body),
+                        body,
+                    )
+                )
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> StubRequest | None:
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        if not head.strip():
+            return None
+
+        request_line, *header_lines = head.decode('latin-1').split('\r\n')
+        method, target, _ = request_line.split(' ', 2)
+        headers = {
+            name.strip().lower(): value.strip()
+            for name, _, value in (
+                line.partition(':') for line in header_lines if line
+            )
+        }
+        length = int(headers.get('content-length', 0))
+        body = await reader.readexactly(length) if length else b''
+        return StubRequest(method, target, headers, body)
+
+
+class UpstreamStub(StubServer):
+    """Answers every request with the same empty SWAPI list."""
+
+    def __init__(self, latency_seconds: float = 0.0) -> None:
+        super().__init__()
+        self.latency_seconds = latency_seconds
+
+    @property
+    def base_url(self) -> str:
+        return f'{self.address}/api/'
+
+    async def respond(self, request: StubRequest) -> tuple[int, bytes]:  # noqa: ARG002
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return HTTPStatus.OK, _RESPONSE_BODY
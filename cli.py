@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+from infra.http_client import create_http_client
+from infra.settings import settings
+from repositories.snapshot_repository import SnapshotRepository
+from services.cache_warmup_service import create_cache_warmup_service
+from services.snapshot_crawler_service import SnapshotCrawlerService
+
+
+async def build_snapshot(output: Path) -> None:
+    async with create_http_client() as http_client:
+        crawler = SnapshotCrawlerService(
+            http_client, SnapshotRepository(output)
+        )
+        await crawler.build_snapshot()
+
+
+async def warm_cache(*, force: bool) -> None:
+    async with create_http_client() as http_client:
+        await create_cache_warmup_service(http_client).warm(force=force)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Star Wars Function API')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    snapshot = commands.add_parser(
+        'snapshot', help='crawl every SWAPI resource into a local snapshot'
+    )
+    snapshot.add_argument(
+        '--output', type=Path, default=Path(settings.SNAPSHOT_PATH)
+    )
+
+    warmup = commands.add_parser(
+        'warmup', help='pre-load every SWAPI resource into the cache'
+    )
+    warmup.add_argument(
+        '--force',
+        action='store_true',
+        help='warm resources already marked as warm',
+    )
+
+    args = parser.parse_args()
+    if args.command == 'snapshot':
+        asyncio.run(build_snapshot(args.output))
+    elif args.command == 'warmup':
+        asyncio.run(warm_cache(force=args.force))
+
+
+if __name__ == '__main__':
+    main()
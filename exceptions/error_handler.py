@@ -1,3 +1,4 @@
+import math
 from http import HTTPStatus
 
 from fastapi import FastAPI, Request
@@ -14,7 +15,9 @@ from exceptions.errors import (
     InternalServerError,
     MethodNotAllowedError,
     NotFoundError,
+    ServiceUnavailableError,
 )
+from infra.circuit_breaker import CircuitOpenError
 
 _HTTP_EXCEPTION_MAPPING = {
     HTTPStatus.BAD_REQUEST.value: BadRequestError,
@@ -31,10 +34,21 @@ def _create_error_from_httpx(exc: HTTPError) -> BaseError:
             status_code, InternalServerError
         )
         return error_class()
+    if isinstance(exc, CircuitOpenError):
+        retry_after = str(max(1, math.ceil(exc.retry_after)))
+        return ServiceUnavailableError(headers={'Retry-After': retry_after})
 
     return InternalServerError()
 
 
+def to_base_error(exc: Exception) -> BaseError:
+    if isinstance(exc, BaseError):
+        return exc
+    if isinstance(exc, HTTPError):
+        return _create_error_from_httpx(exc)
+    return InternalServerError()
+
+
 async def __handle_base_error(
     request: Request,  # noqa: ARG001
     exc: BaseError,
@@ -43,6 +57,7 @@ async def __handle_base_error(
     return JSONResponse(
         status_code=exc.status_code,
         content={'error': type(exc).__name__, 'detail': exc.message},
+        headers=exc.headers,
     )
 
 
@@ -55,6 +70,7 @@ async def __handle_httpx_error(
     return JSONResponse(
         status_code=error.status_code,
         content={'error': type(error).__name__, 'detail': error.message},
+        headers=error.headers,
     )
 
 
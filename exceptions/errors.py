@@ -63,6 +63,36 @@ class InternalServerError(BaseError):
         super().__init__(message, status_code)
 
 
+class ConflictError(BaseError):
+    def __init__(
+        self,
+        message: str = HTTPStatus.CONFLICT.description,
+        status_code: int = HTTPStatus.CONFLICT,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(message, status_code, headers)
+
+
+class ServiceUnavailableError(BaseError):
+    def __init__(
+        self,
+        message: str = HTTPStatus.SERVICE_UNAVAILABLE.description,
+        status_code: int = HTTPStatus.SERVICE_UNAVAILABLE,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(message, status_code, headers)
+
+
+class TooManyRequestsError(BaseError):
+    def __init__(
+        self,
+        message: str = HTTPStatus.TOO_MANY_REQUESTS.description,
+        status_code: int = HTTPStatus.TOO_MANY_REQUESTS,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(message, status_code, headers)
+
+
 class UnauthorizedError(BaseError):
     def __init__(
         self,
@@ -0,0 +1,127 @@
+import base64
+import binascii
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Literal
+
+from infra.settings import settings
+
+type CacheCodec = Literal['zlib']
+
+CODEC_VERSION = 1
+
+_CODECS: dict[str, tuple[Callable[..., bytes], Callable[[bytes], bytes]]] = {
+    'zlib': (zlib.compress, zlib.decompress),
+}
+
+
+class CacheCompressor:
+    def __init__(
+        self,
+        codec: CacheCodec = 'zlib',
+        min_bytes: int = 1024,
+        level: int = 6,
+        *,
+        enabled: bool = True,
+    ) -> None:
+        self.codec = codec
+        self.min_bytes = min_bytes
+        self.level = level
+        self.enabled = enabled
+        self._prefix = f'{codec}:{CODEC_VERSION}:'
+
+    def pack(self, value: str) -> str:
+        raw = value.encode()
+        if not self.enabled or len(raw) < self.min_bytes:
+            return value
+
+        compress, _ = _CODECS[self.codec]
+        payload = base64.b64encode(compress(raw, self.level)).decode()
+        packed = f'{self._prefix}{payload}'
+        return packed if len(packed) < len(raw) else value
+
+    def unpack(self, value: str) -> str:
+        if value.startswith('{'):
+            return value
+
+        codec, version, payload = value.split(':', 2)
+        if codec not in _CODECS or version != str(CODEC_VERSION):
+            msg = f'Unknown cache codec {codec}:{version}'
+            raise ValueError(msg)
+
+        _, decompress = _CODECS[codec]
+        try:
+            return decompress(base64.b64decode(payload)).decode()
+        except (binascii.Error, zlib.error) as e:
+            msg = f'Corrupt {codec} cache value: {e}'
+            raise ValueError(msg) from e
+
+
+@dataclass
+class CacheValueSize:
+    raw_bytes: int
+    stored_bytes: int
+
+    @property
+    def ratio(self) -> float:
+        return self.stored_bytes / self.raw_bytes if self.raw_bytes else 1.0
+
+
+@dataclass
+class CacheSizeTotals:
+    writes: int = 0
+    compressed: int = 0
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+
+
+class CacheSizeStats:
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self.totals = CacheSizeTotals()
+        self._sizes: OrderedDict[str, CacheValueSize] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def record(self, key: str, raw_bytes: int, stored_bytes: int) -> None:
+        self.totals.writes += 1
+        self.totals.raw_bytes += raw_bytes
+        self.totals.stored_bytes += stored_bytes
+        if stored_bytes != raw_bytes:
+            self.totals.compressed += 1
+
+        if self.max_keys <= 0:
+            return
+        self._sizes[key] = CacheValueSize(raw_bytes, stored_bytes)
+        self._sizes.move_to_end(key)
+        while len(self._sizes) > self.max_keys:
+            self._sizes.popitem(last=False)
+
+    def get(self, key: str) -> CacheValueSize | None:
+        return self._sizes.get(key)
+
+    def largest(self, limit: int = 10) -> list[tuple[str, CacheValueSize]]:
+        return sorted(
+            self._sizes.items(),
+            key=lambda item: item[1].stored_bytes,
+            reverse=True,
+        )[:limit]
+
+
+@lru_cache
+def get_cache_compressor() -> CacheCompressor:
+    return CacheCompressor(
+        codec=settings.CACHE_COMPRESSION_CODEC,
+        min_bytes=settings.CACHE_COMPRESSION_MIN_BYTES,
+        level=settings.CACHE_COMPRESSION_LEVEL,
+        enabled=settings.CACHE_COMPRESSION_ENABLED,
+    )
+
+
+@lru_cache
+def get_cache_size_stats() -> CacheSizeStats:
+    return CacheSizeStats(max_keys=settings.CACHE_SIZE_STATS_MAX_KEYS)
@@ -0,0 +1,119 @@
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Literal, Self
+
+from fastapi import Request
+from loguru import logger
+
+type CacheWriter = Callable[[dict[str, str]], Awaitable[bool]]
+
+
+@dataclass
+class CacheWriteQueueStats:
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+class CacheWriteQueue:
+    def __init__(
+        self,
+        writer: CacheWriter,
+        max_size: int,
+        batch_size: int,
+        policy: Literal['drop', 'block'] = 'drop',
+        flush_timeout: float = 5.0,
+    ) -> None:
+        self.batch_size = batch_size
+        self.policy = policy
+        self.flush_timeout = flush_timeout
+        self.stats = CacheWriteQueueStats()
+        self._writer = writer
+        self._queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue(max_size)
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    async def __aenter__(self) -> Self:
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def put(self, key: str, value: str) -> bool:
+        if self.policy == 'block':
+            await self._queue.put((key, value))
+        else:
+            try:
+                self._queue.put_nowait((key, value))
+            except asyncio.QueueFull:
+                self.stats.dropped += 1
+                logger.warning(f'Cache write queue full, dropping {key}')
+                return False
+
+        self.stats.enqueued += 1
+        return True
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), self.flush_timeout)
+        except TimeoutError:
+            logger.warning(
+                f'Cache write queue closed with {len(self)} pending writes'
+            )
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _next_batch(self) -> list[tuple[str, str]]:
+        batch = [await self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _write(self, batch: list[tuple[str, str]]) -> None:
+        values = dict(batch)
+        self.stats.batches += 1
+        try:
+            written = await self._writer(values)
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f'Cache write-behind error: {e}')
+            written = False
+
+        if written:
+            self.stats.written += len(values)
+        else:
+            self.stats.failed += len(values)
+
+
+def get_cache_write_queue(request: Request) -> CacheWriteQueue | None:
+    return getattr(request.app.state, 'cache_write_queue', None)
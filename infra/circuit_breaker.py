@@ -0,0 +1,181 @@
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from enum import Enum
+from functools import lru_cache
+
+import httpx
+from loguru import logger
+
+from infra.metrics import CIRCUIT_REJECTIONS, CIRCUIT_STATE
+from infra.settings import settings
+
+
+class CircuitState(str, Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+_STATE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2,
+}
+
+
+class CircuitOpenError(httpx.HTTPError):
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f'Circuit {name} is open')
+        self.retry_after = retry_after
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.is_server_error
+    return isinstance(exc, httpx.TransportError)
+
+
+class CircuitBreaker:
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        *,
+        window_size: int,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_seconds: float,
+        slow_call_rate: float,
+        open_seconds: float,
+        half_open_calls: int,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.enabled = enabled
+        self.clock = clock
+        self._outcomes: deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._rejections = CIRCUIT_REJECTIONS.labels(name)
+        self._state_gauge = CIRCUIT_STATE.labels(name)
+        self._state_gauge.set(_STATE_VALUES[self._state])
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and self.clock() - self._opened_at >= self.open_seconds
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.open_seconds - self.clock())
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        probe = self._acquire()
+        started = self.clock()
+        try:
+            yield
+        except Exception as exc:
+            failed = is_upstream_failure(exc)
+            self._record(self.clock() - started, failed=failed, probe=probe)
+            raise
+        except BaseException:
+            if probe:
+                self._release_probe()
+            raise
+        self._record(self.clock() - started, failed=False, probe=probe)
+
+    def _acquire(self) -> bool:
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return False
+        if state == CircuitState.HALF_OPEN and self._probes < (
+            self.half_open_calls - self._probe_successes
+        ):
+            self._probes += 1
+            return True
+
+        self._rejections.inc()
+        raise CircuitOpenError(self.name, self.retry_after)
+
+    def _release_probe(self) -> None:
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    def _record(self, seconds: float, *, failed: bool, probe: bool) -> None:
+        slow = seconds >= self.slow_call_seconds
+        if probe:
+            self._record_probe(failed=failed or slow)
+        elif self._state == CircuitState.CLOSED:
+            self._record_call(failed=failed, slow=slow)
+
+    def _record_probe(self, *, failed: bool) -> None:
+        if self._state != CircuitState.HALF_OPEN:
+            return
+        self._release_probe()
+        if failed:
+            self._open()
+            return
+        self._probe_successes += 1
+        if self._probe_successes >= self.half_open_calls:
+            self._transition(CircuitState.CLOSED)
+
+    def _record_call(self, *, failed: bool, slow: bool) -> None:
+        self._outcomes.append((failed, slow))
+        calls = len(self._outcomes)
+        if calls < self.min_calls:
+            return
+        failures = sum(failed for failed, _ in self._outcomes)
+        slow_calls = sum(slow for _, slow in self._outcomes)
+        if (
+            failures / calls >= self.failure_rate
+            or slow_calls / calls >= self.slow_call_rate
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self._opened_at = self.clock()
+        self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        logger.warning(
+            f'Circuit {self.name}: {self._state.value} -> {state.value}'
+        )
+        self._state = state
+        self._state_gauge.set(_STATE_VALUES[state])
+        self._outcomes.clear()
+        self._probes = 0
+        self._probe_successes = 0
+
+
+@lru_cache
+def get_circuit_breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        'swapi',
+        window_size=settings.CIRCUIT_BREAKER_WINDOW_SIZE,
+        min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+        failure_rate=settings.CIRCUIT_BREAKER_FAILURE_RATE,
+        slow_call_seconds=settings.CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate=settings.CIRCUIT_BREAKER_SLOW_CALL_RATE,
+        open_seconds=settings.CIRCUIT_BREAKER_OPEN_SECONDS,
+        half_open_calls=settings.CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+        enabled=settings.CIRCUIT_BREAKER_ENABLED,
+    )
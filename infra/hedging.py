@@ -0,0 +1,150 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+
+from infra.metrics import UPSTREAM_EXPAND, UPSTREAM_FETCH, UpstreamMetrics
+from infra.settings import settings
+
+_RECOMPUTE_EVERY = 10
+
+
+class LatencyTracker:
+    def __init__(
+        self, quantile: float, window_size: int, min_samples: int
+    ) -> None:
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window_size)
+        self._since_recompute = 0
+        self._threshold: float | None = None
+
+    @property
+    def threshold(self) -> float | None:
+        return self._threshold
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._since_recompute += 1
+        if (
+            self._since_recompute >= _RECOMPUTE_EVERY
+            and len(self._samples) >= self.min_samples
+        ):
+            ordered = sorted(self._samples)
+            self._threshold = ordered[int(self.quantile * (len(ordered) - 1))]
+            self._since_recompute = 0
+
+
+class HedgeBudget:
+    def __init__(self, ratio: float, burst: float) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+
+    def deposit(self) -> None:
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class Hedger:
+    def __init__(  # noqa: PLR0913
+        self,
+        metrics: UpstreamMetrics,
+        tracker: LatencyTracker,
+        budget: HedgeBudget,
+        *,
+        min_delay: float,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.metrics = metrics
+        self.tracker = tracker
+        self.budget = budget
+        self.min_delay = min_delay
+        self.enabled = enabled
+        self.clock = clock
+
+    @property
+    def delay(self) -> float | None:
+        threshold = self.tracker.threshold
+        return None if threshold is None else max(self.min_delay, threshold)
+
+    async def run[T](self, fn: Callable[[], Awaitable[T]]) -> T:
+        if not self.enabled:
+            return await fn()
+
+        self.budget.deposit()
+        delay = self.delay
+        primary = asyncio.ensure_future(self._timed(fn))
+        pending = {primary}
+        try:
+            if delay is not None:
+                await asyncio.wait(pending, timeout=delay)
+            if delay is None or primary.done() or not self.budget.withdraw():
+                return await primary
+
+            self.metrics.hedges.inc()
+            hedge = asyncio.ensure_future(fn())
+            pending.add(hedge)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                succeeded = [task for task in done if not task.exception()]
+                if succeeded or not pending:
+                    winner = (succeeded or list(done))[0]
+                    if winner is hedge and succeeded:
+                        self.metrics.hedge_wins.inc()
+                    return winner.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _timed[T](self, fn: Callable[[], Awaitable[T]]) -> T:
+        started = self.clock()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self.tracker.observe(self.clock() - started)
+            raise
+        self.tracker.observe(self.clock() - started)
+        return result
+
+
+@lru_cache
+def get_hedge_budget() -> HedgeBudget:
+    return HedgeBudget(
+        ratio=settings.HEDGE_BUDGET_RATIO, burst=settings.HEDGE_BUDGET_BURST
+    )
+
+
+def _create_hedger(metrics: UpstreamMetrics) -> Hedger:
+    hedger = Hedger(
+        metrics,
+        LatencyTracker(
+            quantile=settings.HEDGE_QUANTILE,
+            window_size=settings.HEDGE_WINDOW_SIZE,
+            min_samples=settings.HEDGE_MIN_SAMPLES,
+        ),
+        get_hedge_budget(),
+        min_delay=settings.HEDGE_MIN_DELAY_SECONDS,
+        enabled=settings.HEDGING_ENABLED,
+    )
+    metrics.hedge_delay.set_function(lambda: hedger.delay or 0.0)
+    return hedger
+
+
+@lru_cache
+def get_fetch_hedger() -> Hedger:
+    return _create_hedger(UPSTREAM_FETCH)
+
+
+@lru_cache
+def get_expand_hedger() -> Hedger:
+    return _create_hedger(UPSTREAM_EXPAND)
@@ -0,0 +1,163 @@
+import gzip
+import hashlib
+import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from http import HTTPStatus
+
+from fastapi import Response
+
+from infra.memory_cache import MemoryCache
+from infra.settings import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised without the fast extra
+    brotli = None
+
+
+@dataclass(frozen=True)
+class ResponseBody:
+    content: bytes
+    etag: str
+    fresh_until: float
+
+
+@dataclass(frozen=True)
+class ResponseValidator:
+    etag: str
+    size: int
+    fresh_until: float
+
+
+def _gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=settings.HTTP_GZIP_LEVEL, mtime=0)
+
+
+def _brotli(body: bytes) -> bytes:
+    assert brotli is not None
+    return brotli.compress(body, quality=settings.HTTP_BROTLI_QUALITY)
+
+
+_ENCODERS = {'br': _brotli, 'gzip': _gzip}
+
+
+def compute_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def variant_etag(etag: str, encoding: str | None) -> str:
+    return f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    if '*' in tags or etag in tags:
+        return True
+    return any(variant_etag(etag, encoding) in tags for encoding in _ENCODERS)
+
+
+def available_encodings() -> tuple[str, ...]:
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    if not accept_encoding:
+        return None
+
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.lower().split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+class EncodedBodyCache:
+    def __init__(self, cache: MemoryCache[bytes], min_bytes: int) -> None:
+        self.cache = cache
+        self.min_bytes = min_bytes
+
+    def select(self, size: int, accept_encoding: str | None) -> str | None:
+        if size < self.min_bytes:
+            return None
+        return choose_encoding(accept_encoding)
+
+    def encode(self, body: bytes, etag: str, encoding: str | None) -> bytes:
+        if encoding is None:
+            return body
+
+        cache_key = variant_etag(etag, encoding)
+        encoded = self.cache.get(cache_key)
+        if encoded is None:
+            encoded = _ENCODERS[encoding](body)
+            self.cache.set(cache_key, encoded)
+        return encoded
+
+
+@lru_cache
+def get_encoded_body_cache() -> EncodedBodyCache:
+    return EncodedBodyCache(
+        cache=MemoryCache(
+            max_items=settings.HTTP_ENCODED_CACHE_MAX_ITEMS,
+            max_bytes=settings.HTTP_ENCODED_CACHE_MAX_BYTES,
+            ttl_seconds=settings.CACHE_TTL_SECONDS,
+        ),
+        min_bytes=settings.HTTP_COMPRESSION_MIN_BYTES,
+    )
+
+
+def cache_control(fresh_until: float, now: float | None = None) -> str:
+    now = time.time() if now is None else now
+    max_age = max(0, math.ceil(fresh_until - now))
+    return f'private, max-age={max_age}'
+
+
+def not_modified_response(
+    validator: ResponseValidator,
+    encoded_cache: EncodedBodyCache,
+    accept_encoding: str | None,
+    headers: dict[str, str],
+) -> Response:
+    encoding = encoded_cache.select(validator.size, accept_encoding)
+    etag = variant_etag(validator.etag, encoding)
+    headers = headers | {'ETag': etag, 'Vary': 'Accept-Encoding'}
+    return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+
+def conditional_response(
+    body: ResponseBody,
+    encoded_cache: EncodedBodyCache,
+    if_none_match: str | None,
+    accept_encoding: str | None,
+    headers: dict[str, str],
+) -> Response:
+    if etag_matches(if_none_match, body.etag):
+        validator = ResponseValidator(
+            body.etag, len(body.content), body.fresh_until
+        )
+        return not_modified_response(
+            validator, encoded_cache, accept_encoding, headers
+        )
+
+    encoding = encoded_cache.select(len(body.content), accept_encoding)
+    etag = variant_etag(body.etag, encoding)
+    headers = headers | {'ETag': etag, 'Vary': 'Accept-Encoding'}
+
+    content = encoded_cache.encode(body.content, body.etag, encoding)
+    if encoding is not None:
+        headers['Content-Encoding'] = encoding
+    return Response(content, media_type='application/json', headers=headers)
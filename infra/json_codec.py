@@ -0,0 +1,25 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised without the fast extra
+    orjson = None
+
+
+def dumps(data: Any) -> str:  # noqa: ANN401
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(',', ':'))
+
+
+def dumps_bytes(data: Any) -> bytes:  # noqa: ANN401
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def loads(value: str | bytes) -> Any:  # noqa: ANN401
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
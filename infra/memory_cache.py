@@ -0,0 +1,96 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from infra.settings import settings
+
+
+def _size_bytes(value: str | bytes) -> int:
+    return len(value.encode() if isinstance(value, str) else value)
+
+
+@dataclass
+class MemoryCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class MemoryCache[V: (str, bytes)]:
+    def __init__(
+        self,
+        max_items: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.size_bytes = 0
+        self.stats = MemoryCacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, V, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value, _ = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: V) -> bool:
+        size = _size_bytes(value)
+        if self.max_items <= 0 or size > self.max_bytes:
+            return False
+
+        self._remove(key)
+        self._entries[key] = (self._clock() + self.ttl_seconds, value, size)
+        self.size_bytes += size
+        self._evict()
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[2]
+
+    def _evict(self) -> None:
+        while (
+            len(self._entries) > self.max_items
+            or self.size_bytes > self.max_bytes
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.size_bytes -= size
+            self.stats.evictions += 1
+
+
+@lru_cache
+def get_memory_cache() -> MemoryCache[str]:
+    return MemoryCache(
+        max_items=settings.MEMORY_CACHE_MAX_ITEMS,
+        max_bytes=settings.MEMORY_CACHE_MAX_BYTES,
+        ttl_seconds=min(
+            settings.MEMORY_CACHE_TTL_SECONDS, settings.CACHE_TTL_SECONDS
+        ),
+    )
@@ -0,0 +1,345 @@
+import asyncio
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    disable_created_metrics,
+)
+from prometheus_client.core import (
+    CounterMetricFamily,
+    GaugeMetricFamily,
+    Metric,
+)
+from prometheus_client.registry import Collector
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infra.cache_compression import CacheSizeStats
+from infra.cache_write_queue import CacheWriteQueue
+from infra.memory_cache import MemoryCache
+from infra.single_flight import SingleFlight
+from schemas.swapi_query_params_schema import SwapiResource
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CPU_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1)
+FANOUT_BUCKETS = (1, 5, 10, 25, 50, 100, 250)
+
+disable_created_metrics()
+registry = CollectorRegistry()
+
+REQUEST_LATENCY = Histogram(
+    'swapi_request_duration_seconds',
+    'End-to-end request latency by SWAPI resource.',
+    ('resource',),
+    buckets=LATENCY_BUCKETS,
+    registry=registry,
+)
+UPSTREAM_LATENCY = Histogram(
+    'swapi_upstream_request_duration_seconds',
+    'Latency of requests to SWAPI by call site.',
+    ('kind',),
+    buckets=LATENCY_BUCKETS,
+    registry=registry,
+)
+UPSTREAM_RESPONSES = Counter(
+    'swapi_upstream_responses_total',
+    'SWAPI responses by call site and status code.',
+    ('kind', 'status'),
+    registry=registry,
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    'swapi_upstream_in_flight',
+    'Requests to SWAPI awaiting a response.',
+    registry=registry,
+)
+UPSTREAM_RETRIES = Counter(
+    'swapi_upstream_retries_total',
+    'Requests to SWAPI retried after a transient failure.',
+    ('kind',),
+    registry=registry,
+)
+UPSTREAM_HEDGES = Counter(
+    'swapi_upstream_hedges_total',
+    'Hedged requests sent to SWAPI after the first one was slow.',
+    ('kind',),
+    registry=registry,
+)
+UPSTREAM_HEDGE_WINS = Counter(
+    'swapi_upstream_hedge_wins_total',
+    'Hedged requests that answered before the original request.',
+    ('kind',),
+    registry=registry,
+)
+UPSTREAM_HEDGE_DELAY = Gauge(
+    'swapi_upstream_hedge_delay_seconds',
+    'Current wait before a request to SWAPI is hedged.',
+    ('kind',),
+    registry=registry,
+)
+CIRCUIT_STATE = Gauge(
+    'swapi_circuit_state',
+    'Circuit breaker state: 0 closed, 1 half-open, 2 open.',
+    ('circuit',),
+    registry=registry,
+)
+CIRCUIT_REJECTIONS = Counter(
+    'swapi_circuit_rejections_total',
+    'Calls failed fast because the circuit was open.',
+    ('circuit',),
+    registry=registry,
+)
+RATE_LIMITED = Counter(
+    'swapi_rate_limited_requests_total',
+    'Requests rejected with 429 by the rate limiter.',
+    registry=registry,
+)
+API_KEY_LOOKUPS = Counter(
+    'swapi_api_key_lookups_total',
+    'API key validations by cache result.',
+    ('result',),
+    registry=registry,
+)
+CACHE_LOOKUPS = Counter(
+    'swapi_cache_lookups_total',
+    'Cache lookups by tier and result.',
+    ('tier', 'result'),
+    registry=registry,
+)
+SORT_CPU_SECONDS = Histogram(
+    'swapi_sort_cpu_seconds',
+    'CPU time spent sorting results.',
+    buckets=CPU_BUCKETS,
+    registry=registry,
+)
+EXPAND_CPU_SECONDS = Histogram(
+    'swapi_expand_cpu_seconds',
+    'CPU time spent collecting and replacing links during expansion.',
+    buckets=CPU_BUCKETS,
+    registry=registry,
+)
+EXPAND_FANOUT_SIZE = Histogram(
+    'swapi_expand_fanout',
+    'Distinct linked resources needed by one expansion.',
+    buckets=FANOUT_BUCKETS,
+    registry=registry,
+)
+MEMORY_CACHE_ITEMS = Gauge(
+    'swapi_memory_cache_items',
+    'Entries held by the in-memory cache.',
+    registry=registry,
+)
+MEMORY_CACHE_BYTES = Gauge(
+    'swapi_memory_cache_bytes',
+    'UTF-8 bytes held by the in-memory cache values.',
+    registry=registry,
+)
+CACHE_STORED_BYTES = Counter(
+    'swapi_cache_stored_bytes_total',
+    'Bytes written to Redis, before and after compression.',
+    ('form',),
+    registry=registry,
+)
+CACHE_WRITE_QUEUE_DEPTH = Gauge(
+    'swapi_cache_write_queue_depth',
+    'Cache writes waiting to be flushed.',
+    registry=registry,
+)
+
+MEMORY_HIT = CACHE_LOOKUPS.labels('memory', 'hit')
+MEMORY_MISS = CACHE_LOOKUPS.labels('memory', 'miss')
+REDIS_HIT = CACHE_LOOKUPS.labels('redis', 'hit')
+REDIS_MISS = CACHE_LOOKUPS.labels('redis', 'miss')
+CACHE_RAW_BYTES = CACHE_STORED_BYTES.labels('raw')
+CACHE_PACKED_BYTES = CACHE_STORED_BYTES.labels('stored')
+API_KEY_HIT = API_KEY_LOOKUPS.labels('hit')
+API_KEY_NEGATIVE_HIT = API_KEY_LOOKUPS.labels('negative_hit')
+API_KEY_MISS = API_KEY_LOOKUPS.labels('miss')
+
+
+@contextmanager
+def observe_duration(
+    histogram: Histogram, clock: Callable[[], float] = time.perf_counter
+) -> Iterator[None]:
+    started = clock()
+    try:
+        yield
+    finally:
+        histogram.observe(clock() - started)
+
+
+@dataclass
+class UpstreamCall:
+    status: int | None = None
+
+
+class UpstreamMetrics:
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self.latency = UPSTREAM_LATENCY.labels(kind)
+        self.errors = UPSTREAM_RESPONSES.labels(kind, 'error')
+        self.retries = UPSTREAM_RETRIES.labels(kind)
+        self.cancelled = UPSTREAM_RESPONSES.labels(kind, 'cancelled')
+        self.hedges = UPSTREAM_HEDGES.labels(kind)
+        self.hedge_wins = UPSTREAM_HEDGE_WINS.labels(kind)
+        self.hedge_delay = UPSTREAM_HEDGE_DELAY.labels(kind)
+        self._responses: dict[int, Counter] = {}
+
+    @contextmanager
+    def track(self) -> Iterator[UpstreamCall]:
+        call = UpstreamCall()
+        UPSTREAM_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            yield call
+        except asyncio.CancelledError:
+            UPSTREAM_IN_FLIGHT.dec()
+            self.cancelled.inc()
+            raise
+        except BaseException:
+            self._finish(started, call.status)
+            raise
+        self._finish(started, call.status)
+
+    def _finish(self, started: float, status: int | None) -> None:
+        self.latency.observe(time.perf_counter() - started)
+        UPSTREAM_IN_FLIGHT.dec()
+        self._count(status)
+
+    def _count(self, status: int | None) -> None:
+        if status is None:
+            self.errors.inc()
+            return
+
+        responses = self._responses.get(status)
+        if responses is None:
+            responses = UPSTREAM_RESPONSES.labels(self.kind, str(status))
+            self._responses[status] = responses
+        responses.inc()
+
+
+class RuntimeStatsCollector(Collector):
+    def __init__(self) -> None:
+        self.memory_cache: MemoryCache | None = None
+        self.single_flight: SingleFlight | None = None
+        self.write_queue: CacheWriteQueue | None = None
+        self.size_stats: CacheSizeStats | None = None
+
+    def collect(self) -> Iterator[Metric]:
+        if self.memory_cache is not None:
+            stats = self.memory_cache.stats
+            events = CounterMetricFamily(
+                'swapi_memory_cache_events',
+                'In-memory cache hits, misses, evictions and expirations.',
+                labels=('event',),
+            )
+            events.add_metric(('hit',), stats.hits)
+            events.add_metric(('miss',), stats.misses)
+            events.add_metric(('eviction',), stats.evictions)
+            events.add_metric(('expiration',), stats.expirations)
+            yield events
+
+        if self.single_flight is not None:
+            stats = self.single_flight.stats
+            calls = CounterMetricFamily(
+                'swapi_single_flight',
+                'Upstream fetches executed, and callers that joined one.',
+                labels=('result',),
+            )
+            calls.add_metric(('executed',), stats.executions)
+            calls.add_metric(('coalesced',), stats.coalesced)
+            yield calls
+
+        if self.write_queue is not None:
+            stats = self.write_queue.stats
+            writes = CounterMetricFamily(
+                'swapi_cache_writes',
+                'Write-behind cache entries written, dropped or failed.',
+                labels=('result',),
+            )
+            writes.add_metric(('written',), stats.written)
+            writes.add_metric(('dropped',), stats.dropped)
+            writes.add_metric(('failed',), stats.failed)
+            yield writes
+
+        if self.size_stats is not None:
+            largest = GaugeMetricFamily(
+                'swapi_cache_largest_value_bytes',
+                'Sizes of the largest recently written Redis values.',
+                labels=('key', 'form'),
+            )
+            for key, size in self.size_stats.largest():
+                largest.add_metric((key, 'raw'), size.raw_bytes)
+                largest.add_metric((key, 'stored'), size.stored_bytes)
+            yield largest
+
+
+RUNTIME_STATS = RuntimeStatsCollector()
+registry.register(RUNTIME_STATS)
+
+
+def bind_runtime_metrics(
+    memory_cache: MemoryCache,
+    single_flight: SingleFlight,
+    size_stats: CacheSizeStats,
+    write_queue: CacheWriteQueue | None,
+) -> None:
+    RUNTIME_STATS.memory_cache = memory_cache
+    RUNTIME_STATS.single_flight = single_flight
+    RUNTIME_STATS.size_stats = size_stats
+    RUNTIME_STATS.write_queue = write_queue
+    MEMORY_CACHE_ITEMS.set_function(lambda: len(memory_cache))
+    MEMORY_CACHE_BYTES.set_function(lambda: memory_cache.size_bytes)
+    if write_queue is not None:
+        CACHE_WRITE_QUEUE_DEPTH.set_function(lambda: len(write_queue))
+
+
+UPSTREAM_FETCH = UpstreamMetrics('fetch')
+UPSTREAM_EXPAND = UpstreamMetrics('expand')
+
+_REQUEST_LATENCY_BY_RESOURCE = {
+    resource.value.encode(): REQUEST_LATENCY.labels(resource.value)
+    for resource in SwapiResource
+}
+_REQUEST_LATENCY_BATCH = REQUEST_LATENCY.labels('batch')
+_REQUEST_LATENCY_OTHER = REQUEST_LATENCY.labels('other')
+
+
+def _request_latency(scope: Scope) -> Histogram:
+    if scope['path'].endswith('/batch'):
+        return _REQUEST_LATENCY_BATCH
+
+    for pair in scope['query_string'].split(b'&'):
+        name, _, value = pair.partition(b'=')
+        if name == b'resource':
+            return _REQUEST_LATENCY_BY_RESOURCE.get(
+                value, _REQUEST_LATENCY_OTHER
+            )
+    return _REQUEST_LATENCY_OTHER
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+
+        async def send_and_time(message: Message) -> None:
+            await send(message)
+            if message['type'] == 'http.response.body' and not message.get(
+                'more_body'
+            ):
+                _request_latency(scope).observe(time.perf_counter() - started)
+
+        await self.app(scope, receive, send_and_time)
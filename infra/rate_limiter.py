@@ -0,0 +1,223 @@
+import asyncio
+import contextlib
+import math
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Self
+
+from fastapi import Request
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from upstash_redis.asyncio import Redis as AsyncRedis
+
+from infra.metrics import RATE_LIMITED
+from infra.redis_client import get_redis_client
+from infra.settings import settings
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int
+    window_seconds: int
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            'RateLimit-Limit': str(self.limit),
+            'RateLimit-Remaining': str(self.remaining),
+            'RateLimit-Reset': str(self.reset_seconds),
+            'RateLimit-Policy': f'{self.limit};w={self.window_seconds}',
+        }
+        if not self.allowed:
+            headers['Retry-After'] = str(self.reset_seconds)
+        return headers
+
+
+@dataclass
+class _Bucket:
+    counts: dict[int, int] = field(default_factory=dict)
+    pending: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    def count(self, window: int) -> int:
+        return self.counts.get(window, 0) + self.pending.get(window, 0)
+
+    def prune(self, window: int) -> None:
+        for stale in [w for w in self.counts if w < window - 1]:
+            del self.counts[stale]
+        for stale in [w for w in self.pending if w < window - 1]:
+            del self.pending[stale]
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        client: AsyncRedis | None,
+        window_seconds: int,
+        sync_interval: float,
+        key_prefix: str = 'ratelimit:',
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.client = client
+        self.window_seconds = window_seconds
+        self.sync_interval = sync_interval
+        self.key_prefix = key_prefix
+        self.clock = clock
+        self._buckets: defaultdict[str, _Bucket] = defaultdict(_Bucket)
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> Self:
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        try:
+            await self.sync()
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f'Rate limit sync error: {e}')
+
+    def check(self, key: str, limit: int) -> RateLimitDecision:
+        now = self.clock()
+        window, offset = divmod(now, self.window_seconds)
+        window = int(window)
+        overlap = 1 - offset / self.window_seconds
+        reset = math.ceil(self.window_seconds - offset)
+
+        bucket = self._buckets[key]
+        bucket.prune(window)
+        previous = bucket.count(window - 1)
+        current = bucket.count(window)
+        used = previous * overlap + current
+
+        if used + 1 > limit:
+            RATE_LIMITED.inc()
+            return RateLimitDecision(
+                allowed=False,
+                limit=limit,
+                remaining=0,
+                reset_seconds=self._retry_after(
+                    limit, previous, current, offset, reset
+                ),
+                window_seconds=self.window_seconds,
+            )
+
+        bucket.pending[window] += 1
+        return RateLimitDecision(
+            allowed=True,
+            limit=limit,
+            remaining=max(0, math.floor(limit - used - 1)),
+            reset_seconds=reset,
+            window_seconds=self.window_seconds,
+        )
+
+    def _retry_after(
+        self,
+        limit: int,
+        previous: int,
+        current: int,
+        offset: float,
+        reset: int,
+    ) -> int:
+        if current + 1 > limit or not previous:
+            return max(1, reset)
+        needed_overlap = (limit - 1 - current) / previous
+        wait = (1 - needed_overlap) * self.window_seconds - offset
+        return max(1, math.ceil(wait))
+
+    async def sync(self) -> None:
+        if self.client is not None:
+            await self._push(self.client)
+        self._prune()
+
+    async def _push(self, client: AsyncRedis) -> None:
+        batch: list[tuple[str, int, int]] = []
+        for key, bucket in self._buckets.items():
+            batch.extend(
+                (key, window, count)
+                for window, count in bucket.pending.items()
+                if count
+            )
+        if not batch:
+            return
+
+        pipeline = client.pipeline()
+        for key, window, count in batch:
+            redis_key = f'{self.key_prefix}{key}:{window}'
+            pipeline.incrby(redis_key, count)
+            pipeline.expire(redis_key, self.window_seconds * 2)
+        totals = await pipeline.exec()
+
+        for (key, window, count), total in zip(
+            batch, totals[::2], strict=True
+        ):
+            bucket = self._buckets[key]
+            bucket.pending[window] -= count
+            bucket.counts[window] = int(total)  # pyright: ignore[reportArgumentType]
+
+    def _prune(self) -> None:
+        window = int(self.clock() // self.window_seconds)
+        for key in list(self._buckets):
+            bucket = self._buckets[key]
+            bucket.prune(window)
+            if not (bucket.counts or any(bucket.pending.values())):
+                del self._buckets[key]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f'Rate limit sync error: {e}')
+
+
+def create_rate_limiter() -> RateLimiter:
+    return RateLimiter(
+        client=get_redis_client(),
+        window_seconds=settings.RATE_LIMIT_WINDOW_SECONDS,
+        sync_interval=settings.RATE_LIMIT_SYNC_INTERVAL_SECONDS,
+    )
+
+
+def get_rate_limiter(request: Request) -> RateLimiter:
+    return request.app.state.rate_limiter
+
+
+class RateLimitHeadersMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                decision = scope.get('state', {}).get('rate_limit')
+                if decision is not None and decision.allowed:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in decision.headers().items():
+                        headers.append(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,75 @@
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from http import HTTPStatus
+
+import httpx
+from loguru import logger
+from prometheus_client import Counter
+
+from infra.settings import settings
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+RETRYABLE_STATUSES = frozenset(
+    {
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+
+
+def is_transient(exc: httpx.HTTPError) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        retryable = exc.response.status_code in RETRYABLE_STATUSES
+    else:
+        retryable = isinstance(exc, httpx.TransportError)
+    return retryable and exc.request.method in IDEMPOTENT_METHODS
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        attempts: int,
+        base_delay: float,
+        max_delay: float,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng
+
+    def backoff(self, attempt: int) -> float:
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return self.rng() * ceiling
+
+    async def run[T](
+        self,
+        fn: Callable[[], Awaitable[T]],
+        retries: Counter | None = None,
+    ) -> T:
+        attempt = 1
+        while True:
+            try:
+                return await fn()
+            except httpx.HTTPError as exc:
+                if attempt >= self.attempts or not is_transient(exc):
+                    raise
+                delay = self.backoff(attempt)
+                logger.debug(f'Retrying in {delay:.3f}s after {exc!r}')
+
+            if retries is not None:
+                retries.inc()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+@lru_cache
+def get_retry_policy() -> RetryPolicy:
+    return RetryPolicy(
+        attempts=settings.UPSTREAM_RETRY_ATTEMPTS,
+        base_delay=settings.UPSTREAM_RETRY_BASE_DELAY_SECONDS,
+        max_delay=settings.UPSTREAM_RETRY_MAX_DELAY_SECONDS,
+    )
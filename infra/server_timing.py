@@ -0,0 +1,155 @@
+import cProfile
+import hmac
+import io
+import pstats
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from exceptions.errors import ConflictError
+from infra.settings import settings
+
+_timings: ContextVar[dict[str, float] | None] = ContextVar(
+    'server_timings', default=None
+)
+_profile_lock = threading.Lock()
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def format_server_timing(timings: dict[str, float]) -> str:
+    return ', '.join(
+        f'{name};dur={seconds * 1000:.1f}' for name, seconds in timings.items()
+    )
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        timings: dict[str, float] = {}
+        token = _timings.set(timings)
+        started = time.perf_counter()
+        try:
+            if not self._wants_profile(scope):
+                await self._time(scope, receive, send, timings, started)
+            elif _profile_lock.acquire(blocking=False):
+                try:
+                    await self._profile(scope, receive, send, timings, started)
+                finally:
+                    _profile_lock.release()
+            else:
+                await self._reject_profile(scope, receive, send)
+        finally:
+            _timings.reset(token)
+
+    async def _reject_profile(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        error = ConflictError(
+            'A profile is already running', headers={'Retry-After': '1'}
+        )
+        response = JSONResponse(
+            {'error': type(error).__name__, 'detail': error.message},
+            status_code=error.status_code,
+            headers=error.headers,
+        )
+        await response(scope, receive, send)
+
+    async def _time(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        timings: dict[str, float],
+        started: float,
+    ) -> None:
+        async def send_with_timing(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                timings['total'] = time.perf_counter() - started
+                headers = MutableHeaders(scope=message)
+                headers.append('Server-Timing', format_server_timing(timings))
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+    async def _profile(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        timings: dict[str, float],
+        started: float,
+    ) -> None:
+        status = 500
+
+        async def capture(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            profiler.disable()
+        timings['total'] = time.perf_counter() - started
+
+        report = io.StringIO()
+        report.write(f'status: {status}\n')
+        report.write(f'server-timing: {format_server_timing(timings)}\n\n')
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        stats.print_stats(settings.PROFILE_TOP_FUNCTIONS)
+        body = report.getvalue().encode()
+
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/plain; charset=utf-8'),
+                    (b'content-length', str(len(body)).encode()),
+                    (b'server-timing', format_server_timing(timings).encode()),
+                ],
+            }
+        )
+        await send({'type': 'http.response.body', 'body': body})
+
+    def _wants_profile(self, scope: Scope) -> bool:
+        if not settings.PROFILE_API_KEY:
+            return False
+
+        headers = Headers(scope=scope)
+        if headers.get('x-profile') not in {'1', 'true'}:
+            return False
+        return hmac.compare_digest(
+            headers.get('x-api-key', '').encode(),
+            settings.PROFILE_API_KEY.encode(),
+        )
@@ -1,5 +1,7 @@
 from functools import lru_cache
+from typing import Literal, Self
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,13 +12,109 @@ class _Settings(BaseSettings):
         extra='ignore',
     )
     SWAPI_BASE_URL: str = 'https://swapi.dev/api/'
+    SWAPI_BACKEND: Literal['remote', 'snapshot'] = 'remote'
+    SNAPSHOT_PATH: str = 'data/swapi_snapshot.sqlite3'
     CLOUD_FUNC_URL: str = ''
     API_GATEWAY_URL: str = ''
 
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP2_ENABLED: bool = False
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+
+    HTTP_COMPRESSION_MIN_BYTES: int = 1024
+    HTTP_GZIP_LEVEL: int = 9
+    HTTP_BROTLI_QUALITY: int = 9
+    HTTP_ENCODED_CACHE_MAX_ITEMS: int = 1024
+    HTTP_ENCODED_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_BREAKER_WINDOW_SIZE: int = 20
+    CIRCUIT_BREAKER_MIN_CALLS: int = 10
+    CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5
+    CIRCUIT_BREAKER_SLOW_CALL_SECONDS: float = 3.0
+    CIRCUIT_BREAKER_SLOW_CALL_RATE: float = 0.8
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = 30.0
+    CIRCUIT_BREAKER_HALF_OPEN_CALLS: int = 3
+
+    UPSTREAM_RETRY_ATTEMPTS: int = 3
+    UPSTREAM_RETRY_BASE_DELAY_SECONDS: float = 0.1
+    UPSTREAM_RETRY_MAX_DELAY_SECONDS: float = 1.0
+
+    HEDGING_ENABLED: bool = False
+    HEDGE_QUANTILE: float = 0.95
+    HEDGE_MIN_DELAY_SECONDS: float = 0.05
+    HEDGE_WINDOW_SIZE: int = 200
+    HEDGE_MIN_SAMPLES: int = 20
+    HEDGE_BUDGET_RATIO: float = 0.05
+    HEDGE_BUDGET_BURST: float = 10.0
+
+    EXPAND_MAX_CONCURRENCY: int = 20
+    EXPAND_MAX_FANOUT: int = 100
+    EXPAND_TIMEOUT_SECONDS: float = 10.0
+
+    BATCH_MAX_QUERIES: int = 20
+
     CACHE_ENABLED: bool = False
     UPSTASH_REDIS_REST_URL: str = ''
     UPSTASH_REDIS_REST_TOKEN: str = ''
     CACHE_TTL_SECONDS: int = 86400
+    CACHE_SOFT_TTL_SECONDS: int = 3600
+    CACHE_STALE_IF_ERROR_SECONDS: int = 86400
+    CACHE_SERVE_STALE_ON_ERROR: bool = True
+    CACHE_WRITE_BEHIND_ENABLED: bool = True
+    CACHE_WRITE_QUEUE_MAX_SIZE: int = 1000
+    CACHE_WRITE_BATCH_SIZE: int = 50
+    CACHE_WRITE_QUEUE_POLICY: Literal['drop', 'block'] = 'drop'
+    CACHE_WRITE_FLUSH_TIMEOUT_SECONDS: float = 5.0
+
+    CACHE_COMPRESSION_ENABLED: bool = True
+    CACHE_COMPRESSION_CODEC: Literal['zlib'] = 'zlib'
+    CACHE_COMPRESSION_MIN_BYTES: int = 1024
+    CACHE_COMPRESSION_LEVEL: int = 6
+    CACHE_SIZE_STATS_MAX_KEYS: int = 512
+
+    CACHE_WARMUP_ON_STARTUP: bool = False
+    CACHE_WARMUP_CONCURRENCY: int = 5
+    CACHE_WARMUP_LOCK_SECONDS: int = 600
+
+    MEMORY_CACHE_MAX_ITEMS: int = 2048
+    MEMORY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    MEMORY_CACHE_TTL_SECONDS: int = 3600
+
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_SYNC_INTERVAL_SECONDS: float = 1.0
+    RATE_LIMIT_TIERS: dict[str, int] = {
+        'free': 60,
+        'standard': 600,
+        'unlimited': 0,
+    }
+    RATE_LIMIT_DEFAULT_TIER: str = 'standard'
+    RATE_LIMIT_KEY_TIERS: dict[str, str] = {}
+
+    API_KEY_STORE: Literal['none', 'file', 'redis'] = 'none'
+    API_KEYS_FILE: str = 'data/api_keys.json'
+    API_KEYS_REDIS_KEY: str = 'api_keys'
+    API_KEY_CACHE_TTL_SECONDS: int = 300
+    API_KEY_NEGATIVE_TTL_SECONDS: int = 60
+    API_KEY_REFRESH_INTERVAL_SECONDS: float = 60.0
+    API_KEY_CACHE_MAX_ITEMS: int = 10000
+    API_KEY_NEGATIVE_CACHE_MAX_ITEMS: int = 10000
+
+    METRICS_ENABLED: bool = True
+    SERVER_TIMING_ENABLED: bool = True
+    PROFILE_API_KEY: str = ''
+    PROFILE_TOP_FUNCTIONS: int = 30
+
+    @model_validator(mode='after')
+    def check_default_rate_limit_tier(self) -> Self:
+        if self.RATE_LIMIT_DEFAULT_TIER not in self.RATE_LIMIT_TIERS:
+            msg = 'RATE_LIMIT_DEFAULT_TIER must be one of RATE_LIMIT_TIERS'
+            raise ValueError(msg)
+        return self
 
 
 @lru_cache
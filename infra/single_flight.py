@@ -0,0 +1,42 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass
+class SingleFlightStats:
+    executions: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight[T]:
+    def __init__(self) -> None:
+        self.stats = SingleFlightStats()
+        self._in_flight: dict[str, asyncio.Task[T]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        return await asyncio.shield(self.spawn(key, fn))
+
+    def spawn(
+        self, key: str, fn: Callable[[], Awaitable[T]]
+    ) -> asyncio.Task[T]:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self.stats.executions += 1
+        else:
+            self.stats.coalesced += 1
+
+        return task
+
+
+@lru_cache
+def get_single_flight() -> SingleFlight:
+    return SingleFlight()
@@ -1,16 +1,39 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import AsyncExitStack, asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from api.v1.routers.metrics_router import router as metrics_router
 from api.v1.routers.root_router import router as root_router
 from api.v1.routers.swapi_data_router import router as swapi_router
 from exceptions.error_handler import add_exceptions_handler
+from infra.cache_compression import get_cache_size_stats
+from infra.http_client import create_http_client
+from infra.memory_cache import get_memory_cache
+from infra.metrics import MetricsMiddleware, bind_runtime_metrics
+from infra.rate_limiter import RateLimitHeadersMiddleware, create_rate_limiter
+from infra.server_timing import ServerTimingMiddleware
 from infra.settings import settings
+from infra.single_flight import get_single_flight
+from repositories.cache_repository import create_cache_write_queue
+from repositories.snapshot_repository import get_snapshot_repository
+from services.api_key_service import create_api_key_service
+from services.cache_warmup_service import (
+    create_cache_warmup_service,
+    log_warmup_failure,
+)
 
 openapi_tags = [
     {
         'name': 'root',
         'description': 'API root endpoint',
     },
+    {
+        'name': 'metrics',
+        'description': 'Prometheus metrics for the API',
+    },
     {
         'name': 'swapi',
         'description': 'Operations to query Star Wars API (SWAPI) resources',
@@ -21,6 +44,47 @@ openapi_tags = [
     },
 ]
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
+    if settings.SWAPI_BACKEND == 'snapshot':
+        get_snapshot_repository().load()
+
+    async with AsyncExitStack() as stack:
+        app.state.http_client = await stack.enter_async_context(
+            create_http_client()
+        )
+        app.state.expand_semaphore = asyncio.Semaphore(
+            settings.EXPAND_MAX_CONCURRENCY
+        )
+        app.state.rate_limiter = await stack.enter_async_context(
+            create_rate_limiter()
+        )
+        app.state.api_key_service = None
+        if settings.API_KEY_STORE != 'none':
+            app.state.api_key_service = await stack.enter_async_context(
+                create_api_key_service()
+            )
+        app.state.cache_write_queue = None
+        if settings.CACHE_ENABLED and settings.CACHE_WRITE_BEHIND_ENABLED:
+            app.state.cache_write_queue = await stack.enter_async_context(
+                create_cache_write_queue()
+            )
+        if settings.METRICS_ENABLED:
+            bind_runtime_metrics(
+                get_memory_cache(),
+                get_single_flight(),
+                get_cache_size_stats(),
+                app.state.cache_write_queue,
+            )
+        if settings.CACHE_ENABLED and settings.CACHE_WARMUP_ON_STARTUP:
+            warmup = create_cache_warmup_service(app.state.http_client)
+            warmup_task = asyncio.create_task(warmup.warm())
+            warmup_task.add_done_callback(log_warmup_failure)
+            stack.callback(warmup_task.cancel)
+        yield
+
+
 app = FastAPI(
     title='Star Wars Wrap API',
     summary='A wrapper API for SWAPI (Star Wars API)',
@@ -39,6 +103,7 @@ app = FastAPI(
         'url': 'https://opensource.org/license/mit',
     },
     openapi_tags=openapi_tags,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -49,12 +114,27 @@ app.add_middleware(
         'http://localhost:8000',
     ],
     allow_credentials=True,
-    allow_methods=['GET', 'OPTIONS'],
-    allow_headers=['Content-Type', 'X-API-Key'],
+    allow_methods=['GET', 'POST', 'OPTIONS'],
+    allow_headers=['Content-Type', 'X-API-Key', 'X-Profile'],
+    expose_headers=[
+        'RateLimit-Limit',
+        'RateLimit-Remaining',
+        'RateLimit-Reset',
+        'RateLimit-Policy',
+        'Retry-After',
+    ],
     max_age=3600,
 )
 
+app.add_middleware(RateLimitHeadersMiddleware)
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 add_exceptions_handler(app)
 
 app.include_router(root_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
 app.include_router(swapi_router, prefix='/api/v1')
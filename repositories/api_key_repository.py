@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+from upstash_redis.asyncio import Redis as AsyncRedis
+
+from infra import json_codec
+
+
+def hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class ApiKeyInfo:
+    digest: str
+    name: str
+    tier: str | None = None
+
+
+def parse_api_key_info(digest: str, data: dict[str, Any]) -> ApiKeyInfo:
+    return ApiKeyInfo(
+        digest=digest, name=data.get('name', ''), tier=data.get('tier')
+    )
+
+
+class ApiKeyRepository(Protocol):
+    async def lookup(self, digests: list[str]) -> list[ApiKeyInfo | None]: ...
+
+
+class FileApiKeyRepository:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._version: tuple[int, int] | None = None
+        self._keys: dict[str, ApiKeyInfo] = {}
+
+    async def lookup(self, digests: list[str]) -> list[ApiKeyInfo | None]:
+        keys = await asyncio.to_thread(self._load)
+        return [keys.get(digest) for digest in digests]
+
+    def _load(self) -> dict[str, ApiKeyInfo]:
+        stat = self.path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version != self._version:
+            data = json_codec.loads(self.path.read_bytes())
+            self._keys = {
+                digest: parse_api_key_info(digest, info)
+                for digest, info in data.items()
+            }
+            self._version = version
+        return self._keys
+
+
+class RedisApiKeyRepository:
+    def __init__(self, client: AsyncRedis, key: str) -> None:
+        self.client = client
+        self.key = key
+
+    async def lookup(self, digests: list[str]) -> list[ApiKeyInfo | None]:
+        values = await self.client.hmget(self.key, *digests)
+        return [
+            parse_api_key_info(digest, json_codec.loads(value))
+            if value is not None
+            else None
+            for digest, value in zip(digests, values, strict=True)
+        ]
@@ -1,13 +1,58 @@
-import json
+import time
+from dataclasses import dataclass
+from enum import Enum
+from functools import cached_property
 from typing import Annotated
+from urllib.parse import urlsplit
 
 from fastapi import Depends
 from loguru import logger
 from upstash_redis.asyncio import Redis as AsyncRedis
 
+from infra import json_codec
+from infra.cache_compression import (
+    CacheCompressor,
+    CacheSizeStats,
+    get_cache_compressor,
+    get_cache_size_stats,
+)
+from infra.cache_write_queue import CacheWriteQueue, get_cache_write_queue
+from infra.http_cache import compute_etag
+from infra.memory_cache import MemoryCache, get_memory_cache
+from infra.metrics import (
+    CACHE_PACKED_BYTES,
+    CACHE_RAW_BYTES,
+    MEMORY_HIT,
+    MEMORY_MISS,
+    REDIS_HIT,
+    REDIS_MISS,
+)
 from infra.redis_client import get_redis_client
+from infra.server_timing import timed
 from infra.settings import settings
-from schemas.swapi_query_params_schema import SwapiQueryParams
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+
+
+class CacheState(str, Enum):
+    FRESH = 'fresh'
+    STALE = 'stale'
+    EXPIRED = 'expired'
+
+
+@dataclass
+class CacheEntry:
+    body: str
+    state: CacheState
+    stored_etag: str | None = None
+    fresh_until: float | None = None
+
+    @cached_property
+    def data(self) -> dict:
+        return json_codec.loads(self.body)
+
+    @cached_property
+    def etag(self) -> str:
+        return self.stored_etag or compute_etag(self.body.encode())
 
 
 class CacheRepository:
@@ -16,49 +61,324 @@ class CacheRepository:
     def __init__(
         self,
         client: Annotated[AsyncRedis | None, Depends(get_redis_client)],
+        memory_cache: Annotated[MemoryCache[str], Depends(get_memory_cache)],
+        write_queue: Annotated[
+            CacheWriteQueue | None, Depends(get_cache_write_queue)
+        ] = None,
     ) -> None:
         self.client = client
-        self.ttl = settings.CACHE_TTL_SECONDS
+        self.memory_cache = memory_cache
+        self.write_queue = write_queue
+        self.soft_ttl = settings.CACHE_SOFT_TTL_SECONDS
+        self.hard_ttl = settings.CACHE_TTL_SECONDS
+        self.ttl = self.hard_ttl + settings.CACHE_STALE_IF_ERROR_SECONDS
+        self.clock = time.time
+        self.compressor: CacheCompressor = get_cache_compressor()
+        self.size_stats: CacheSizeStats = get_cache_size_stats()
         self.enabled = settings.CACHE_ENABLED and self.client is not None
 
     def build_cache_key(self, params: SwapiQueryParams) -> str:
+        return f'{self.CACHE_PREFIX}:{self._build_query_key(params)}'
+
+    def build_response_cache_key(self, params: SwapiQueryParams) -> str:
+        query_key = self._build_query_key(params)
+        expand = params.expand or ''
+        sort_by = params.sort_by or ''
+        sort_order = params.sort_order.value if params.sort_by else ''
+
+        return (
+            f'{self.CACHE_PREFIX}:response:{query_key}:'
+            f'{expand}:{sort_by}:{sort_order}'
+        )
+
+    def build_resource_cache_key(self, url: str) -> str:
+        resource, item_id = urlsplit(url).path.strip('/').split('/')[-2:]
+        return f'{self.CACHE_PREFIX}:resource:{resource}:{item_id}'
+
+    def build_warmup_key(self, resource: SwapiResource) -> str:
+        return f'{self.CACHE_PREFIX}:warmup:{resource.value}'
+
+    def _build_collection_key(self, resource: SwapiResource) -> str:
+        return f'{self.CACHE_PREFIX}:collection:{resource.value}'
+
+    def _build_query_key(self, params: SwapiQueryParams) -> str:
         resource = params.resource.value
         item_id = str(params.id) if params.id else 'list'
         page = str(params.page) if params.page else '1'
         search = params.search or ''
 
-        return f'{self.CACHE_PREFIX}:{resource}:{item_id}:{page}:{search}'
+        return f'{resource}:{item_id}:{page}:{search}'
 
     async def get(self, params: SwapiQueryParams) -> dict | None:
+        return await self._get(self.build_cache_key(params))
+
+    async def set(self, params: SwapiQueryParams, data: dict) -> bool:
+        return await self._set(self.build_cache_key(params), data)
+
+    async def get_entry(self, params: SwapiQueryParams) -> CacheEntry | None:
+        return await self._get_entry(self.build_cache_key(params))
+
+    async def get_response(self, params: SwapiQueryParams) -> dict | None:
+        return await self._get(self.build_response_cache_key(params))
+
+    async def get_response_entry(
+        self, params: SwapiQueryParams
+    ) -> CacheEntry | None:
+        return await self._get_entry(self.build_response_cache_key(params))
+
+    async def set_response(self, params: SwapiQueryParams, data: dict) -> bool:
+        return await self._set(self.build_response_cache_key(params), data)
+
+    async def get_many(self, cache_keys: list[str]) -> dict[str, dict]:
+        entries = await self.get_many_entries(cache_keys)
+        return {
+            cache_key: entry.data
+            for cache_key, entry in entries.items()
+            if entry.state != CacheState.EXPIRED
+        }
+
+    async def get_many_entries(
+        self, cache_keys: list[str]
+    ) -> dict[str, CacheEntry]:
+        if not self.enabled or self.client is None or not cache_keys:
+            return {}
+
+        entries: dict[str, CacheEntry] = {}
+        missing: list[str] = []
+        for cache_key in dict.fromkeys(cache_keys):
+            cached_data = self.memory_cache.get(cache_key)
+            if cached_data is None:
+                missing.append(cache_key)
+            else:
+                entries[cache_key] = self._decode(cached_data)
+        MEMORY_HIT.inc(len(entries))
+        MEMORY_MISS.inc(len(missing))
+
+        if missing:
+            entries |= await self._mget(missing)
+
+        logger.debug(f'Cache MGET: {len(entries)}/{len(cache_keys)} hits')
+        return entries
+
+    async def _mget(self, cache_keys: list[str]) -> dict[str, CacheEntry]:
+        if self.client is None:
+            return {}
+
+        try:
+            with timed('cache'):
+                values = await self.client.mget(*cache_keys)
+        except (ConnectionError, TimeoutError) as e:
+            logger.warning(f'Cache MGET error for {len(cache_keys)} keys: {e}')
+            return {}
+
+        entries: dict[str, CacheEntry] = {}
+        for cache_key, value in zip(cache_keys, values, strict=True):
+            if value is None:
+                REDIS_MISS.inc()
+                continue
+            REDIS_HIT.inc()
+            try:
+                cached_data = self._unpack(value)
+                entries[cache_key] = self._decode(cached_data)
+            except ValueError as e:
+                logger.warning(f'Cache GET error for {cache_key}: {e}')
+                continue
+            self.memory_cache.set(cache_key, cached_data)
+        return entries
+
+    async def set_many(self, items: dict[str, dict]) -> bool:
+        if not self.enabled or self.client is None or not items:
+            return False
+
+        values = {
+            cache_key: self._encode(data) for cache_key, data in items.items()
+        }
+        for cache_key, value in values.items():
+            self.memory_cache.set(cache_key, value)
+
+        if self.write_queue is not None:
+            queued = [
+                await self.write_queue.put(cache_key, value)
+                for cache_key, value in values.items()
+            ]
+            return all(queued)
+        return await self.write_values(values)
+
+    async def write_values(self, values: dict[str, str]) -> bool:
+        if self.client is None:
+            return False
+
+        pipeline = self.client.pipeline()
+        for cache_key, value in values.items():
+            pipeline.set(cache_key, self._pack(cache_key, value), ex=self.ttl)
+
+        try:
+            with timed('cache'):
+                await pipeline.exec()
+            logger.debug(f'Cache SET: {len(values)} keys (TTL: {self.ttl}s)')
+        except (ConnectionError, TimeoutError) as e:
+            logger.warning(f'Cache SET error for {len(values)} keys: {e}')
+            return False
+        else:
+            return True
+
+    async def get_collection(
+        self, resource: SwapiResource
+    ) -> list[dict] | None:
+        cached = await self._get(self._build_collection_key(resource))
+        return cached['results'] if cached is not None else None
+
+    async def set_collection(
+        self, resource: SwapiResource, records: list[dict]
+    ) -> bool:
+        return await self._set(
+            self._build_collection_key(resource), {'results': records}
+        )
+
+    async def get_resources(self, urls: list[str]) -> dict[str, dict]:
+        cache_keys = {url: self.build_resource_cache_key(url) for url in urls}
+        cached = await self.get_many(list(cache_keys.values()))
+        return {
+            url: cached[cache_key]
+            for url, cache_key in cache_keys.items()
+            if cache_key in cached
+        }
+
+    async def set_resources(self, resources: dict[str, dict]) -> bool:
+        return await self.set_many(
+            {
+                self.build_resource_cache_key(url): data
+                for url, data in resources.items()
+            }
+        )
+
+    async def acquire_lock(self, cache_key: str, ttl: int) -> bool:
         if not self.enabled or self.client is None:
+            return False
+
+        try:
+            acquired = await self.client.set(cache_key, '1', nx=True, ex=ttl)
+        except (ConnectionError, TimeoutError) as e:
+            logger.warning(f'Cache lock error for {cache_key}: {e}')
+            return False
+        return bool(acquired)
+
+    async def release_lock(self, cache_key: str) -> None:
+        if not self.enabled or self.client is None:
+            return
+
+        try:
+            await self.client.delete(cache_key)
+        except (ConnectionError, TimeoutError) as e:
+            logger.warning(f'Cache unlock error for {cache_key}: {e}')
+
+    async def _get(self, cache_key: str) -> dict | None:
+        entry = await self._get_entry(cache_key)
+        if entry is None or entry.state == CacheState.EXPIRED:
             return None
+        return entry.data
 
-        cache_key = self.build_cache_key(params)
+    async def _get_entry(self, cache_key: str) -> CacheEntry | None:
+        if not self.enabled or self.client is None:
+            return None
 
         try:
-            cached_data = await self.client.get(cache_key)
+            cached_data = self.memory_cache.get(cache_key)
+            if cached_data is not None:
+                logger.debug(f'Cache L1 HIT: {cache_key}')
+                MEMORY_HIT.inc()
+                return self._decode(cached_data)
+            MEMORY_MISS.inc()
+
+            with timed('cache'):
+                cached_data = await self.client.get(cache_key)
             if cached_data is not None:
                 logger.debug(f'Cache HIT: {cache_key}')
-                if isinstance(cached_data, str):
-                    return json.loads(cached_data)
-                return cached_data
+                REDIS_HIT.inc()
+                cached_data = self._unpack(cached_data)
+                self.memory_cache.set(cache_key, cached_data)
+                return self._decode(cached_data)
             logger.debug(f'Cache MISS: {cache_key}')
-        except (ConnectionError, TimeoutError, json.JSONDecodeError) as e:
+            REDIS_MISS.inc()
+        except (ConnectionError, TimeoutError, ValueError) as e:
             logger.warning(f'Cache GET error for {cache_key}: {e}')
 
         return None
 
-    async def set(self, params: SwapiQueryParams, data: dict) -> bool:
+    def _pack(self, cache_key: str, value: str) -> str:
+        stored = self.compressor.pack(value)
+        raw_bytes = len(value.encode())
+        self.size_stats.record(cache_key, raw_bytes, len(stored))
+        CACHE_RAW_BYTES.inc(raw_bytes)
+        CACHE_PACKED_BYTES.inc(len(stored))
+        return stored
+
+    def _unpack(self, value: object) -> str:
+        if not isinstance(value, str):
+            return json_codec.dumps(value)
+        return self.compressor.unpack(value)
+
+    def _encode(self, data: dict) -> str:
+        now = self.clock()
+        body = json_codec.dumps(data)
+        header = {
+            'soft': now + self.soft_ttl,
+            'hard': now + self.hard_ttl,
+            'etag': compute_etag(body.encode()),
+        }
+        return f'{json_codec.dumps(header)}\n{body}'
+
+    def _decode(self, value: str) -> CacheEntry:
+        head, _, body = value.partition('\n')
+        if not body:
+            return CacheEntry(body=head, state=CacheState.FRESH)
+
+        meta = json_codec.loads(head)
+        now = self.clock()
+        if now < meta['soft']:
+            state = CacheState.FRESH
+        elif now < meta['hard']:
+            state = CacheState.STALE
+        else:
+            state = CacheState.EXPIRED
+        return CacheEntry(
+            body=body,
+            state=state,
+            stored_etag=meta.get('etag'),
+            fresh_until=meta['soft'],
+        )
+
+    async def _set(self, cache_key: str, data: dict) -> bool:
         if not self.enabled or self.client is None:
             return False
 
-        cache_key = self.build_cache_key(params)
+        value = self._encode(data)
+        self.memory_cache.set(cache_key, value)
+
+        if self.write_queue is not None:
+            return await self.write_queue.put(cache_key, value)
 
         try:
-            await self.client.set(cache_key, json.dumps(data), ex=self.ttl)
+            with timed('cache'):
+                await self.client.set(
+                    cache_key, self._pack(cache_key, value), ex=self.ttl
+                )
             logger.debug(f'Cache SET: {cache_key} (TTL: {self.ttl}s)')
         except (ConnectionError, TimeoutError) as e:
             logger.warning(f'Cache SET error for {cache_key}: {e}')
             return False
         else:
             return True
+
+
+def create_cache_write_queue() -> CacheWriteQueue:
+    repository = CacheRepository(
+        client=get_redis_client(), memory_cache=get_memory_cache()
+    )
+    return CacheWriteQueue(
+        writer=repository.write_values,
+        max_size=settings.CACHE_WRITE_QUEUE_MAX_SIZE,
+        batch_size=settings.CACHE_WRITE_BATCH_SIZE,
+        policy=settings.CACHE_WRITE_QUEUE_POLICY,
+        flush_timeout=settings.CACHE_WRITE_FLUSH_TIMEOUT_SECONDS,
+    )
@@ -0,0 +1,62 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from infra.http_cache import ResponseValidator
+from infra.settings import settings
+from repositories.search_index import SearchIndex
+from schemas.swapi_query_params_schema import SortOrder, SwapiResource
+from services.sort_swapi_data_service import SortColumn
+
+
+@dataclass
+class ResourceCollection:
+    records: list[dict[str, Any]]
+    search_index: SearchIndex
+    columns: dict[str, SortColumn] = field(default_factory=dict)
+    sorted_positions: dict[tuple[str, SortOrder], list[int]] = field(
+        default_factory=dict
+    )
+    validators: dict[str, ResponseValidator] = field(default_factory=dict)
+
+
+class CollectionRepository:
+    def __init__(
+        self,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._collections: dict[
+            SwapiResource, tuple[float, ResourceCollection]
+        ] = {}
+
+    def get(self, resource: SwapiResource) -> ResourceCollection | None:
+        entry = self._collections.get(resource)
+        if entry is None:
+            return None
+
+        expires_at, collection = entry
+        if expires_at <= self._clock():
+            del self._collections[resource]
+            return None
+        return collection
+
+    def set(
+        self, resource: SwapiResource, records: list[dict[str, Any]]
+    ) -> ResourceCollection:
+        collection = ResourceCollection(
+            records=records,
+            search_index=SearchIndex.for_resource(resource, records),
+        )
+        expires_at = self._clock() + self.ttl_seconds
+        self._collections[resource] = (expires_at, collection)
+        return collection
+
+
+@lru_cache
+def get_collection_repository() -> CollectionRepository:
+    return CollectionRepository(ttl_seconds=settings.MEMORY_CACHE_TTL_SECONDS)
@@ -0,0 +1,73 @@
+from typing import Any
+
+from schemas.swapi_query_params_schema import SwapiResource
+
+SEARCH_FIELDS: dict[SwapiResource, tuple[str, ...]] = {
+    SwapiResource.FILMS: ('title',),
+    SwapiResource.PEOPLE: ('name',),
+    SwapiResource.PLANETS: ('name',),
+    SwapiResource.SPECIES: ('name',),
+    SwapiResource.STARSHIPS: ('name', 'model'),
+    SwapiResource.VEHICLES: ('name', 'model'),
+}
+
+
+class SearchIndex:
+    NGRAM_SIZE = 3
+    _FIELD_SEPARATOR = '\x00'
+
+    def __init__(
+        self, records: list[dict[str, Any]], fields: tuple[str, ...]
+    ) -> None:
+        self._records = records
+        self._texts = [
+            self._FIELD_SEPARATOR.join(
+                str(record.get(field) or '') for field in fields
+            ).lower()
+            for record in records
+        ]
+        self._postings: dict[str, list[int]] = {}
+        for position, text in enumerate(self._texts):
+            for ngram in self._ngrams(text):
+                postings = self._postings.setdefault(ngram, [])
+                if not postings or postings[-1] != position:
+                    postings.append(position)
+
+    @classmethod
+    def for_resource(
+        cls, resource: SwapiResource, records: list[dict[str, Any]]
+    ) -> 'SearchIndex':
+        return cls(records, SEARCH_FIELDS[resource])
+
+    def search(self, term: str) -> list[dict[str, Any]]:
+        return [self._records[p] for p in self.search_positions(term)]
+
+    def search_positions(self, term: str) -> list[int]:
+        term = term.lower()
+        return [
+            position
+            for position in self._candidates(term)
+            if term in self._texts[position]
+        ]
+
+    def _candidates(self, term: str) -> list[int] | range:
+        if len(term) < self.NGRAM_SIZE:
+            return range(len(self._texts))
+
+        postings = sorted(
+            (
+                self._postings.get(ngram, [])
+                for ngram in set(self._ngrams(term))
+            ),
+            key=len,
+        )
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            candidates.intersection_update(other)
+            if not candidates:
+                break
+        return sorted(candidates)
+
+    def _ngrams(self, text: str) -> list[str]:
+        size = self.NGRAM_SIZE
+        return [text[i : i + size] for i in range(len(text) - size + 1)]
@@ -0,0 +1,107 @@
+import json
+import sqlite3
+from contextlib import closing
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from infra.settings import settings
+from repositories.search_index import SearchIndex
+from schemas.swapi_query_params_schema import SwapiResource
+
+
+def parse_resource_url(url: str) -> tuple[str, int]:
+    resource, item_id = urlsplit(url).path.strip('/').split('/')[-2:]
+    return resource, int(item_id)
+
+
+class SnapshotRepository:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._records: dict[str, list[dict[str, Any]]] | None = None
+        self._by_id: dict[tuple[str, int], dict[str, Any]] = {}
+        self._indexes: dict[SwapiResource, SearchIndex] = {}
+
+    def list_records(self, resource: SwapiResource) -> list[dict[str, Any]]:
+        return self.load()[resource.value]
+
+    def search(
+        self, resource: SwapiResource, term: str
+    ) -> list[dict[str, Any]]:
+        self.load()
+        return self._indexes[resource].search(term)
+
+    def get_record(self, resource: str, item_id: int) -> dict[str, Any] | None:
+        self.load()
+        return self._by_id.get((resource, item_id))
+
+    def get_record_by_url(self, url: str) -> dict[str, Any] | None:
+        return self.get_record(*parse_resource_url(url))
+
+    def write(
+        self, records: dict[SwapiResource, list[dict[str, Any]]]
+    ) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.unlink(missing_ok=True)
+
+        with closing(sqlite3.connect(tmp_path)) as conn, conn:
+            conn.execute(
+                'CREATE TABLE records ('
+                'resource TEXT NOT NULL, '
+                'id INTEGER NOT NULL, '
+                'data TEXT NOT NULL, '
+                'PRIMARY KEY (resource, id))'
+            )
+            conn.executemany(
+                'INSERT INTO records (resource, id, data) VALUES (?, ?, ?)',
+                [
+                    (
+                        resource.value,
+                        parse_resource_url(record['url'])[1],
+                        json.dumps(record),
+                    )
+                    for resource, items in records.items()
+                    for record in items
+                ],
+            )
+
+        tmp_path.replace(self.path)
+        self._records = None
+        self._by_id = {}
+        self._indexes = {}
+
+    def load(self) -> dict[str, list[dict[str, Any]]]:
+        if self._records is not None:
+            return self._records
+
+        records: dict[str, list[dict[str, Any]]] = {
+            resource.value: [] for resource in SwapiResource
+        }
+        uri = f'{self.path.resolve().as_uri()}?mode=ro'
+        with closing(sqlite3.connect(uri, uri=True)) as conn:
+            rows = conn.execute(
+                'SELECT resource, id, data FROM records ORDER BY resource, id'
+            )
+            for resource, item_id, data in rows:
+                record = json.loads(data)
+                records.setdefault(resource, []).append(record)
+                self._by_id[resource, item_id] = record
+
+        self._indexes = {
+            resource: SearchIndex.for_resource(
+                resource, records[resource.value]
+            )
+            for resource in SwapiResource
+        }
+        logger.info(f'Loaded {len(self._by_id)} records from {self.path}')
+        self._records = records
+        return records
+
+
+@lru_cache
+def get_snapshot_repository() -> SnapshotRepository:
+    return SnapshotRepository(Path(settings.SNAPSHOT_PATH))
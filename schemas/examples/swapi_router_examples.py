@@ -45,9 +45,32 @@ SWAPI_EXAMPLES: dict[str, Example] = {
             'sort_order': 'desc',
         },
     },
+    'sort_collection': {
+        'summary': 'Sort whole collection',
+        'description': 'Get the tallest people across every page',
+        'value': {
+            'resource': 'people',
+            'sort_by': 'height',
+            'sort_order': 'desc',
+            'sort_scope': 'collection',
+        },
+    },
     'list_films': {
         'summary': 'List films',
         'description': 'Get all Star Wars films',
         'value': {'resource': 'films'},
     },
 }
+
+SWAPI_BATCH_EXAMPLES: dict[str, Example] = {
+    'person_page': {
+        'summary': 'Person page',
+        'description': 'Get Luke Skywalker with homeworld and his films',
+        'value': {
+            'queries': [
+                {'resource': 'people', 'id': 1, 'expand': 'homeworld'},
+                {'resource': 'films', 'sort_by': 'episode_id'},
+            ]
+        },
+    },
+}
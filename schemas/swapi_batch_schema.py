@@ -0,0 +1,43 @@
+from typing import Annotated, Any
+
+from pydantic import BaseModel, Field
+
+from infra.settings import settings
+from schemas.swapi_query_params_schema import SwapiQueryParams
+
+
+class SwapiBatchRequest(BaseModel):
+    """Several SWAPI queries resolved within a single request."""
+
+    queries: list[
+        Annotated[
+            SwapiQueryParams | dict[str, Any],
+            Field(union_mode='left_to_right'),
+        ]
+    ] = Field(
+        min_length=1,
+        max_length=settings.BATCH_MAX_QUERIES,
+        description='Queries accepted by GET /api/v1/swapi, in order. '
+        'An invalid query fails with 422 in its own result.',
+    )
+
+
+class SwapiBatchItem(BaseModel):
+    """Outcome of one query, either its data or the error it raised."""
+
+    status: int = Field(description='HTTP status code of this query')
+    data: dict[str, Any] | None = Field(
+        default=None, description='SWAPI resource data on success'
+    )
+    error: str | None = Field(
+        default=None, description='Error class name on failure'
+    )
+    detail: str | dict[str, Any] | list[dict[str, Any]] | None = Field(
+        default=None, description='Error detail on failure'
+    )
+
+
+class SwapiBatchResponse(BaseModel):
+    """Batch results in the same order as the submitted queries."""
+
+    results: list[SwapiBatchItem]
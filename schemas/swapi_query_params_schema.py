@@ -1,6 +1,12 @@
 from enum import Enum
 
-from pydantic import BaseModel, Field, PositiveInt, model_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    PositiveInt,
+    field_validator,
+    model_validator,
+)
 
 
 class SwapiResource(str, Enum):
@@ -17,6 +23,11 @@ class SortOrder(str, Enum):
     DESC = 'desc'
 
 
+class SortScope(str, Enum):
+    PAGE = 'page'
+    COLLECTION = 'collection'
+
+
 class SwapiQueryParams(BaseModel):
     resource: SwapiResource = Field(
         description='The Star Wars resource type to query',
@@ -52,6 +63,21 @@ class SwapiQueryParams(BaseModel):
         default=SortOrder.ASC,
         description='Sort order: asc (ascending) or desc (descending)',
     )
+    sort_scope: SortScope = Field(
+        default=SortScope.PAGE,
+        description='Sort scope: page (only the requested page) or '
+        'collection (the whole resource, then paginated)',
+    )
+
+    @field_validator('expand')
+    @classmethod
+    def normalize_expand(cls, expand: str | None) -> str | None:
+        if expand is None:
+            return None
+        if expand.lower() == 'all':
+            return 'all'
+        fields = {field.strip() for field in expand.split(',')} - {''}
+        return ','.join(sorted(fields)) or None
 
     @model_validator(mode='after')
     def validate_query_combations(self) -> 'SwapiQueryParams':
@@ -0,0 +1,163 @@
+import asyncio
+import contextlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from fastapi import Request
+from loguru import logger
+
+from exceptions.errors import ServiceUnavailableError
+from infra.metrics import API_KEY_HIT, API_KEY_MISS, API_KEY_NEGATIVE_HIT
+from infra.redis_client import get_redis_client
+from infra.settings import settings
+from infra.single_flight import SingleFlight
+from repositories.api_key_repository import (
+    ApiKeyInfo,
+    ApiKeyRepository,
+    FileApiKeyRepository,
+    RedisApiKeyRepository,
+    hash_api_key,
+)
+
+
+@dataclass
+class _CachedKey:
+    info: ApiKeyInfo | None
+    expires_at: float
+
+
+class ApiKeyService:
+    def __init__(  # noqa: PLR0913
+        self,
+        repository: ApiKeyRepository,
+        *,
+        ttl: float,
+        negative_ttl: float,
+        refresh_interval: float,
+        max_items: int,
+        negative_max_items: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.repository = repository
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.refresh_interval = refresh_interval
+        self.max_items = max_items
+        self.negative_max_items = negative_max_items
+        self.clock = clock
+        self._entries: OrderedDict[str, _CachedKey] = OrderedDict()
+        self._negative: OrderedDict[str, _CachedKey] = OrderedDict()
+        self._single_flight: SingleFlight[ApiKeyInfo | None] = SingleFlight()
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> Self:
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def validate(self, api_key: str) -> ApiKeyInfo | None:
+        digest = hash_api_key(api_key)
+        entries = self._entries if digest in self._entries else self._negative
+        entry = entries.get(digest)
+        if entry is not None and entry.expires_at > self.clock():
+            entries.move_to_end(digest)
+            (API_KEY_HIT if entry.info else API_KEY_NEGATIVE_HIT).inc()
+            return entry.info
+
+        API_KEY_MISS.inc()
+        try:
+            info = await self._single_flight.do(
+                digest, lambda: self._fetch(digest)
+            )
+        except Exception as e:
+            if entry is None:
+                raise ServiceUnavailableError from e
+            logger.warning(f'API key store error, using cached entry: {e}')
+            info = entry.info
+        return info
+
+    async def _fetch(self, digest: str) -> ApiKeyInfo | None:
+        [info] = await self.repository.lookup([digest])
+        self._store(digest, info)
+        return info
+
+    def _store(self, digest: str, info: ApiKeyInfo | None) -> None:
+        if info is not None:
+            self._negative.pop(digest, None)
+            entries, ttl, max_items = self._entries, self.ttl, self.max_items
+        else:
+            self._entries.pop(digest, None)
+            entries, ttl = self._negative, self.negative_ttl
+            max_items = self.negative_max_items
+
+        entries[digest] = _CachedKey(info, self.clock() + ttl)
+        entries.move_to_end(digest)
+        while len(entries) > max_items:
+            entries.popitem(last=False)
+
+    async def refresh(self) -> None:
+        horizon = self.clock() + self.refresh_interval
+        digests = [
+            digest
+            for digest, entry in self._entries.items()
+            if entry.info is not None and entry.expires_at <= horizon
+        ]
+        if not digests:
+            return
+
+        infos = await self.repository.lookup(digests)
+        for digest, info in zip(digests, infos, strict=True):
+            if digest in self._entries:
+                self._store(digest, info)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f'API key refresh error: {e}')
+
+
+def create_api_key_repository() -> ApiKeyRepository:
+    if settings.API_KEY_STORE == 'file':
+        return FileApiKeyRepository(Path(settings.API_KEYS_FILE))
+
+    client = get_redis_client()
+    if client is None:
+        msg = 'API_KEY_STORE=redis requires the Upstash Redis cache settings'
+        raise RuntimeError(msg)
+    return RedisApiKeyRepository(client, settings.API_KEYS_REDIS_KEY)
+
+
+def create_api_key_service() -> ApiKeyService:
+    return ApiKeyService(
+        repository=create_api_key_repository(),
+        ttl=settings.API_KEY_CACHE_TTL_SECONDS,
+        negative_ttl=settings.API_KEY_NEGATIVE_TTL_SECONDS,
+        refresh_interval=settings.API_KEY_REFRESH_INTERVAL_SECONDS,
+        max_items=settings.API_KEY_CACHE_MAX_ITEMS,
+        negative_max_items=settings.API_KEY_NEGATIVE_CACHE_MAX_ITEMS,
+    )
+
+
+def get_api_key_service(request: Request) -> ApiKeyService | None:
+    return getattr(request.app.state, 'api_key_service', None)
@@ -1,12 +1,57 @@
 from typing import Annotated
 
-from fastapi import Security
+from fastapi import Depends, Request, Security
 from fastapi.security import APIKeyHeader
+from loguru import logger
+
+from exceptions.errors import TooManyRequestsError, UnauthorizedError
+from infra.rate_limiter import RateLimiter, get_rate_limiter
+from infra.settings import settings
+from repositories.api_key_repository import hash_api_key
+from services.api_key_service import ApiKeyService, get_api_key_service
 
 api_key_header = APIKeyHeader(name='X-API-Key', auto_error=False)
 
 
+def rate_limit_for(digest: str | None, tier: str | None = None) -> int:
+    if tier is None and digest:
+        tier = settings.RATE_LIMIT_KEY_TIERS.get(digest)
+    default = settings.RATE_LIMIT_TIERS[settings.RATE_LIMIT_DEFAULT_TIER]
+    if tier is None:
+        return default
+    if tier not in settings.RATE_LIMIT_TIERS:
+        logger.warning(f'Unknown rate limit tier {tier!r}, using the default')
+        return default
+    return settings.RATE_LIMIT_TIERS[tier]
+
+
+def rate_limit_key(request: Request, digest: str | None) -> str:
+    if digest:
+        return digest
+    host = request.client.host if request.client else 'unknown'
+    return f'ip:{host}'
+
+
 async def verify_api_key(
+    request: Request,
     api_key: Annotated[str, Security(api_key_header)],
+    rate_limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+    api_key_service: Annotated[
+        ApiKeyService | None, Depends(get_api_key_service)
+    ],
 ) -> str:
+    tier = None
+    if api_key_service is not None:
+        key_info = await api_key_service.validate(api_key) if api_key else None
+        if key_info is None:
+            raise UnauthorizedError
+        tier = key_info.tier
+
+    digest = hash_api_key(api_key) if api_key else None
+    limit = rate_limit_for(digest, tier)
+    if settings.RATE_LIMIT_ENABLED and limit > 0:
+        decision = rate_limiter.check(rate_limit_key(request, digest), limit)
+        request.state.rate_limit = decision
+        if not decision.allowed:
+            raise TooManyRequestsError(headers=decision.headers())
     return api_key
@@ -0,0 +1,101 @@
+import asyncio
+from http import HTTPStatus
+from typing import Annotated, Any
+
+from fastapi import Depends
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+from pydantic import ValidationError
+
+from exceptions.error_handler import to_base_error
+from repositories.cache_repository import CacheEntry, CacheRepository
+from schemas.swapi_batch_schema import SwapiBatchItem, SwapiBatchResponse
+from schemas.swapi_query_params_schema import SwapiQueryParams
+from services.swapi_data_service import SwapiDataService
+
+
+class BatchSwapiDataService:
+    def __init__(
+        self,
+        swapi_service: Annotated[SwapiDataService, Depends()],
+        cache_repository: Annotated[CacheRepository, Depends()],
+    ) -> None:
+        self.swapi_service = swapi_service
+        self.cache_repository = cache_repository
+
+    async def get_batch(
+        self, queries: list[SwapiQueryParams | dict[str, Any]]
+    ) -> SwapiBatchResponse:
+        parsed = [self._parse(query) for query in queries]
+        unique_queries = {
+            query.model_dump_json(): query
+            for query in parsed
+            if isinstance(query, SwapiQueryParams)
+        }
+        cache_keys = {
+            query_key: self.swapi_service.build_cache_key(query)
+            for query_key, query in unique_queries.items()
+        }
+        entries = await self.cache_repository.get_many_entries(
+            [key for key in cache_keys.values() if key is not None]
+        )
+
+        items = await asyncio.gather(
+            *[
+                self._resolve(query, cache_keys[query_key], entries)
+                for query_key, query in unique_queries.items()
+            ]
+        )
+        results = dict(zip(unique_queries, items, strict=True))
+
+        return SwapiBatchResponse(
+            results=[
+                results[query.model_dump_json()]
+                if isinstance(query, SwapiQueryParams)
+                else query
+                for query in parsed
+            ]
+        )
+
+    @staticmethod
+    def _parse(
+        query: SwapiQueryParams | dict[str, Any],
+    ) -> SwapiQueryParams | SwapiBatchItem:
+        if isinstance(query, SwapiQueryParams):
+            return query
+
+        try:
+            return SwapiQueryParams.model_validate(query)
+        except ValidationError as exc:
+            return SwapiBatchItem(
+                status=HTTPStatus.UNPROCESSABLE_CONTENT,
+                error='RequestValidationError',
+                detail=jsonable_encoder(exc.errors()),
+            )
+
+    async def _resolve(
+        self,
+        query: SwapiQueryParams,
+        cache_key: str | None,
+        entries: dict[str, CacheEntry],
+    ) -> SwapiBatchItem:
+        try:
+            if cache_key is None:
+                data = await self.swapi_service.load_swapi_data(query)
+            else:
+                result = await self.swapi_service.serve_entry(
+                    query, entries.get(cache_key)
+                )
+                data = (
+                    result.data if isinstance(result, CacheEntry) else result
+                )
+        except Exception as exc:  # noqa: BLE001
+            error = to_base_error(exc)
+            logger.warning(f'Batch query {query} failed: {exc!r}')
+            return SwapiBatchItem(
+                status=error.status_code,
+                error=type(error).__name__,
+                detail=error.message,
+            )
+
+        return SwapiBatchItem(status=HTTPStatus.OK, data=data)
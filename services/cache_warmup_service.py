@@ -0,0 +1,218 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from infra.memory_cache import get_memory_cache
+from infra.redis_client import get_redis_client
+from infra.settings import settings
+from infra.single_flight import get_single_flight
+from repositories.cache_repository import CacheRepository
+from repositories.collection_repository import get_collection_repository
+from repositories.snapshot_repository import (
+    get_snapshot_repository,
+    parse_resource_url,
+)
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from services.expand_swapi_data_service import ExpandSwapiDataService
+from services.pagination import SWAPI_PAGE_SIZE
+from services.snapshot_swapi_data_service import SnapshotSwapiDataService
+from services.swapi_data_service import SwapiDataService
+
+
+@dataclass
+class WarmupReport:
+    resources: int = 0
+    skipped: int = 0
+    pages_fetched: int = 0
+    pages_cached: int = 0
+    records: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+
+class CacheWarmupService:
+    def __init__(
+        self,
+        swapi_service: SwapiDataService,
+        cache_repository: CacheRepository,
+        concurrency: int = settings.CACHE_WARMUP_CONCURRENCY,
+    ) -> None:
+        self.swapi_service = swapi_service
+        self.cache_repository = cache_repository
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.lock_ttl = settings.CACHE_WARMUP_LOCK_SECONDS
+
+    async def warm(self, *, force: bool = False) -> WarmupReport:
+        report = WarmupReport()
+        if not self.cache_repository.enabled:
+            logger.info('Cache disabled, skipping warm-up')
+            return report
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[
+                self._warm_resource(r, report, force=force)
+                for r in SwapiResource
+            ]
+        )
+        report.seconds = time.perf_counter() - started
+
+        logger.info(
+            f'Cache warm-up finished in {report.seconds:.1f}s: '
+            f'{report.resources} resources, {report.skipped} skipped, '
+            f'{report.pages_fetched} pages fetched, '
+            f'{report.pages_cached} already cached, {report.records} records, '
+            f'{report.failed} failed'
+        )
+        return report
+
+    async def _warm_resource(
+        self, resource: SwapiResource, report: WarmupReport, *, force: bool
+    ) -> None:
+        try:
+            await self._warm_resource_once(resource, report, force=force)
+        except Exception as e:  # noqa: BLE001
+            report.failed += 1
+            logger.error(f'Cache warm-up: {resource.value} failed: {e!r}')
+
+    async def _warm_resource_once(
+        self, resource: SwapiResource, report: WarmupReport, *, force: bool
+    ) -> None:
+        warmup_key = self.cache_repository.build_warmup_key(resource)
+        if not force and await self.cache_repository.get_many([warmup_key]):
+            logger.info(f'Cache warm-up: {resource.value} already warm')
+            report.skipped += 1
+            return
+
+        lock_key = f'{warmup_key}:lock'
+        if not await self.cache_repository.acquire_lock(
+            lock_key, self.lock_ttl
+        ):
+            logger.info(f'Cache warm-up: {resource.value} warming elsewhere')
+            report.skipped += 1
+            return
+
+        try:
+            started = time.perf_counter()
+            records = await self._load_pages(resource, report)
+            if not await self.cache_repository.set_many(
+                self._record_entries(records)
+            ):
+                msg = f'could not write {len(records)} {resource.value}'
+                raise RuntimeError(msg)
+            if not await self.cache_repository.set_many(
+                {warmup_key: {'records': len(records)}}
+            ):
+                msg = f'could not mark {resource.value} as warm'
+                raise RuntimeError(msg)
+        finally:
+            await self.cache_repository.release_lock(lock_key)
+
+        report.resources += 1
+        report.records += len(records)
+        logger.info(
+            f'Cache warm-up: {len(records)} {resource.value} '
+            f'in {time.perf_counter() - started:.1f}s'
+        )
+
+    async def _load_pages(
+        self, resource: SwapiResource, report: WarmupReport
+    ) -> list[dict[str, Any]]:
+        first_page = (await self._load_pages_of(resource, [1], report))[0]
+        page_count = math.ceil(first_page['count'] / SWAPI_PAGE_SIZE)
+        other_pages = await self._load_pages_of(
+            resource, list(range(2, page_count + 1)), report
+        )
+
+        return [
+            record
+            for data in (first_page, *other_pages)
+            for record in data['results']
+        ]
+
+    async def _load_pages_of(
+        self, resource: SwapiResource, pages: list[int], report: WarmupReport
+    ) -> list[dict[str, Any]]:
+        params = {
+            page: SwapiQueryParams(resource=resource, page=page)
+            for page in pages
+        }
+        cache_keys = {
+            page: self.cache_repository.build_cache_key(page_params)
+            for page, page_params in params.items()
+        }
+        cached = await self.cache_repository.get_many(
+            list(cache_keys.values())
+        )
+        missing = [page for page in pages if cache_keys[page] not in cached]
+
+        fetched = await asyncio.gather(
+            *[self._fetch(params[page]) for page in missing]
+        )
+        fetched_by_key = {
+            cache_keys[page]: data
+            for page, data in zip(missing, fetched, strict=True)
+        }
+        await self.cache_repository.set_many(fetched_by_key)
+
+        report.pages_cached += len(pages) - len(missing)
+        report.pages_fetched += len(missing)
+        loaded = cached | fetched_by_key
+        return [loaded[cache_keys[page]] for page in pages]
+
+    async def _fetch(self, params: SwapiQueryParams) -> dict[str, Any]:
+        async with self.semaphore:
+            return await self.swapi_service.fetch_from_swapi(params)
+
+    def _record_entries(
+        self, records: list[dict[str, Any]]
+    ) -> dict[str, dict[str, Any]]:
+        entries: dict[str, dict[str, Any]] = {}
+        for record in records:
+            resource, item_id = parse_resource_url(record['url'])
+            params = SwapiQueryParams(
+                resource=SwapiResource(resource), id=item_id
+            )
+            resource_key = self.cache_repository.build_resource_cache_key(
+                record['url']
+            )
+            entries[self.cache_repository.build_cache_key(params)] = record
+            entries[resource_key] = record
+        return entries
+
+
+def log_warmup_failure(task: asyncio.Task[WarmupReport]) -> None:
+    if task.cancelled():
+        return
+
+    error = task.exception()
+    if error is not None:
+        logger.opt(exception=error).error('Cache warm-up crashed')
+
+
+def create_cache_warmup_service(
+    http_client: httpx.AsyncClient,
+) -> CacheWarmupService:
+    cache_repository = CacheRepository(
+        client=get_redis_client(), memory_cache=get_memory_cache()
+    )
+    snapshot_service = SnapshotSwapiDataService(get_snapshot_repository())
+    swapi_service = SwapiDataService(
+        cache_repository=cache_repository,
+        expand_service=ExpandSwapiDataService(
+            http_client=http_client,
+            cache_repository=cache_repository,
+            semaphore=asyncio.Semaphore(settings.EXPAND_MAX_CONCURRENCY),
+            snapshot_service=snapshot_service,
+        ),
+        http_client=http_client,
+        single_flight=get_single_flight(),
+        snapshot_service=snapshot_service,
+        collection_repository=get_collection_repository(),
+    )
+    return CacheWarmupService(swapi_service, cache_repository)
@@ -1,9 +1,26 @@
 import asyncio
-from typing import Any, ClassVar
+import time
+from collections.abc import Iterator
+from typing import Annotated, Any, ClassVar
 
 import httpx
+from fastapi import Depends
 from loguru import logger
 
+from infra.circuit_breaker import get_circuit_breaker
+from infra.hedging import get_expand_hedger
+from infra.http_client import get_expand_semaphore, get_http_client
+from infra.metrics import (
+    EXPAND_CPU_SECONDS,
+    EXPAND_FANOUT_SIZE,
+    UPSTREAM_EXPAND,
+)
+from infra.retry import get_retry_policy
+from infra.server_timing import timed
+from infra.settings import settings
+from repositories.cache_repository import CacheRepository
+from services.snapshot_swapi_data_service import SnapshotSwapiDataService
+
 
 class ExpandSwapiDataService:
     _skip_fields: ClassVar[set[str]] = {
@@ -14,6 +31,24 @@ class ExpandSwapiDataService:
         'edited',
     }
 
+    def __init__(
+        self,
+        http_client: Annotated[httpx.AsyncClient, Depends(get_http_client)],
+        cache_repository: Annotated[CacheRepository, Depends()],
+        semaphore: Annotated[asyncio.Semaphore, Depends(get_expand_semaphore)],
+        snapshot_service: Annotated[SnapshotSwapiDataService, Depends()],
+    ) -> None:
+        self.http_client = http_client
+        self.cache_repository = cache_repository
+        self.semaphore = semaphore
+        self.snapshot_service = snapshot_service
+        self.circuit_breaker = get_circuit_breaker()
+        self.retry_policy = get_retry_policy()
+        self.hedger = get_expand_hedger()
+        self.use_snapshot = settings.SWAPI_BACKEND == 'snapshot'
+        self.max_fanout = settings.EXPAND_MAX_FANOUT
+        self.timeout = settings.EXPAND_TIMEOUT_SECONDS
+
     def _parse_fields(self, expand: str) -> set[str] | None:
         if expand.lower() == 'all':
             return None
@@ -21,64 +56,166 @@ class ExpandSwapiDataService:
 
     async def expand(
         self,
-        client: httpx.AsyncClient,
         data: dict[str, Any],
         expand: str,
     ) -> dict[str, Any]:
+        with timed('expand'):
+            return await self._expand(data, expand)
+
+    async def _expand(
+        self,
+        data: dict[str, Any],
+        expand: str,
+    ) -> dict[str, Any]:
+        started = time.thread_time()
         fields = self._parse_fields(expand)
+        items = data.get('results', [data])
+
+        urls = dict.fromkeys(
+            url for item in items for url in self._links(item, fields)
+        )
+        cpu_seconds = time.thread_time() - started
+        EXPAND_FANOUT_SIZE.observe(len(urls))
+        resources = await self._resolve(list(urls))
+
+        started = time.thread_time()
+        expanded = [self._replace_links(i, fields, resources) for i in items]
+        EXPAND_CPU_SECONDS.observe(cpu_seconds + time.thread_time() - started)
+
         if 'results' not in data:
-            return await self._expand_item(client, data, fields)
-
-        data['results'] = list(
-            await asyncio.gather(
-                *[
-                    self._expand_item(client, i, fields)
-                    for i in data['results']
-                ]
-            )
+            return expanded[0]
+        return data | {'results': expanded}
+
+    def is_partial(self, data: dict[str, Any]) -> bool:
+        items = data.get('results', [data])
+        return any(
+            self._is_fetch_error(value)
+            for item in items
+            for value in item.values()
         )
-        return data
 
-    async def _expand_item(
+    def _is_fetch_error(self, value: object) -> bool:
+        match value:
+            case dict():
+                return 'error' in value
+            case list():
+                return any(isinstance(v, dict) and 'error' in v for v in value)
+        return False
+
+    def _should_expand(self, key: str, fields: set[str] | None) -> bool:
+        if key in self._skip_fields:
+            return False
+        if fields is None:
+            return True
+        return key in fields
+
+    def _links(
+        self, item: dict[str, Any], fields: set[str] | None
+    ) -> Iterator[str]:
+        for key, value in item.items():
+            if not self._should_expand(key, fields):
+                continue
+            match value:
+                case str() if value.startswith('http'):
+                    yield value
+                case list() if value and all(
+                    isinstance(v, str) and v.startswith('http') for v in value
+                ):
+                    yield from value
+
+    def _replace_links(
         self,
-        client: httpx.AsyncClient,
         item: dict[str, Any],
-        fields: set[str] | None = None,
+        fields: set[str] | None,
+        resources: dict[str, dict[str, Any]],
     ) -> dict[str, Any]:
-        async def fetch(url: str) -> dict[str, Any]:
-            try:
-                resp = await client.get(url)
-                resp.raise_for_status()
-                return resp.json()
-            except httpx.HTTPError:
-                logger.warning(f'Failed to fetch {url}')
-                return {'url': url, 'error': 'Failed to fetch resource'}
-
-        async def fetch_many(urls: list[str]) -> list[dict[str, Any]]:
-            return list(await asyncio.gather(*[fetch(u) for u in urls]))
-
-        def make_task(val: object) -> asyncio.Task[Any] | None:
-            match val:
-                case str() if val.startswith('http'):
-                    return asyncio.create_task(fetch(val))
-                case list() if val and all(
-                    isinstance(v, str) and v.startswith('http') for v in val
-                ):
-                    return asyncio.create_task(fetch_many(val))
-            return None
+        expanded: dict[str, Any] = {}
+        for key, value in item.items():
+            if not self._should_expand(key, fields):
+                continue
+            match value:
+                case str() if value in resources:
+                    expanded[key] = resources[value]
+                case list() if value and all(v in resources for v in value):
+                    expanded[key] = [resources[v] for v in value]
+        return item | expanded
+
+    async def _resolve(self, urls: list[str]) -> dict[str, dict[str, Any]]:
+        if self.use_snapshot:
+            return {
+                url: self.snapshot_service.get_by_url(url)
+                or {'url': url, 'error': 'Failed to fetch resource'}
+                for url in urls
+            }
+
+        resources = await self.cache_repository.get_resources(urls)
+        missing = [url for url in urls if url not in resources]
+        within_budget = missing[: self.max_fanout]
+
+        fetched = await self._fetch_many(within_budget)
+        fetched_resources = {
+            url: resource
+            for url, resource in fetched.items()
+            if resource is not None
+        }
+        await self.cache_repository.set_resources(fetched_resources)
 
-        def should_expand(key: str) -> bool:
-            if key in self._skip_fields:
-                return False
-            if fields is None:
-                return True
-            return key in fields
-
-        tasks = {
-            k: task
-            for k, v in item.items()
-            if should_expand(k) and (task := make_task(v))
+        failed = {
+            url: self._placeholder(url, within_budget, fetched)
+            for url in missing
+            if url not in fetched_resources
         }
+        return resources | fetched_resources | failed
+
+    def _placeholder(
+        self,
+        url: str,
+        within_budget: list[str],
+        fetched: dict[str, dict[str, Any] | None],
+    ) -> dict[str, Any]:
+        if url not in within_budget:
+            error = 'Expansion budget exceeded'
+        elif url not in fetched:
+            error = 'Expansion deadline exceeded'
+        else:
+            error = 'Failed to fetch resource'
+        return {'url': url, 'error': error}
+
+    async def _fetch_many(
+        self, urls: list[str]
+    ) -> dict[str, dict[str, Any] | None]:
+        if not urls:
+            return {}
 
-        results = await asyncio.gather(*tasks.values())
-        return item | dict(zip(tasks.keys(), results, strict=True))
+        tasks = {url: asyncio.create_task(self._fetch(url)) for url in urls}
+        done, pending = await asyncio.wait(
+            tasks.values(), timeout=self.timeout
+        )
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(
+                f'Expansion deadline exceeded, {len(pending)} fetches dropped'
+            )
+
+        return {
+            url: task.result() for url, task in tasks.items() if task in done
+        }
+
+    async def _fetch(self, url: str) -> dict[str, Any] | None:
+        try:
+            return await self.retry_policy.run(
+                lambda: self.hedger.run(lambda: self._fetch_once(url)),
+                UPSTREAM_EXPAND.retries,
+            )
+        except httpx.HTTPError:
+            logger.warning(f'Failed to fetch {url}')
+            return None
+
+    async def _fetch_once(self, url: str) -> dict[str, Any]:
+        async with self.semaphore:
+            with self.circuit_breaker.guard(), UPSTREAM_EXPAND.track() as call:
+                resp = await self.http_client.get(url)
+                call.status = resp.status_code
+                resp.raise_for_status()
+        return resp.json()
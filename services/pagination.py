@@ -0,0 +1,24 @@
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from exceptions.errors import NotFoundError
+
+SWAPI_PAGE_SIZE = 10
+
+
+def paginate[T](
+    records: Sequence[T],
+    page: int,
+    page_url: Callable[[int], str],
+) -> dict[str, Any]:
+    start = (page - 1) * SWAPI_PAGE_SIZE
+    end = start + SWAPI_PAGE_SIZE
+    if page > 1 and start >= len(records):
+        raise NotFoundError
+
+    return {
+        'count': len(records),
+        'next': page_url(page + 1) if end < len(records) else None,
+        'previous': page_url(page - 1) if page > 1 else None,
+        'results': list(records[start:end]),
+    }
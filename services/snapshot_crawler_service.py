@@ -0,0 +1,59 @@
+import asyncio
+import math
+from typing import Any
+from urllib.parse import urljoin
+
+import httpx
+from loguru import logger
+
+from infra.settings import settings
+from repositories.snapshot_repository import SnapshotRepository
+from schemas.swapi_query_params_schema import SwapiResource
+from services.pagination import SWAPI_PAGE_SIZE
+
+
+class SnapshotCrawlerService:
+    def __init__(
+        self, http_client: httpx.AsyncClient, repository: SnapshotRepository
+    ) -> None:
+        self.http_client = http_client
+        self.repository = repository
+        self.base_url = settings.SWAPI_BASE_URL
+
+    async def build_snapshot(self) -> int:
+        resources = list(SwapiResource)
+        crawled = await asyncio.gather(
+            *[self._crawl_resource(r) for r in resources]
+        )
+        records = dict(zip(resources, crawled, strict=True))
+
+        self.repository.write(records)
+        total = sum(len(items) for items in crawled)
+        logger.info(
+            f'Snapshot with {total} records written to {self.repository.path}'
+        )
+        return total
+
+    async def _crawl_resource(
+        self, resource: SwapiResource
+    ) -> list[dict[str, Any]]:
+        first_page = await self._fetch_page(resource, 1)
+        pages = math.ceil(first_page['count'] / SWAPI_PAGE_SIZE)
+
+        other_pages = await asyncio.gather(
+            *[self._fetch_page(resource, p) for p in range(2, pages + 1)]
+        )
+        records = first_page['results'] + [
+            record for page in other_pages for record in page['results']
+        ]
+
+        logger.info(f'Crawled {len(records)} {resource.value}')
+        return records
+
+    async def _fetch_page(
+        self, resource: SwapiResource, page: int
+    ) -> dict[str, Any]:
+        url = urljoin(self.base_url, f'{resource.value}/')
+        response = await self.http_client.get(url, params={'page': page})
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,59 @@
+from typing import Annotated, Any
+from urllib.parse import urlencode, urljoin
+
+from fastapi import Depends
+
+from exceptions.errors import NotFoundError
+from infra.settings import settings
+from repositories.snapshot_repository import (
+    SnapshotRepository,
+    get_snapshot_repository,
+)
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from services.pagination import paginate
+
+
+class SnapshotSwapiDataService:
+    def __init__(
+        self,
+        repository: Annotated[
+            SnapshotRepository, Depends(get_snapshot_repository)
+        ],
+    ) -> None:
+        self.repository = repository
+        self.base_url = settings.SWAPI_BASE_URL
+
+    def fetch(self, params: SwapiQueryParams) -> dict[str, Any]:
+        if params.id:
+            record = self.repository.get_record(
+                params.resource.value, params.id
+            )
+            if record is None:
+                raise NotFoundError
+            return record
+
+        if params.search:
+            records = self.repository.search(params.resource, params.search)
+        else:
+            records = self.repository.list_records(params.resource)
+
+        return paginate(
+            records,
+            params.page or 1,
+            lambda page: self._page_url(params, page),
+        )
+
+    def list_records(self, resource: SwapiResource) -> list[dict[str, Any]]:
+        return self.repository.list_records(resource)
+
+    def get_by_url(self, url: str) -> dict[str, Any] | None:
+        return self.repository.get_record_by_url(url)
+
+    def _page_url(self, params: SwapiQueryParams, page: int) -> str:
+        query: dict[str, str | int] = {}
+        if params.search:
+            query['search'] = params.search
+        query['page'] = page
+
+        resource_url = urljoin(self.base_url, f'{params.resource.value}/')
+        return f'{resource_url}?{urlencode(query)}'
@@ -1,8 +1,68 @@
-from typing import Any
+import math
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Self
 
+from infra.metrics import SORT_CPU_SECONDS, observe_duration
+from infra.server_timing import timed
 from schemas.swapi_query_params_schema import SortOrder
 
 
+@dataclass(frozen=True)
+class SortColumn:
+    numbers: array[float]
+    strings: dict[int, str]
+    invalid: list[int]
+
+    _invalid_values = (None, 'unknown', 'n/a')
+
+    @classmethod
+    def from_records(cls, records: list[dict[str, Any]], field: str) -> Self:
+        numbers = array('d', [math.nan]) * len(records)
+        strings: dict[int, str] = {}
+        invalid: list[int] = []
+
+        for position, item in enumerate(records):
+            value = item.get(field)
+            if value in cls._invalid_values:
+                invalid.append(position)
+                continue
+
+            if isinstance(value, str):
+                try:
+                    number = float(value.replace(',', ''))
+                except ValueError:
+                    strings[position] = value.lower()
+                    continue
+            elif isinstance(value, int | float):
+                number = float(value)
+            else:
+                number = 0.0
+
+            if math.isnan(number):
+                invalid.append(position)
+            else:
+                numbers[position] = number
+
+        return cls(numbers=numbers, strings=strings, invalid=invalid)
+
+    def argsort(self, sort_order: SortOrder) -> list[int]:
+        is_descending = sort_order == SortOrder.DESC
+        numbers = self.numbers
+        numeric = sorted(
+            (p for p in range(len(numbers)) if not math.isnan(numbers[p])),
+            key=numbers.__getitem__,
+            reverse=is_descending,
+        )
+        text = sorted(
+            self.strings, key=self.strings.__getitem__, reverse=is_descending
+        )
+
+        valid = text + numeric if is_descending else numeric + text
+        return valid + self.invalid
+
+
 class SortSwapiDataService:
     def sort(
         self,
@@ -13,10 +73,24 @@ class SortSwapiDataService:
         if 'results' not in data:
             return data
 
-        data['results'] = self._sort_results(
-            data['results'], sort_by, sort_order
-        )
-        return data
+        return data | {
+            'results': self._sort_results(data['results'], sort_by, sort_order)
+        }
+
+    def sort_positions(
+        self,
+        results: list[dict[str, Any]],
+        sort_by: str,
+        sort_order: SortOrder,
+        column: SortColumn | None = None,
+    ) -> list[int]:
+        with (
+            timed('sort'),
+            observe_duration(SORT_CPU_SECONDS, time.thread_time),
+        ):
+            if column is None:
+                column = SortColumn.from_records(results, sort_by)
+            return column.argsort(sort_order)
 
     def _sort_results(
         self,
@@ -24,26 +98,5 @@ class SortSwapiDataService:
         sort_by: str,
         sort_order: SortOrder,
     ) -> list[dict[str, Any]]:
-        invalid_values = {None, 'unknown', 'n/a'}
-
-        def sort_key(item: dict[str, Any]) -> float | str:
-            value = item.get(sort_by, '')
-            if isinstance(value, str):
-                try:
-                    return float(value.replace(',', ''))
-                except ValueError:
-                    return value.lower()
-            return float(value) if value is not None else 0.0
-
-        valid_items: list[dict[str, Any]] = []
-        invalid_items: list[dict[str, Any]] = []
-        for item in results:
-            if item.get(sort_by) in invalid_values:
-                invalid_items.append(item)
-            else:
-                valid_items.append(item)
-
-        is_descending = sort_order == SortOrder.DESC
-        sorted_valid = sorted(valid_items, key=sort_key, reverse=is_descending)
-
-        return sorted_valid + invalid_items
+        positions = self.sort_positions(results, sort_by, sort_order)
+        return [results[position] for position in positions]
@@ -1,42 +1,244 @@
-from typing import Annotated
-from urllib.parse import urljoin
+import asyncio
+import math
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Any
+from urllib.parse import urlencode, urljoin
 
 import httpx
 from fastapi import Depends
 from loguru import logger
 
+from infra import json_codec
+from infra.circuit_breaker import CircuitState, get_circuit_breaker
+from infra.hedging import get_fetch_hedger
+from infra.http_cache import ResponseBody, ResponseValidator, compute_etag
+from infra.http_client import get_http_client
+from infra.metrics import UPSTREAM_FETCH
+from infra.retry import get_retry_policy
+from infra.server_timing import timed
 from infra.settings import settings
-from repositories.cache_repository import CacheRepository
-from schemas.swapi_query_params_schema import SwapiQueryParams
+from infra.single_flight import SingleFlight, get_single_flight
+from repositories.cache_repository import (
+    CacheEntry,
+    CacheRepository,
+    CacheState,
+)
+from repositories.collection_repository import (
+    CollectionRepository,
+    ResourceCollection,
+    get_collection_repository,
+)
+from schemas.swapi_query_params_schema import (
+    SortOrder,
+    SortScope,
+    SwapiQueryParams,
+    SwapiResource,
+)
 from services.expand_swapi_data_service import ExpandSwapiDataService
-from services.sort_swapi_data_service import SortSwapiDataService
+from services.pagination import SWAPI_PAGE_SIZE, paginate
+from services.snapshot_swapi_data_service import SnapshotSwapiDataService
+from services.sort_swapi_data_service import (
+    SortColumn,
+    SortSwapiDataService,
+)
 
 
 class SwapiDataService:
-    def __init__(
+    def __init__(  # noqa: PLR0913, PLR0917
         self,
         cache_repository: Annotated[CacheRepository, Depends()],
+        expand_service: Annotated[ExpandSwapiDataService, Depends()],
+        http_client: Annotated[httpx.AsyncClient, Depends(get_http_client)],
+        single_flight: Annotated[SingleFlight, Depends(get_single_flight)],
+        snapshot_service: Annotated[SnapshotSwapiDataService, Depends()],
+        collection_repository: Annotated[
+            CollectionRepository, Depends(get_collection_repository)
+        ],
     ) -> None:
         self.base_url = settings.SWAPI_BASE_URL
-        self.expand_service = ExpandSwapiDataService()
+        self.use_snapshot = settings.SWAPI_BACKEND == 'snapshot'
+        self.expand_service = expand_service
         self.sort_service = SortSwapiDataService()
         self.cache_repository = cache_repository
+        self.http_client = http_client
+        self.single_flight = single_flight
+        self.snapshot_service = snapshot_service
+        self.collection_repository = collection_repository
+        self.circuit_breaker = get_circuit_breaker()
+        self.retry_policy = get_retry_policy()
+        self.hedger = get_fetch_hedger()
+        self.cache_status: str | None = None
 
     async def get_swapi_data(
         self, params: SwapiQueryParams
     ) -> dict[str, object]:
-        cached_data = await self.cache_repository.get(params)
-        if cached_data is not None:
-            data = cached_data
+        result = await self._resolve(params)
+        return result.data if isinstance(result, CacheEntry) else result
+
+    async def get_swapi_body(self, params: SwapiQueryParams) -> ResponseBody:
+        result = await self._resolve(params)
+        if isinstance(result, CacheEntry):
+            return ResponseBody(
+                result.body.encode(), result.etag, self._fresh_until(result)
+            )
+        with timed('serialize'):
+            content = json_codec.dumps_bytes(result)
+        body = ResponseBody(
+            content, compute_etag(content), self._fresh_until(None)
+        )
+        self._remember_validator(params, result, body)
+        return body
+
+    def get_validator(
+        self, params: SwapiQueryParams
+    ) -> ResponseValidator | None:
+        collection = self._validator_collection(params)
+        if collection is None:
+            return None
+        return collection.validators.get(
+            self.cache_repository.build_response_cache_key(params)
+        )
+
+    def _remember_validator(
+        self,
+        params: SwapiQueryParams,
+        data: dict[str, object],
+        body: ResponseBody,
+    ) -> None:
+        collection = self._validator_collection(params)
+        if collection is None or (
+            params.expand and self.expand_service.is_partial(data)
+        ):
+            return
+        collection.validators[
+            self.cache_repository.build_response_cache_key(params)
+        ] = ResponseValidator(body.etag, len(body.content), body.fresh_until)
+
+    def _fresh_until(self, entry: CacheEntry | None) -> float:
+        if entry is not None and entry.state != CacheState.FRESH:
+            return 0.0
+        if entry is not None and entry.fresh_until is not None:
+            return entry.fresh_until
+        return self.cache_repository.clock() + self.cache_repository.soft_ttl
+
+    def _validator_collection(
+        self, params: SwapiQueryParams
+    ) -> ResourceCollection | None:
+        if not self._is_collection_sort(params) or params.search:
+            return None
+        return self.collection_repository.get(params.resource)
+
+    async def _resolve(
+        self, params: SwapiQueryParams
+    ) -> CacheEntry | dict[str, object]:
+        if self._is_collection_sort(params) or self.use_snapshot:
+            return await self.load_swapi_data(params)
+
+        if not (params.expand or params.sort_by):
+            return await self._get_raw_entry(params)
+
+        entry = await self.cache_repository.get_response_entry(params)
+        return await self.serve_entry(params, entry)
+
+    async def serve_entry(
+        self, params: SwapiQueryParams, entry: CacheEntry | None
+    ) -> CacheEntry | dict[str, object]:
+        if not (params.expand or params.sort_by):
+            return await self._serve_raw(params, entry)
+
+        return await self._serve_cached(
+            entry,
+            self.cache_repository.build_response_cache_key(params),
+            lambda: self._build_response(params, refresh=entry is not None),
+        )
+
+    def build_cache_key(self, params: SwapiQueryParams) -> str | None:
+        if self._is_collection_sort(params) or self.use_snapshot:
+            return None
+        if params.expand or params.sort_by:
+            return self.cache_repository.build_response_cache_key(params)
+        return self.cache_repository.build_cache_key(params)
+
+    async def load_swapi_data(
+        self, params: SwapiQueryParams
+    ) -> dict[str, object]:
+        if params.sort_by and self._is_collection_sort(params):
+            return await self._get_sorted_collection(params, params.sort_by)
+
+        if self.use_snapshot:
+            data = self.snapshot_service.fetch(params)
+            return await self._process(params, data)
+
+        if not (params.expand or params.sort_by):
+            return await self._load_raw_data(params)
+
+        cache_key = self.cache_repository.build_response_cache_key(params)
+        return await self.single_flight.do(
+            cache_key, lambda: self._build_response(params)
+        )
+
+    def _is_collection_sort(self, params: SwapiQueryParams) -> bool:
+        return bool(
+            params.sort_by
+            and params.sort_scope == SortScope.COLLECTION
+            and not params.id
+        )
+
+    async def _serve_cached(
+        self,
+        entry: CacheEntry | None,
+        cache_key: str,
+        load: Callable[[], Awaitable[dict[str, object]]],
+    ) -> CacheEntry | dict[str, object]:
+        if entry is not None and entry.state == CacheState.FRESH:
+            return entry
+
+        if entry is not None and entry.state == CacheState.STALE:
+            if self.circuit_breaker.state != CircuitState.OPEN:
+                refresh = self.single_flight.spawn(cache_key, load)
+                refresh.add_done_callback(self._log_refresh_error)
+            self.cache_status = 'stale'
+            return entry
+
+        try:
+            return await self.single_flight.do(cache_key, load)
+        except httpx.HTTPError as exc:
+            if entry is None or not self._can_serve_stale(exc):
+                raise
+            logger.warning(f'Serving stale {cache_key} after {exc!r}')
+            self.cache_status = 'stale-if-error'
+            return entry
+
+    def _can_serve_stale(self, exc: httpx.HTTPError) -> bool:
+        if not settings.CACHE_SERVE_STALE_ON_ERROR:
+            return False
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.is_server_error
+        return True
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f'Cache refresh failed: {task.exception()!r}')
+
+    async def _build_response(
+        self, params: SwapiQueryParams, *, refresh: bool = False
+    ) -> dict[str, object]:
+        if refresh:
+            raw_data = await self._load_raw_data(params)
         else:
-            data = await self._fetch_from_swapi(params)
-            await self.cache_repository.set(params, data)
+            raw_data = await self._get_raw_data(params)
+        data = await self._process(params, raw_data)
+
+        if not (params.expand and self.expand_service.is_partial(data)):
+            await self.cache_repository.set_response(params, data)
+        return data
 
+    async def _process(
+        self, params: SwapiQueryParams, data: dict[str, object]
+    ) -> dict[str, object]:
         if params.expand:
-            async with httpx.AsyncClient() as client:
-                data = await self.expand_service.expand(
-                    client, data, params.expand
-                )
+            data = await self.expand_service.expand(data, params.expand)
 
         if params.sort_by:
             data = self.sort_service.sort(
@@ -45,7 +247,140 @@ class SwapiDataService:
 
         return data
 
-    async def _fetch_from_swapi(
+    async def _get_sorted_collection(
+        self, params: SwapiQueryParams, sort_by: str
+    ) -> dict[str, object]:
+        collection = await self._get_collection(params.resource)
+        positions = self._sorted_positions(
+            collection, sort_by, params.sort_order
+        )
+
+        if params.search:
+            matches = set(
+                collection.search_index.search_positions(params.search)
+            )
+            positions = [p for p in positions if p in matches]
+
+        data = paginate(
+            [collection.records[position] for position in positions],
+            params.page or 1,
+            lambda page: self._collection_page_url(params, page),
+        )
+
+        if params.expand:
+            data = await self.expand_service.expand(data, params.expand)
+        return data
+
+    def _sorted_positions(
+        self,
+        collection: ResourceCollection,
+        sort_by: str,
+        sort_order: SortOrder,
+    ) -> list[int]:
+        index_key = (sort_by, sort_order)
+        positions = collection.sorted_positions.get(index_key)
+        if positions is None:
+            column = collection.columns.get(sort_by)
+            if column is None:
+                column = SortColumn.from_records(collection.records, sort_by)
+                collection.columns[sort_by] = column
+            positions = self.sort_service.sort_positions(
+                collection.records, sort_by, sort_order, column
+            )
+            collection.sorted_positions[index_key] = positions
+        return positions
+
+    async def _get_collection(
+        self, resource: SwapiResource
+    ) -> ResourceCollection:
+        collection = self.collection_repository.get(resource)
+        if collection is not None:
+            return collection
+
+        return await self.single_flight.do(
+            f'collection:{resource.value}',
+            lambda: self._load_collection(resource),
+        )
+
+    async def _load_collection(
+        self, resource: SwapiResource
+    ) -> ResourceCollection:
+        if self.use_snapshot:
+            records = self.snapshot_service.list_records(resource)
+        else:
+            records = await self.cache_repository.get_collection(resource)
+            if records is None:
+                records = await self._fetch_collection(resource)
+                await self.cache_repository.set_collection(resource, records)
+
+        return self.collection_repository.set(resource, records)
+
+    async def _fetch_collection(self, resource: SwapiResource) -> list[dict]:
+        first_page: dict[str, Any] = await self._get_raw_data(
+            SwapiQueryParams(resource=resource)
+        )
+        page_count = math.ceil(first_page['count'] / SWAPI_PAGE_SIZE)
+        other_pages: list[dict[str, Any]] = await asyncio.gather(
+            *(
+                self._get_raw_data(
+                    SwapiQueryParams(resource=resource, page=page)
+                )
+                for page in range(2, page_count + 1)
+            )
+        )
+
+        return [
+            record
+            for data in (first_page, *other_pages)
+            for record in data['results']
+        ]
+
+    def _collection_page_url(self, params: SwapiQueryParams, page: int) -> str:
+        query = params.model_dump(
+            mode='json', exclude_none=True, exclude={'page'}
+        )
+        query['page'] = page
+
+        base_url = settings.API_GATEWAY_URL.rstrip('/')
+        return f'{base_url}/api/v1/swapi?{urlencode(query)}'
+
+    async def _get_raw_data(
+        self, params: SwapiQueryParams
+    ) -> dict[str, object]:
+        result = await self._get_raw_entry(params)
+        return result.data if isinstance(result, CacheEntry) else result
+
+    async def _get_raw_entry(
+        self, params: SwapiQueryParams
+    ) -> CacheEntry | dict[str, object]:
+        entry = await self.cache_repository.get_entry(params)
+        return await self._serve_raw(params, entry)
+
+    async def _serve_raw(
+        self, params: SwapiQueryParams, entry: CacheEntry | None
+    ) -> CacheEntry | dict[str, object]:
+        return await self._serve_cached(
+            entry,
+            self.cache_repository.build_cache_key(params),
+            lambda: self._fetch_and_cache(params),
+        )
+
+    async def _load_raw_data(
+        self, params: SwapiQueryParams
+    ) -> dict[str, object]:
+        cache_key = self.cache_repository.build_cache_key(params)
+        return await self.single_flight.do(
+            cache_key, lambda: self._fetch_and_cache(params)
+        )
+
+    async def _fetch_and_cache(
+        self, params: SwapiQueryParams
+    ) -> dict[str, object]:
+        data = await self.fetch_from_swapi(params)
+        await self.cache_repository.set(params, data)
+        return data
+
+    async def fetch_from_swapi(
         self, params: SwapiQueryParams
     ) -> dict[str, object]:
         resource_url = urljoin(self.base_url, f'{params.resource.value}/')
@@ -60,10 +395,23 @@ class SwapiDataService:
             query_params['page'] = params.page
 
         logger.debug(resource_url)
-        async with httpx.AsyncClient() as client:
-            response = await client.get(resource_url, params=query_params)
-            response.raise_for_status()
-            data = response.json()
+        with timed('upstream'):
+            response = await self.retry_policy.run(
+                lambda: self.hedger.run(
+                    lambda: self._get(resource_url, query_params)
+                ),
+                UPSTREAM_FETCH.retries,
+            )
+        data = response.json()
 
         logger.debug(f'{response}, {data}')
         return data
+
+    async def _get(
+        self, url: str, query_params: dict[str, str | int]
+    ) -> httpx.Response:
+        with self.circuit_breaker.guard(), UPSTREAM_FETCH.track() as call:
+            response = await self.http_client.get(url, params=query_params)
+            call.status = response.status_code
+            response.raise_for_status()
+        return response
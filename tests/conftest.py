@@ -1,5 +1,7 @@
+import asyncio
 from collections.abc import AsyncGenerator, Generator
 from http import HTTPStatus
+from pathlib import Path
 from urllib.parse import urljoin
 
 import httpx
@@ -7,13 +9,26 @@ import pytest
 import pytest_asyncio
 from fakeredis.aioredis import FakeRedis as FakeAsyncRedis
 from fastapi.testclient import TestClient
+from redis.asyncio.client import Pipeline
 from respx import MockRouter
 
+from infra.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from infra.memory_cache import MemoryCache
+from infra.metrics import registry
 from infra.redis_client import get_redis_client
 from infra.settings import settings
+from infra.single_flight import SingleFlight
 from main import app
 from repositories.cache_repository import CacheRepository
+from repositories.collection_repository import (
+    CollectionRepository,
+    get_collection_repository,
+)
+from repositories.snapshot_repository import SnapshotRepository
 from schemas.swapi_query_params_schema import SwapiResource
+from services.expand_swapi_data_service import ExpandSwapiDataService
+from services.snapshot_swapi_data_service import SnapshotSwapiDataService
+from services.swapi_data_service import SwapiDataService
 from tests.mock_data import (
     ANAKIN_SKYWALKER,
     ARVEL_CRYNYD,
@@ -29,27 +44,111 @@ from tests.mock_data import (
 BASE_URL = settings.SWAPI_BASE_URL
 
 
+def sample_value(name: str, **labels: str) -> float:
+    return registry.get_sample_value(name, labels) or 0.0
+
+
+class FakeUpstashRedis(FakeAsyncRedis):
+    def pipeline(self) -> Pipeline:  # type: ignore[override]
+        pipeline = super().pipeline()
+        pipeline.exec = pipeline.execute  # type: ignore[attr-defined]
+        return pipeline
+
+
+@pytest.fixture(autouse=True)
+def circuit_breaker() -> Generator[CircuitBreaker]:
+    get_circuit_breaker.cache_clear()
+    yield get_circuit_breaker()
+    get_circuit_breaker.cache_clear()
+
+
 @pytest_asyncio.fixture
 async def redis_client() -> AsyncGenerator[FakeAsyncRedis]:
-    client: FakeAsyncRedis = FakeAsyncRedis(decode_responses=True)
+    client: FakeAsyncRedis = FakeUpstashRedis(decode_responses=True)
     yield client
     await client.aclose()
 
 
 @pytest.fixture
-def cache_repository(redis_client: FakeAsyncRedis) -> CacheRepository:
-    repo = CacheRepository(client=redis_client)  # type: ignore[arg-type]
+def memory_cache() -> MemoryCache[str]:
+    return MemoryCache(max_items=16, max_bytes=64 * 1024, ttl_seconds=60)
+
+
+@pytest.fixture
+def cache_repository(
+    redis_client: FakeAsyncRedis, memory_cache: MemoryCache
+) -> CacheRepository:
+    repo = CacheRepository(
+        client=redis_client,  # type: ignore[arg-type]
+        memory_cache=memory_cache,
+    )
     repo.enabled = True
     return repo
 
 
+@pytest_asyncio.fixture
+async def http_client() -> AsyncGenerator[httpx.AsyncClient]:
+    async with httpx.AsyncClient() as client:
+        yield client
+
+
+@pytest.fixture
+def single_flight() -> SingleFlight:
+    return SingleFlight()
+
+
+@pytest.fixture
+def snapshot_repository(tmp_path: Path) -> SnapshotRepository:
+    return SnapshotRepository(tmp_path / 'swapi_snapshot.sqlite3')
+
+
+@pytest.fixture
+def snapshot_service(
+    snapshot_repository: SnapshotRepository,
+) -> SnapshotSwapiDataService:
+    return SnapshotSwapiDataService(repository=snapshot_repository)
+
+
 @pytest.fixture
-def client(redis_client: FakeAsyncRedis) -> Generator[TestClient]:
+def collection_repository() -> CollectionRepository:
+    return CollectionRepository(ttl_seconds=60)
+
+
+@pytest.fixture
+def service(
+    cache_repository: CacheRepository,
+    http_client: httpx.AsyncClient,
+    single_flight: SingleFlight,
+    snapshot_service: SnapshotSwapiDataService,
+    collection_repository: CollectionRepository,
+) -> SwapiDataService:
+    return SwapiDataService(
+        cache_repository=cache_repository,
+        expand_service=ExpandSwapiDataService(
+            http_client=http_client,
+            cache_repository=cache_repository,
+            semaphore=asyncio.Semaphore(settings.EXPAND_MAX_CONCURRENCY),
+            snapshot_service=snapshot_service,
+        ),
+        http_client=http_client,
+        single_flight=single_flight,
+        snapshot_service=snapshot_service,
+        collection_repository=collection_repository,
+    )
+
+
+@pytest.fixture
+def client(
+    redis_client: FakeAsyncRedis, collection_repository: CollectionRepository
+) -> Generator[TestClient]:
     def get_redis_client_override() -> FakeAsyncRedis:  # type: ignore[return-value]
         return redis_client
 
     with TestClient(app) as client:
         app.dependency_overrides[get_redis_client] = get_redis_client_override
+        app.dependency_overrides[get_collection_repository] = lambda: (
+            collection_repository
+        )
         yield client
         app.dependency_overrides.clear()
 
@@ -225,3 +324,14 @@ def mock_people_for_sort(respx_mock: MockRouter) -> MockRouter:
         return_value=httpx.Response(HTTPStatus.OK, json=data)
     )
     return respx_mock
+
+
+@pytest.fixture
+def mock_linked_resources(respx_mock: MockRouter) -> MockRouter:
+    def linked_resource(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(HTTPStatus.OK, json={'url': str(request.url)})
+
+    respx_mock.get(url__regex=r'^https://swapi\.dev/api/\w+/\d+/$').mock(
+        side_effect=linked_resource
+    )
+    return respx_mock
@@ -0,0 +1,249 @@
+import asyncio
+import json
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from fakeredis.aioredis import FakeRedis as FakeAsyncRedis
+from fastapi.testclient import TestClient
+
+from exceptions.errors import ServiceUnavailableError
+from infra.settings import settings
+from repositories.api_key_repository import (
+    ApiKeyInfo,
+    FileApiKeyRepository,
+    RedisApiKeyRepository,
+    hash_api_key,
+)
+from services.api_key_service import ApiKeyService
+
+TTL = 300
+NEGATIVE_TTL = 60
+REFRESH_INTERVAL = 60
+PERSON_PARAMS = {'resource': 'people', 'id': 1}
+KEYS = {
+    hash_api_key('valid'): {'name': 'client', 'tier': 'tiny'},
+    hash_api_key('other'): {'name': 'other'},
+}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRepository:
+    def __init__(self) -> None:
+        self.keys = {
+            digest: ApiKeyInfo(digest, info['name'], info.get('tier'))
+            for digest, info in KEYS.items()
+        }
+        self.lookups: list[list[str]] = []
+        self.error: Exception | None = None
+
+    async def lookup(self, digests: list[str]) -> list[ApiKeyInfo | None]:
+        self.lookups.append(digests)
+        if self.error is not None:
+            raise self.error
+        return [self.keys.get(digest) for digest in digests]
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def repository() -> FakeRepository:
+    return FakeRepository()
+
+
+@pytest.fixture
+def api_key_service(
+    repository: FakeRepository, clock: FakeClock
+) -> ApiKeyService:
+    return ApiKeyService(
+        repository,
+        ttl=TTL,
+        negative_ttl=NEGATIVE_TTL,
+        refresh_interval=REFRESH_INTERVAL,
+        max_items=2,
+        negative_max_items=2,
+        clock=clock,
+    )
+
+
+@pytest.fixture
+def keys_file(tmp_path: Path) -> Path:
+    path = tmp_path / 'api_keys.json'
+    path.write_text(json.dumps(KEYS))
+    return path
+
+
+class TestApiKeyService:
+    async def test_caches_valid_keys(
+        self, api_key_service: ApiKeyService, repository: FakeRepository
+    ) -> None:
+        first = await api_key_service.validate('valid')
+        second = await api_key_service.validate('valid')
+
+        assert first == second
+        assert first is not None
+        assert first.tier == 'tiny'
+        assert len(repository.lookups) == 1
+
+    async def test_caches_invalid_keys(
+        self,
+        api_key_service: ApiKeyService,
+        repository: FakeRepository,
+        clock: FakeClock,
+    ) -> None:
+        assert await api_key_service.validate('wrong') is None
+        assert await api_key_service.validate('wrong') is None
+        assert len(repository.lookups) == 1
+
+        clock.now += NEGATIVE_TTL
+        await api_key_service.validate('wrong')
+        assert len(repository.lookups) == 2  # noqa: PLR2004
+
+    async def test_never_sends_the_raw_key(
+        self, api_key_service: ApiKeyService, repository: FakeRepository
+    ) -> None:
+        await api_key_service.validate('valid')
+
+        assert repository.lookups == [[hash_api_key('valid')]]
+
+    async def test_refresh_picks_up_revoked_keys(
+        self,
+        api_key_service: ApiKeyService,
+        repository: FakeRepository,
+        clock: FakeClock,
+    ) -> None:
+        await api_key_service.validate('valid')
+        await api_key_service.validate('other')
+        del repository.keys[hash_api_key('valid')]
+
+        clock.now += TTL - REFRESH_INTERVAL
+        await api_key_service.refresh()
+
+        assert repository.lookups[-1] == [
+            hash_api_key('valid'),
+            hash_api_key('other'),
+        ]
+        assert await api_key_service.validate('valid') is None
+        assert await api_key_service.validate('other') is not None
+        assert len(repository.lookups) == 3  # noqa: PLR2004
+
+    async def test_unknown_keys_do_not_evict_valid_ones(
+        self, api_key_service: ApiKeyService, repository: FakeRepository
+    ) -> None:
+        await api_key_service.validate('valid')
+        await api_key_service.validate('other')
+        for number in range(5):
+            await api_key_service.validate(f'wrong-{number}')
+
+        await api_key_service.validate('valid')
+        await api_key_service.validate('other')
+
+        assert len(repository.lookups) == 7  # noqa: PLR2004
+
+    async def test_evicts_least_recently_used_unknown_keys(
+        self, api_key_service: ApiKeyService, repository: FakeRepository
+    ) -> None:
+        for key in ('wrong-0', 'wrong-1', 'wrong-2'):
+            await api_key_service.validate(key)
+
+        await api_key_service.validate('wrong-2')
+        await api_key_service.validate('wrong-0')
+
+        assert len(repository.lookups) == 4  # noqa: PLR2004
+
+    async def test_serves_expired_entry_when_store_fails(
+        self,
+        api_key_service: ApiKeyService,
+        repository: FakeRepository,
+        clock: FakeClock,
+    ) -> None:
+        await api_key_service.validate('valid')
+        clock.now += TTL
+        repository.error = ConnectionError('down')
+
+        assert await api_key_service.validate('valid') is not None
+        with pytest.raises(ServiceUnavailableError):
+            await api_key_service.validate('other')
+
+
+class TestApiKeyRepositories:
+    async def test_file_repository_reloads_changes(
+        self, keys_file: Path
+    ) -> None:
+        repository = FileApiKeyRepository(keys_file)
+        digest = hash_api_key('valid')
+
+        assert await repository.lookup([digest]) == [
+            ApiKeyInfo(digest, 'client', 'tiny')
+        ]
+
+        await asyncio.to_thread(keys_file.write_text, json.dumps({}))
+        assert await repository.lookup([digest]) == [None]
+
+    async def test_redis_repository_reads_the_hash(
+        self, redis_client: FakeAsyncRedis
+    ) -> None:
+        digest = hash_api_key('valid')
+        await redis_client.hset('api_keys', digest, json.dumps(KEYS[digest]))
+        repository = RedisApiKeyRepository(
+            redis_client,  # type: ignore[arg-type]
+            'api_keys',
+        )
+
+        assert await repository.lookup([digest, hash_api_key('wrong')]) == [
+            ApiKeyInfo(digest, 'client', 'tiny'),
+            None,
+        ]
+
+
+class TestValidatedEndpoint:
+    @pytest.fixture(autouse=True)
+    def file_store(
+        self, monkeypatch: pytest.MonkeyPatch, keys_file: Path
+    ) -> None:
+        monkeypatch.setattr(settings, 'API_KEY_STORE', 'file')
+        monkeypatch.setattr(settings, 'API_KEYS_FILE', str(keys_file))
+        monkeypatch.setattr(settings, 'RATE_LIMIT_ENABLED', True)
+        monkeypatch.setattr(
+            settings, 'RATE_LIMIT_TIERS', {'tiny': 1, 'standard': 0}
+        )
+
+    @pytest.mark.parametrize('headers', [{}, {'X-API-Key': 'wrong'}])
+    def test_rejects_unknown_keys(
+        self, client: TestClient, headers: dict[str, str]
+    ) -> None:
+        response = client.get(
+            '/api/v1/swapi', params=PERSON_PARAMS, headers=headers
+        )
+
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert response.json() == {
+            'error': 'UnauthorizedError',
+            'detail': HTTPStatus.UNAUTHORIZED.description,
+        }
+
+    @pytest.mark.usefixtures('mock_person_by_id')
+    def test_applies_the_key_tier(self, client: TestClient) -> None:
+        responses = [
+            client.get(
+                '/api/v1/swapi',
+                params=PERSON_PARAMS,
+                headers={'X-API-Key': 'valid'},
+            )
+            for _ in range(2)
+        ]
+
+        assert [r.status_code for r in responses] == [
+            HTTPStatus.OK,
+            HTTPStatus.TOO_MANY_REQUESTS,
+        ]
@@ -1,9 +1,16 @@
 import json
+from unittest.mock import patch
 
 from fakeredis.aioredis import FakeRedis as FakeAsyncRedis
 
-from repositories.cache_repository import CacheRepository
-from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from infra.cache_compression import CacheCompressor, CacheSizeStats
+from infra.memory_cache import MemoryCache
+from repositories.cache_repository import CacheRepository, CacheState
+from schemas.swapi_query_params_schema import (
+    SortOrder,
+    SwapiQueryParams,
+    SwapiResource,
+)
 
 
 class TestCacheKeyGeneration:
@@ -157,4 +164,283 @@ class TestCacheOperationsEnabled:
         raw_value = await redis_client.get(cache_key)
         assert raw_value is not None
         assert isinstance(raw_value, str)
-        assert json.loads(raw_value) == data
+        assert json.loads(raw_value.partition('\n')[2]) == data
+
+
+class TestCacheEnvelope:
+    async def test_entry_goes_stale_after_soft_ttl(
+        self, cache_repository: CacheRepository
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+        now = cache_repository.clock()
+        cache_repository.clock = lambda: now
+        await cache_repository.set(params, {'count': 82})
+
+        states = []
+        for offset in (
+            0,
+            cache_repository.soft_ttl,
+            cache_repository.hard_ttl,
+        ):
+            cache_repository.clock = lambda offset=offset: now + offset
+            entry = await cache_repository.get_entry(params)
+            assert entry is not None
+            states.append(entry.state)
+
+        assert states == [
+            CacheState.FRESH,
+            CacheState.STALE,
+            CacheState.EXPIRED,
+        ]
+
+    async def test_get_ignores_entries_past_hard_ttl(
+        self, cache_repository: CacheRepository
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+        now = cache_repository.clock()
+        cache_repository.clock = lambda: now
+        await cache_repository.set(params, {'count': 82})
+
+        cache_repository.clock = lambda: now + cache_repository.hard_ttl
+
+        assert await cache_repository.get(params) is None
+        assert (
+            await cache_repository.get_many(
+                [cache_repository.build_cache_key(params)]
+            )
+            == {}
+        )
+
+    async def test_redis_keeps_entries_past_hard_ttl(
+        self, cache_repository: CacheRepository, redis_client: FakeAsyncRedis
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+        await cache_repository.set(params, {'count': 82})
+
+        ttl = await redis_client.ttl(cache_repository.build_cache_key(params))
+
+        assert ttl > cache_repository.hard_ttl
+
+
+class TestBulkOperations:
+    async def test_set_many_writes_every_key_with_ttl(
+        self, cache_repository: CacheRepository, redis_client: FakeAsyncRedis
+    ) -> None:
+        items = {'swapi:v1:a': {'id': 1}, 'swapi:v1:b': {'id': 2}}
+
+        assert await cache_repository.set_many(items) is True
+
+        for cache_key, data in items.items():
+            raw_value = await redis_client.get(cache_key)
+            assert isinstance(raw_value, str)
+            assert json.loads(raw_value.partition('\n')[2]) == data
+            assert await redis_client.ttl(cache_key) == cache_repository.ttl
+
+    async def test_get_many_combines_memory_and_single_mget(
+        self,
+        cache_repository: CacheRepository,
+        memory_cache: MemoryCache,
+        redis_client: FakeAsyncRedis,
+    ) -> None:
+        memory_cache.set('swapi:v1:a', json.dumps({'id': 1}))
+        await redis_client.set('swapi:v1:b', json.dumps({'id': 2}))
+
+        with patch.object(
+            redis_client, 'mget', wraps=redis_client.mget
+        ) as mget:
+            cached = await cache_repository.get_many(
+                ['swapi:v1:a', 'swapi:v1:b', 'swapi:v1:c']
+            )
+
+        assert cached == {'swapi:v1:a': {'id': 1}, 'swapi:v1:b': {'id': 2}}
+        mget.assert_called_once_with('swapi:v1:b', 'swapi:v1:c')
+        assert memory_cache.get('swapi:v1:b') == json.dumps({'id': 2})
+
+    async def test_bulk_operations_are_noops_when_disabled(
+        self, cache_repository: CacheRepository
+    ) -> None:
+        cache_repository.enabled = False
+
+        assert await cache_repository.set_many({'swapi:v1:a': {}}) is False
+        assert await cache_repository.get_many(['swapi:v1:a']) == {}
+
+
+class TestMemoryCacheTier:
+    async def test_set_populates_memory_cache(
+        self, cache_repository: CacheRepository, memory_cache: MemoryCache
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+        data = {'count': 82, 'results': []}
+
+        await cache_repository.set(params, data)
+
+        cache_key = cache_repository.build_cache_key(params)
+        cached_data = memory_cache.get(cache_key)
+        assert cached_data is not None
+        assert json.loads(cached_data.partition('\n')[2]) == data
+
+    async def test_get_is_served_from_memory_without_redis(
+        self, cache_repository: CacheRepository, redis_client: FakeAsyncRedis
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+        data = {'count': 82, 'results': []}
+
+        await cache_repository.set(params, data)
+        await redis_client.flushall()
+
+        assert await cache_repository.get(params) == data
+
+    async def test_redis_hit_populates_memory_cache(
+        self,
+        cache_repository: CacheRepository,
+        memory_cache: MemoryCache,
+        redis_client: FakeAsyncRedis,
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PLANETS)
+        cache_key = cache_repository.build_cache_key(params)
+        data = {'count': 60, 'results': []}
+        await redis_client.set(cache_key, json.dumps(data))
+
+        assert await cache_repository.get(params) == data
+        assert memory_cache.get(cache_key) == json.dumps(data)
+
+    async def test_returned_data_is_not_shared_with_memory_cache(
+        self, cache_repository: CacheRepository
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+        await cache_repository.set(params, {'count': 1, 'results': []})
+
+        first = await cache_repository.get(params)
+        assert first is not None
+        first['results'].append({'name': 'Luke'})
+
+        assert await cache_repository.get(params) == {
+            'count': 1,
+            'results': [],
+        }
+
+
+class TestResponseCache:
+    def test_response_key_canonicalizes_expand_fields(
+        self, cache_repository: CacheRepository
+    ) -> None:
+        params1 = SwapiQueryParams(
+            resource=SwapiResource.PEOPLE, expand='films,homeworld'
+        )
+        params2 = SwapiQueryParams(
+            resource=SwapiResource.PEOPLE, expand=' homeworld, films,'
+        )
+
+        key1 = cache_repository.build_response_cache_key(params1)
+        key2 = cache_repository.build_response_cache_key(params2)
+
+        assert (
+            key1
+            == key2
+            == 'swapi:v1:response:people:list:1::films,homeworld::'
+        )
+
+    def test_response_key_includes_sort(
+        self, cache_repository: CacheRepository
+    ) -> None:
+        params = SwapiQueryParams(
+            resource=SwapiResource.PEOPLE,
+            expand='ALL',
+            sort_by='height',
+            sort_order=SortOrder.DESC,
+        )
+
+        key = cache_repository.build_response_cache_key(params)
+
+        assert key == 'swapi:v1:response:people:list:1::all:height:desc'
+
+    async def test_response_cache_is_separate_from_raw_cache(
+        self, cache_repository: CacheRepository
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE, expand='all')
+        raw = {'count': 1, 'results': [{'homeworld': 'https://swapi.dev/1/'}]}
+        expanded = {
+            'count': 1,
+            'results': [{'homeworld': {'name': 'Tatooine'}}],
+        }
+
+        await cache_repository.set(params, raw)
+        await cache_repository.set_response(params, expanded)
+
+        assert await cache_repository.get(params) == raw
+        assert await cache_repository.get_response(params) == expanded
+
+
+class TestCacheCompression:
+    async def test_large_values_are_stored_compressed(
+        self,
+        cache_repository: CacheRepository,
+        redis_client: FakeAsyncRedis,
+        memory_cache: MemoryCache,
+    ) -> None:
+        cache_repository.compressor = CacheCompressor(min_bytes=256)
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+        data = {'results': [{'name': f'Clone {n}'} for n in range(100)]}
+
+        await cache_repository.set(params, data)
+        memory_cache.clear()
+
+        raw_value = await redis_client.get(
+            cache_repository.build_cache_key(params)
+        )
+        assert isinstance(raw_value, str)
+        assert raw_value.startswith('zlib:1:')
+        assert await cache_repository.get(params) == data
+
+    async def test_small_values_are_stored_as_is(
+        self, cache_repository: CacheRepository, redis_client: FakeAsyncRedis
+    ) -> None:
+        cache_repository.compressor = CacheCompressor(min_bytes=256)
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE, id=1)
+
+        await cache_repository.set(params, {'name': 'Luke'})
+
+        raw_value = await redis_client.get(
+            cache_repository.build_cache_key(params)
+        )
+        assert isinstance(raw_value, str)
+        assert raw_value.startswith('{')
+
+    async def test_get_many_decompresses_values(
+        self, cache_repository: CacheRepository, memory_cache: MemoryCache
+    ) -> None:
+        cache_repository.compressor = CacheCompressor(min_bytes=0)
+        items = {f'key:{n}': {'name': 'Luke' * 50, 'n': n} for n in range(3)}
+
+        await cache_repository.set_many(items)
+        memory_cache.clear()
+
+        assert await cache_repository.get_many(list(items)) == items
+
+    async def test_unknown_codec_is_a_cache_miss(
+        self, cache_repository: CacheRepository, redis_client: FakeAsyncRedis
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+        cache_key = cache_repository.build_cache_key(params)
+        await redis_client.set(cache_key, 'zstd:9:AAAA')
+
+        assert await cache_repository.get(params) is None
+
+    async def test_records_stored_sizes_per_key(
+        self, cache_repository: CacheRepository
+    ) -> None:
+        cache_repository.compressor = CacheCompressor(min_bytes=256)
+        cache_repository.size_stats = CacheSizeStats(max_keys=1)
+        small = SwapiQueryParams(resource=SwapiResource.PEOPLE, id=1)
+        large = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+
+        await cache_repository.set(small, {'name': 'Luke'})
+        await cache_repository.set(large, {'results': ['Luke'] * 200})
+
+        stats = cache_repository.size_stats
+        size = stats.get(cache_repository.build_cache_key(large))
+        assert size is not None
+        assert size.stored_bytes < size.raw_bytes
+        assert stats.get(cache_repository.build_cache_key(small)) is None
+        assert stats.totals.writes == 2  # noqa: PLR2004
+        assert stats.totals.compressed == 1
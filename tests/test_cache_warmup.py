@@ -0,0 +1,205 @@
+import asyncio
+import contextlib
+from http import HTTPStatus
+
+import httpx
+import pytest
+from loguru import logger
+from respx import MockRouter
+
+from repositories.cache_repository import CacheRepository
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from services.cache_warmup_service import (
+    CacheWarmupService,
+    WarmupReport,
+    log_warmup_failure,
+)
+from services.swapi_data_service import SwapiDataService
+from tests.conftest import BASE_URL
+
+RECORDS_PER_RESOURCE = 12
+RESOURCE_COUNT = len(SwapiResource)
+
+
+def make_records(resource: str) -> list[dict[str, str]]:
+    return [
+        {
+            'name': f'{resource} {number}',
+            'url': f'{BASE_URL}{resource}/{number}/',
+        }
+        for number in range(1, RECORDS_PER_RESOURCE + 1)
+    ]
+
+
+def resource_page(request: httpx.Request) -> httpx.Response:
+    resource = request.url.path.strip('/').split('/')[-1]
+    page = int(request.url.params.get('page', 1))
+    results = make_records(resource)[(page - 1) * 10 : page * 10]
+    return httpx.Response(
+        HTTPStatus.OK,
+        json={'count': RECORDS_PER_RESOURCE, 'results': results},
+    )
+
+
+@pytest.fixture
+def mock_swapi_lists(respx_mock: MockRouter) -> MockRouter:
+    respx_mock.get(
+        url__regex=r'^https://swapi\.dev/api/\w+/(\?.*)?$', name='lists'
+    ).mock(side_effect=resource_page)
+    return respx_mock
+
+
+@pytest.fixture
+def warmup_service(
+    service: SwapiDataService, cache_repository: CacheRepository
+) -> CacheWarmupService:
+    return CacheWarmupService(service, cache_repository, concurrency=2)
+
+
+class TestCacheWarmup:
+    async def test_should_load_pages_ids_and_resources(
+        self,
+        warmup_service: CacheWarmupService,
+        cache_repository: CacheRepository,
+        mock_swapi_lists: MockRouter,
+    ) -> None:
+        report = await warmup_service.warm()
+
+        assert report.resources == RESOURCE_COUNT
+        assert report.pages_fetched == 2 * RESOURCE_COUNT
+        assert report.records == RECORDS_PER_RESOURCE * RESOURCE_COUNT
+        assert mock_swapi_lists.calls.call_count == 2 * RESOURCE_COUNT
+
+        page_2 = SwapiQueryParams(resource=SwapiResource.PEOPLE, page=2)
+        person = SwapiQueryParams(resource=SwapiResource.PEOPLE, id=12)
+        starship_url = f'{BASE_URL}starships/3/'
+        assert await cache_repository.get(page_2) is not None
+        assert await cache_repository.get(person) == {
+            'name': 'people 12',
+            'url': f'{BASE_URL}people/12/',
+        }
+        assert starship_url in await cache_repository.get_resources(
+            [starship_url]
+        )
+
+    async def test_should_skip_resources_already_warm(
+        self,
+        warmup_service: CacheWarmupService,
+        mock_swapi_lists: MockRouter,
+    ) -> None:
+        await warmup_service.warm()
+        mock_swapi_lists.reset()
+
+        report = await warmup_service.warm()
+
+        assert report.skipped == RESOURCE_COUNT
+        assert mock_swapi_lists.calls.call_count == 0
+
+    async def test_should_resume_from_cached_pages(
+        self,
+        warmup_service: CacheWarmupService,
+        cache_repository: CacheRepository,
+        mock_swapi_lists: MockRouter,
+    ) -> None:
+        page_2 = SwapiQueryParams(resource=SwapiResource.FILMS, page=2)
+        await cache_repository.set(
+            page_2,
+            {
+                'count': RECORDS_PER_RESOURCE,
+                'results': make_records('films')[10:],
+            },
+        )
+
+        report = await warmup_service.warm()
+
+        assert report.pages_cached == 1
+        assert mock_swapi_lists.calls.call_count == 2 * RESOURCE_COUNT - 1
+
+    @pytest.mark.usefixtures('mock_swapi_lists')
+    async def test_should_skip_resources_locked_elsewhere(
+        self,
+        warmup_service: CacheWarmupService,
+        cache_repository: CacheRepository,
+    ) -> None:
+        warmup_key = cache_repository.build_warmup_key(SwapiResource.PEOPLE)
+        await cache_repository.acquire_lock(f'{warmup_key}:lock', 60)
+
+        report = await warmup_service.warm()
+
+        assert report.skipped == 1
+        assert report.resources == RESOURCE_COUNT - 1
+
+    async def test_should_do_nothing_when_cache_is_disabled(
+        self,
+        warmup_service: CacheWarmupService,
+        cache_repository: CacheRepository,
+        mock_swapi_lists: MockRouter,
+    ) -> None:
+        cache_repository.enabled = False
+
+        report = await warmup_service.warm()
+
+        assert report.resources == 0
+        assert mock_swapi_lists.calls.call_count == 0
+
+    async def test_should_count_resources_that_fail(
+        self,
+        warmup_service: CacheWarmupService,
+        cache_repository: CacheRepository,
+        mock_swapi_lists: MockRouter,
+    ) -> None:
+        def fail_films(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith('/films/'):
+                return httpx.Response(HTTPStatus.NOT_FOUND)
+            return resource_page(request)
+
+        mock_swapi_lists['lists'].side_effect = fail_films
+
+        report = await warmup_service.warm()
+
+        films_key = cache_repository.build_warmup_key(SwapiResource.FILMS)
+        assert report.failed == 1
+        assert report.resources == RESOURCE_COUNT - 1
+        assert await cache_repository.get_many([films_key]) == {}
+        assert await cache_repository.acquire_lock(f'{films_key}:lock', 60)
+
+    @pytest.mark.usefixtures('mock_swapi_lists')
+    async def test_should_not_mark_resources_whose_writes_failed(
+        self,
+        warmup_service: CacheWarmupService,
+        cache_repository: CacheRepository,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        async def fail_write(values: dict[str, str]) -> bool:  # noqa: ARG001
+            return False
+
+        monkeypatch.setattr(cache_repository, 'write_values', fail_write)
+
+        report = await warmup_service.warm()
+
+        warmup_keys = [
+            cache_repository.build_warmup_key(resource)
+            for resource in SwapiResource
+        ]
+        assert report.failed == RESOURCE_COUNT
+        assert await cache_repository.get_many(warmup_keys) == {}
+
+
+class TestLogWarmupFailure:
+    async def test_should_log_a_crashed_warmup(self) -> None:
+        messages: list[str] = []
+        sink = logger.add(messages.append, level='ERROR')
+
+        async def crash() -> WarmupReport:
+            msg = 'boom'
+            raise RuntimeError(msg)
+
+        task = asyncio.create_task(crash())
+        with contextlib.suppress(RuntimeError):
+            await task
+        log_warmup_failure(task)
+        logger.remove(sink)
+
+        assert len(messages) == 1
+        assert 'Cache warm-up crashed' in messages[0]
+        assert 'RuntimeError: boom' in messages[0]
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+from fakeredis.aioredis import FakeRedis as FakeAsyncRedis
+
+from infra.cache_write_queue import CacheWriteQueue
+from repositories.cache_repository import CacheRepository
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+
+
+class RecordingWriter:
+    def __init__(self, *, result: bool = True) -> None:
+        self.batches: list[dict[str, str]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.result = result
+
+    async def __call__(self, values: dict[str, str]) -> bool:
+        await self.release.wait()
+        self.batches.append(values)
+        return self.result
+
+
+class TestCacheWriteQueue:
+    async def test_should_flush_queued_writes_in_batches(self) -> None:
+        writer = RecordingWriter()
+
+        async with CacheWriteQueue(writer, max_size=10, batch_size=2) as queue:
+            for number in range(3):
+                await queue.put(f'key:{number}', str(number))
+
+        assert writer.batches == [
+            {'key:0': '0', 'key:1': '1'},
+            {'key:2': '2'},
+        ]
+        assert queue.stats.written == 3  # noqa: PLR2004
+        assert queue.stats.batches == 2  # noqa: PLR2004
+
+    async def test_should_drop_writes_when_full(self) -> None:
+        queue = CacheWriteQueue(RecordingWriter(), max_size=1, batch_size=1)
+
+        assert await queue.put('key:0', '0') is True
+        assert await queue.put('key:1', '1') is False
+        assert queue.stats.dropped == 1
+        assert len(queue) == 1
+
+    async def test_should_apply_backpressure_when_blocking(self) -> None:
+        writer = RecordingWriter()
+        writer.release.clear()
+
+        async with CacheWriteQueue(
+            writer, max_size=1, batch_size=1, policy='block'
+        ) as queue:
+            await queue.put('key:0', '0')
+            await asyncio.sleep(0)
+            await queue.put('key:1', '1')
+            blocked = asyncio.ensure_future(queue.put('key:2', '2'))
+            await asyncio.sleep(0.01)
+
+            assert not blocked.done()
+            writer.release.set()
+            assert await blocked is True
+
+        assert [list(batch) for batch in writer.batches] == [
+            ['key:0'],
+            ['key:1'],
+            ['key:2'],
+        ]
+
+    async def test_should_count_failed_writes(self) -> None:
+        writer = RecordingWriter(result=False)
+
+        async with CacheWriteQueue(writer, max_size=10, batch_size=5) as queue:
+            await queue.put('key:0', '0')
+
+        assert queue.stats.failed == 1
+        assert queue.stats.written == 0
+
+
+class TestCacheRepositoryWriteBehind:
+    async def test_set_returns_before_redis_write(
+        self, cache_repository: CacheRepository, redis_client: FakeAsyncRedis
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+        cache_key = cache_repository.build_cache_key(params)
+        data = {'count': 82, 'results': []}
+
+        async with CacheWriteQueue(
+            cache_repository.write_values, max_size=10, batch_size=10
+        ) as queue:
+            cache_repository.write_queue = queue
+            assert await cache_repository.set(params, data) is True
+            assert await redis_client.get(cache_key) is None
+            assert await cache_repository.get(params) == data
+
+        raw_value = await redis_client.get(cache_key)
+        assert isinstance(raw_value, str)
+        assert json.loads(raw_value.partition('\n')[2]) == data
+        assert await redis_client.ttl(cache_key) == cache_repository.ttl
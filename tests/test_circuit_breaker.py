@@ -0,0 +1,240 @@
+import time
+from http import HTTPStatus
+from urllib.parse import urljoin
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from respx import MockRouter
+
+from infra.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+)
+from infra.retry import RetryPolicy
+from repositories.cache_repository import CacheRepository
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from services.swapi_data_service import SwapiDataService
+from tests.conftest import BASE_URL
+from tests.mock_data import LUKE_SKYWALKER
+
+PERSON_URL = urljoin(urljoin(BASE_URL, 'people/'), '1')
+REQUEST = httpx.Request('GET', PERSON_URL)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def status_error(status: int) -> httpx.HTTPStatusError:
+    response = httpx.Response(status, request=REQUEST)
+    return httpx.HTTPStatusError('error', request=REQUEST, response=response)
+
+
+def fail(breaker: CircuitBreaker, exc: Exception, times: int = 1) -> None:
+    for _ in range(times):
+        with pytest.raises(type(exc)), breaker.guard():
+            raise exc
+
+
+def trip(breaker: CircuitBreaker) -> None:
+    while breaker.state == CircuitState.CLOSED:
+        fail(breaker, httpx.ConnectError('down', request=REQUEST))
+
+
+def succeed(breaker: CircuitBreaker, clock: FakeClock, seconds: float) -> None:
+    with breaker.guard():
+        clock.now += seconds
+
+
+class TestCircuitBreaker:
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def breaker(self, clock: FakeClock) -> CircuitBreaker:
+        return CircuitBreaker(
+            'test',
+            window_size=10,
+            min_calls=4,
+            failure_rate=0.5,
+            slow_call_seconds=1.0,
+            slow_call_rate=0.75,
+            open_seconds=30.0,
+            half_open_calls=2,
+            clock=clock,
+        )
+
+    def test_opens_on_failure_rate(
+        self, breaker: CircuitBreaker, clock: FakeClock
+    ) -> None:
+        succeed(breaker, clock, 0.1)
+        succeed(breaker, clock, 0.1)
+        fail(breaker, status_error(HTTPStatus.BAD_GATEWAY))
+        assert breaker.state == CircuitState.CLOSED
+
+        fail(breaker, status_error(HTTPStatus.SERVICE_UNAVAILABLE))
+
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError) as exc_info, breaker.guard():
+            pass
+        assert exc_info.value.retry_after == pytest.approx(30.0)
+
+    def test_opens_on_slow_call_rate(
+        self, breaker: CircuitBreaker, clock: FakeClock
+    ) -> None:
+        succeed(breaker, clock, 0.1)
+        for _ in range(3):
+            succeed(breaker, clock, 2.0)
+
+        assert breaker.state == CircuitState.OPEN
+
+    def test_ignores_client_errors(self, breaker: CircuitBreaker) -> None:
+        fail(breaker, status_error(HTTPStatus.NOT_FOUND), 10)
+
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_closes_after_successful_probes(
+        self, breaker: CircuitBreaker, clock: FakeClock
+    ) -> None:
+        trip(breaker)
+        clock.now += 30
+
+        assert breaker.state == CircuitState.HALF_OPEN
+        with (
+            breaker.guard(),
+            breaker.guard(),
+            pytest.raises(CircuitOpenError),
+            breaker.guard(),
+        ):
+            pass
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_reopens_on_failed_probe(
+        self, breaker: CircuitBreaker, clock: FakeClock
+    ) -> None:
+        trip(breaker)
+        clock.now += 30
+
+        fail(breaker, httpx.ReadTimeout('slow', request=REQUEST))
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.retry_after == pytest.approx(30.0)
+
+    def test_disabled_breaker_never_opens(self, clock: FakeClock) -> None:
+        breaker = CircuitBreaker(
+            'test',
+            window_size=10,
+            min_calls=1,
+            failure_rate=0.1,
+            slow_call_seconds=1.0,
+            slow_call_rate=0.1,
+            open_seconds=30.0,
+            half_open_calls=1,
+            enabled=False,
+            clock=clock,
+        )
+        fail(breaker, httpx.ConnectError('down', request=REQUEST), 10)
+
+        assert breaker.state == CircuitState.CLOSED
+
+
+class TestRetryPolicy:
+    policy = RetryPolicy(attempts=3, base_delay=1.0, max_delay=1.0, rng=float)
+
+    async def test_retries_transient_errors(self) -> None:
+        errors = [status_error(HTTPStatus.SERVICE_UNAVAILABLE)] * 2
+
+        async def flaky() -> str:
+            if errors:
+                raise errors.pop()
+            return 'ok'
+
+        assert await self.policy.run(flaky) == 'ok'
+
+    @pytest.mark.parametrize(
+        'exc',
+        [
+            status_error(HTTPStatus.NOT_FOUND),
+            CircuitOpenError('swapi', 1.0),
+            httpx.ConnectError(
+                'down', request=httpx.Request('POST', BASE_URL)
+            ),
+        ],
+    )
+    async def test_does_not_retry_other_errors(self, exc: Exception) -> None:
+        calls = 0
+
+        async def broken() -> None:
+            nonlocal calls
+            calls += 1
+            raise exc
+
+        with pytest.raises(type(exc)):
+            await self.policy.run(broken)
+        assert calls == 1
+
+    def test_backoff_is_capped_full_jitter(self) -> None:
+        policy = RetryPolicy(
+            attempts=5, base_delay=0.1, max_delay=0.3, rng=lambda: 0.5
+        )
+
+        assert [policy.backoff(n) for n in (1, 2, 3, 4)] == pytest.approx(
+            [0.05, 0.1, 0.15, 0.15]
+        )
+
+
+class TestUpstreamResilience:
+    params = SwapiQueryParams(resource=SwapiResource.PEOPLE, id=1)
+
+    async def test_retries_gateway_errors(
+        self, service: SwapiDataService, respx_mock: MockRouter
+    ) -> None:
+        route = respx_mock.get(PERSON_URL).mock(
+            side_effect=[
+                httpx.Response(HTTPStatus.BAD_GATEWAY),
+                httpx.Response(HTTPStatus.OK, json=LUKE_SKYWALKER),
+            ]
+        )
+
+        assert await service.get_swapi_data(self.params) == LUKE_SKYWALKER
+        assert route.call_count == 2  # noqa: PLR2004
+
+    async def test_serves_stale_data_while_open(
+        self,
+        service: SwapiDataService,
+        cache_repository: CacheRepository,
+        circuit_breaker: CircuitBreaker,
+        respx_mock: MockRouter,
+    ) -> None:
+        now = time.time()
+        cache_repository.clock = lambda: now - cache_repository.hard_ttl - 1
+        await cache_repository.set(self.params, LUKE_SKYWALKER)
+        cache_repository.clock = time.time
+        trip(circuit_breaker)
+
+        assert await service.get_swapi_data(self.params) == LUKE_SKYWALKER
+        assert service.cache_status == 'stale-if-error'
+        assert respx_mock.calls.call_count == 0
+
+    def test_returns_service_unavailable_while_open(
+        self, client: TestClient, circuit_breaker: CircuitBreaker
+    ) -> None:
+        trip(circuit_breaker)
+
+        response = client.get(
+            '/api/v1/swapi', params={'resource': 'people', 'id': 1}
+        )
+
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert response.headers['retry-after'] == '30'
+        assert response.json() == {
+            'error': 'ServiceUnavailableError',
+            'detail': HTTPStatus.SERVICE_UNAVAILABLE.description,
+        }
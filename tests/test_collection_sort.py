@@ -0,0 +1,199 @@
+from http import HTTPStatus
+from typing import NoReturn
+from urllib.parse import urljoin
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from respx import MockRouter
+
+from repositories.collection_repository import CollectionRepository
+from schemas.swapi_query_params_schema import (
+    SortOrder,
+    SortScope,
+    SwapiQueryParams,
+    SwapiResource,
+)
+from services.swapi_data_service import SwapiDataService
+from tests.conftest import BASE_URL
+
+PEOPLE = [
+    {
+        'name': f'Person {number:02d}',
+        'height': str(100 + number * 7 % 13),
+        'url': f'{BASE_URL}people/{number}/',
+    }
+    for number in range(1, 13)
+]
+PEOPLE[6]['height'] = 'unknown'
+
+
+@pytest.fixture
+def mock_people_pages(respx_mock: MockRouter) -> MockRouter:
+    def people_page(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get('page', 1))
+        results = PEOPLE[(page - 1) * 10 : page * 10]
+        return httpx.Response(
+            HTTPStatus.OK, json={'count': len(PEOPLE), 'results': results}
+        )
+
+    respx_mock.get(urljoin(BASE_URL, 'people/')).mock(side_effect=people_page)
+    return respx_mock
+
+
+class TestCollectionSort:
+    API_URL = '/api/v1/swapi/'
+
+    @pytest.mark.usefixtures('mock_people_pages')
+    def test_should_sort_across_every_page(self, client: TestClient) -> None:
+        params = {
+            'resource': 'people',
+            'sort_by': 'height',
+            'sort_order': 'desc',
+            'sort_scope': 'collection',
+        }
+
+        first = client.get(self.API_URL, params=params).json()
+        second = client.get(self.API_URL, params=params | {'page': 2}).json()
+
+        heights = [r['height'] for r in first['results'] + second['results']]
+        expected = sorted(
+            (p['height'] for p in PEOPLE if p['height'] != 'unknown'),
+            key=int,
+            reverse=True,
+        )
+        assert heights == [*expected, 'unknown']
+        assert first['count'] == len(PEOPLE)
+        assert 'sort_scope=collection' in first['next']
+        assert 'page=2' in first['next']
+        assert second['next'] is None
+
+    @pytest.mark.usefixtures('mock_people_pages')
+    def test_should_revalidate_without_sorting_again(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        params = {
+            'resource': 'people',
+            'sort_by': 'height',
+            'sort_scope': 'collection',
+        }
+        first = client.get(self.API_URL, params=params)
+
+        async def sort_again(*_: object) -> NoReturn:
+            raise AssertionError
+
+        monkeypatch.setattr(
+            SwapiDataService, '_get_sorted_collection', sort_again
+        )
+        second = client.get(
+            self.API_URL,
+            params=params,
+            headers={'If-None-Match': first.headers['etag']},
+        )
+
+        assert second.status_code == HTTPStatus.NOT_MODIFIED
+        assert second.headers['etag'] == first.headers['etag']
+
+    @pytest.mark.usefixtures('mock_people_pages')
+    def test_should_not_reuse_etag_of_another_page(
+        self, client: TestClient
+    ) -> None:
+        params = {
+            'resource': 'people',
+            'sort_by': 'height',
+            'sort_scope': 'collection',
+        }
+        first = client.get(self.API_URL, params=params)
+
+        second = client.get(
+            self.API_URL,
+            params=params | {'page': 2},
+            headers={'If-None-Match': first.headers['etag']},
+        )
+
+        assert second.status_code == HTTPStatus.OK
+        assert second.headers['etag'] != first.headers['etag']
+
+    @pytest.mark.usefixtures('mock_people_pages')
+    def test_should_keep_page_scope_by_default(
+        self, client: TestClient
+    ) -> None:
+        response = client.get(
+            self.API_URL,
+            params={'resource': 'people', 'sort_by': 'name', 'page': 2},
+        )
+
+        names = [r['name'] for r in response.json()['results']]
+        assert names == ['Person 11', 'Person 12']
+
+    @pytest.mark.usefixtures('mock_people_pages')
+    def test_should_filter_sorted_collection_by_search(
+        self, client: TestClient
+    ) -> None:
+        response = client.get(
+            self.API_URL,
+            params={
+                'resource': 'people',
+                'search': 'person 1',
+                'sort_by': 'name',
+                'sort_order': 'desc',
+                'sort_scope': 'collection',
+            },
+        )
+
+        names = [r['name'] for r in response.json()['results']]
+        assert names == ['Person 12', 'Person 11', 'Person 10']
+
+    @pytest.mark.usefixtures('mock_people_pages')
+    def test_should_return_not_found_past_last_page(
+        self, client: TestClient
+    ) -> None:
+        response = client.get(
+            self.API_URL,
+            params={
+                'resource': 'people',
+                'sort_by': 'name',
+                'sort_scope': 'collection',
+                'page': 3,
+            },
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND.value
+
+    async def test_should_load_collection_once_and_memoize_index(
+        self,
+        service: SwapiDataService,
+        collection_repository: CollectionRepository,
+        mock_people_pages: MockRouter,
+    ) -> None:
+        params = SwapiQueryParams(
+            resource=SwapiResource.PEOPLE,
+            sort_by='height',
+            sort_scope=SortScope.COLLECTION,
+        )
+
+        await service.get_swapi_data(params)
+        await service.get_swapi_data(params.model_copy(update={'page': 2}))
+
+        collection = collection_repository.get(SwapiResource.PEOPLE)
+        assert collection is not None
+        assert list(collection.sorted_positions) == [('height', SortOrder.ASC)]
+        assert mock_people_pages.calls.call_count == 2  # noqa: PLR2004
+
+    async def test_should_reuse_collection_from_shared_cache(
+        self,
+        service: SwapiDataService,
+        collection_repository: CollectionRepository,
+        mock_people_pages: MockRouter,
+    ) -> None:
+        params = SwapiQueryParams(
+            resource=SwapiResource.PEOPLE,
+            sort_by='name',
+            sort_scope=SortScope.COLLECTION,
+        )
+        await service.get_swapi_data(params)
+        collection_repository._collections.clear()  # noqa: SLF001
+
+        await service.get_swapi_data(params)
+
+        assert mock_people_pages.calls.call_count == 2  # noqa: PLR2004
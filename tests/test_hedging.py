@@ -0,0 +1,174 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from itertools import count
+from urllib.parse import urljoin
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from infra.hedging import HedgeBudget, Hedger, LatencyTracker
+from infra.metrics import UpstreamMetrics
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from services.swapi_data_service import SwapiDataService
+from tests.conftest import BASE_URL, sample_value
+from tests.mock_data import LUKE_SKYWALKER
+
+PERSON_URL = urljoin(urljoin(BASE_URL, 'people/'), '1')
+HEDGE_DELAY = 0.01
+SLOW = 1.0
+_kinds = count()
+
+
+def warmed_tracker() -> LatencyTracker:
+    tracker = LatencyTracker(quantile=0.95, window_size=100, min_samples=10)
+    for _ in range(10):
+        tracker.observe(HEDGE_DELAY)
+    return tracker
+
+
+def create_hedger(budget: HedgeBudget | None = None) -> Hedger:
+    return Hedger(
+        UpstreamMetrics(f'test-{next(_kinds)}'),
+        warmed_tracker(),
+        budget or HedgeBudget(ratio=0.05, burst=10),
+        min_delay=0.0,
+    )
+
+
+def hedges(hedger: Hedger) -> float:
+    return sample_value(
+        'swapi_upstream_hedges_total', kind=hedger.metrics.kind
+    )
+
+
+def hedge_wins(hedger: Hedger) -> float:
+    return sample_value(
+        'swapi_upstream_hedge_wins_total', kind=hedger.metrics.kind
+    )
+
+
+def responder(
+    *delays: float,
+) -> tuple[list[str], Callable[[], Awaitable[str]]]:
+    calls: list[str] = []
+
+    async def respond() -> str:
+        call = f'call-{len(calls)}'
+        calls.append(call)
+        await asyncio.sleep(delays[len(calls) - 1])
+        return call
+
+    return calls, respond
+
+
+class TestLatencyTracker:
+    def test_waits_for_min_samples(self) -> None:
+        tracker = LatencyTracker(
+            quantile=0.95, window_size=100, min_samples=20
+        )
+        for _ in range(10):
+            tracker.observe(0.1)
+
+        assert tracker.threshold is None
+
+    def test_tracks_the_quantile(self) -> None:
+        tracker = LatencyTracker(quantile=0.9, window_size=100, min_samples=10)
+        for ms in range(1, 101):
+            tracker.observe(ms / 1000)
+
+        assert tracker.threshold == pytest.approx(0.09, abs=0.001)
+
+
+class TestHedgeBudget:
+    def test_limits_hedges_to_the_ratio(self) -> None:
+        budget = HedgeBudget(ratio=0.05, burst=1)
+        budget.withdraw()
+
+        hedges = 0
+        for _ in range(100):
+            budget.deposit()
+            hedges += budget.withdraw()
+
+        assert hedges == 5  # noqa: PLR2004
+
+
+class TestHedger:
+    async def test_hedge_wins_when_first_request_is_slow(self) -> None:
+        hedger = create_hedger()
+        calls, respond = responder(SLOW, 0)
+
+        assert await hedger.run(respond) == 'call-1'
+        assert calls == ['call-0', 'call-1']
+        assert hedges(hedger) == 1
+        assert hedge_wins(hedger) == 1
+
+    async def test_times_the_cancelled_first_request(self) -> None:
+        hedger = create_hedger()
+        _, respond = responder(SLOW, 0)
+
+        await hedger.run(respond)
+        await asyncio.sleep(0)
+
+        samples = list(hedger.tracker._samples)[10:]  # noqa: SLF001
+        assert len(samples) == 1
+        assert samples[0] >= HEDGE_DELAY
+
+    async def test_does_not_hedge_fast_requests(self) -> None:
+        hedger = create_hedger()
+        calls, respond = responder(0)
+
+        assert await hedger.run(respond) == 'call-0'
+        assert calls == ['call-0']
+        assert hedges(hedger) == 0
+
+    async def test_respects_the_budget(self) -> None:
+        hedger = create_hedger(HedgeBudget(ratio=0.05, burst=0))
+        calls, respond = responder(HEDGE_DELAY * 3)
+
+        assert await hedger.run(respond) == 'call-0'
+        assert calls == ['call-0']
+
+    async def test_falls_back_to_hedge_when_first_request_fails(self) -> None:
+        hedger = create_hedger()
+        attempts = 0
+
+        async def respond() -> str:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                await asyncio.sleep(HEDGE_DELAY * 3)
+                msg = 'slow'
+                raise httpx.ReadTimeout(msg)
+            await asyncio.sleep(HEDGE_DELAY * 6)
+            return 'hedge'
+
+        assert await hedger.run(respond) == 'hedge'
+
+    async def test_does_not_hedge_before_warm_up(self) -> None:
+        hedger = create_hedger()
+        hedger.tracker = LatencyTracker(
+            quantile=0.95, window_size=100, min_samples=10
+        )
+        calls, respond = responder(HEDGE_DELAY * 3)
+
+        await hedger.run(respond)
+        assert calls == ['call-0']
+
+
+async def test_fetch_from_swapi_hedges_slow_responses(
+    service: SwapiDataService, respx_mock: MockRouter
+) -> None:
+    service.hedger = create_hedger()
+    delays = [SLOW, 0]
+
+    async def respond(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        await asyncio.sleep(delays.pop(0))
+        return httpx.Response(200, json=LUKE_SKYWALKER)
+
+    respx_mock.get(PERSON_URL).mock(side_effect=respond)
+    params = SwapiQueryParams(resource=SwapiResource.PEOPLE, id=1)
+
+    assert await service.fetch_from_swapi(params) == LUKE_SKYWALKER
+    assert delays == []
+    assert hedge_wins(service.hedger) == 1
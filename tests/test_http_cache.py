@@ -0,0 +1,162 @@
+import gzip
+from collections.abc import Generator
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from infra import http_cache
+from infra.http_cache import (
+    EncodedBodyCache,
+    choose_encoding,
+    compute_etag,
+    etag_matches,
+    get_encoded_body_cache,
+    variant_etag,
+)
+from infra.memory_cache import MemoryCache
+from infra.settings import settings
+from main import app
+
+PEOPLE_PARAMS = {'resource': 'people'}
+IDENTITY = {'Accept-Encoding': 'identity'}
+
+
+@pytest.fixture
+def encoded_cache() -> Generator[EncodedBodyCache]:
+    cache = EncodedBodyCache(
+        MemoryCache(max_items=16, max_bytes=1024 * 1024, ttl_seconds=60),
+        min_bytes=256,
+    )
+    app.dependency_overrides[get_encoded_body_cache] = lambda: cache
+    yield cache
+    app.dependency_overrides.pop(get_encoded_body_cache, None)
+
+
+class TestEtagMatching:
+    def test_matches_exact_weak_and_encoded_tags(self) -> None:
+        etag = compute_etag(b'{}')
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'W/{etag}', etag)
+        assert etag_matches(f'"other", {variant_etag(etag, "gzip")}', etag)
+        assert etag_matches('*', etag)
+
+    def test_does_not_match_other_tags(self) -> None:
+        etag = compute_etag(b'{}')
+
+        assert not etag_matches(None, etag)
+        assert not etag_matches(compute_etag(b'[]'), etag)
+
+
+class TestCacheControl:
+    def test_counts_down_to_the_soft_ttl(self) -> None:
+        assert http_cache.cache_control(1060.0, now=1000.0) == (
+            'private, max-age=60'
+        )
+
+    def test_never_goes_negative(self) -> None:
+        assert http_cache.cache_control(0.0, now=1000.0) == (
+            'private, max-age=0'
+        )
+
+
+class TestChooseEncoding:
+    @pytest.mark.parametrize(
+        ('accept_encoding', 'expected'),
+        [
+            (None, None),
+            ('identity', None),
+            ('gzip', 'gzip'),
+            ('gzip, br', 'br'),
+            ('br;q=0, gzip;q=0.5', 'gzip'),
+            ('*', 'br'),
+        ],
+    )
+    def test_prefers_brotli_then_gzip(
+        self, accept_encoding: str | None, expected: str | None
+    ) -> None:
+        assert choose_encoding(accept_encoding) == expected
+
+    def test_falls_back_to_gzip_without_brotli(self) -> None:
+        with patch.object(http_cache, 'brotli', None):
+            assert choose_encoding('br, gzip') == 'gzip'
+
+
+@pytest.mark.usefixtures('mock_people_list', 'encoded_cache')
+class TestConditionalGet:
+    def test_sends_etag_and_cache_control(self, client: TestClient) -> None:
+        response = client.get(
+            '/api/v1/swapi/', params=PEOPLE_PARAMS, headers=IDENTITY
+        )
+
+        assert response.headers['etag'] == compute_etag(response.content)
+        assert response.headers['cache-control'] == (
+            f'private, max-age={settings.CACHE_SOFT_TTL_SECONDS}'
+        )
+
+    def test_returns_not_modified_for_matching_etag(
+        self, client: TestClient
+    ) -> None:
+        first = client.get('/api/v1/swapi/', params=PEOPLE_PARAMS)
+
+        second = client.get(
+            '/api/v1/swapi/',
+            params=PEOPLE_PARAMS,
+            headers={'If-None-Match': first.headers['etag']},
+        )
+
+        assert second.status_code == HTTPStatus.NOT_MODIFIED
+        assert not second.content
+        assert second.headers['etag'] == first.headers['etag']
+
+    def test_returns_body_for_stale_etag(self, client: TestClient) -> None:
+        response = client.get(
+            '/api/v1/swapi/',
+            params=PEOPLE_PARAMS,
+            headers={'If-None-Match': compute_etag(b'old')},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.usefixtures('mock_people_list', 'encoded_cache')
+class TestPrecompressedResponses:
+    def test_gzip_variant_is_compressed_once(
+        self, client: TestClient, encoded_cache: EncodedBodyCache
+    ) -> None:
+        headers = {'Accept-Encoding': 'gzip'}
+        with patch.object(
+            http_cache.gzip, 'compress', wraps=gzip.compress
+        ) as compress:
+            first = client.get(
+                '/api/v1/swapi/', params=PEOPLE_PARAMS, headers=headers
+            )
+            second = client.get(
+                '/api/v1/swapi/', params=PEOPLE_PARAMS, headers=headers
+            )
+
+        compress.assert_called_once()
+        assert first.headers['content-encoding'] == 'gzip'
+        assert 'Accept-Encoding' in first.headers['vary']
+        assert first.headers['etag'].endswith('-gzip"')
+        assert second.json() == first.json()
+        assert len(encoded_cache.cache) == 1
+
+    def test_brotli_variant_has_its_own_etag(self, client: TestClient) -> None:
+        plain = client.get(
+            '/api/v1/swapi/', params=PEOPLE_PARAMS, headers=IDENTITY
+        )
+        encoded = client.get(
+            '/api/v1/swapi/',
+            params=PEOPLE_PARAMS,
+            headers={'Accept-Encoding': 'br'},
+        )
+
+        assert 'content-encoding' not in plain.headers
+        assert encoded.headers['content-encoding'] == 'br'
+        assert encoded.headers['etag'] == variant_etag(
+            plain.headers['etag'], 'br'
+        )
+        assert encoded.json() == plain.json()
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from infra.http_client import create_http_client
+from main import app
+from services.swapi_data_service import SwapiDataService
+
+
+class TestHttpClient:
+    API_URL = '/api/v1/swapi/'
+
+    def test_create_http_client_applies_settings(self) -> None:
+        with (
+            patch('infra.http_client.settings.HTTP_MAX_CONNECTIONS', 7),
+            patch('infra.http_client.settings.HTTP2_ENABLED', new=True),
+            patch('infra.http_client.httpx.AsyncClient') as async_client,
+        ):
+            create_http_client()
+
+        kwargs = async_client.call_args.kwargs
+        assert kwargs['http2'] is True
+        assert kwargs['limits'] == httpx.Limits(
+            max_connections=7,
+            max_keepalive_connections=20,
+            keepalive_expiry=30.0,
+        )
+        assert kwargs['timeout'] == httpx.Timeout(10.0, connect=5.0)
+
+    @pytest.mark.usefixtures('client')
+    def test_lifespan_should_create_shared_client(self) -> None:
+        http_client = app.state.http_client
+
+        assert isinstance(http_client, httpx.AsyncClient)
+        assert not http_client.is_closed
+
+    @pytest.mark.usefixtures('mock_people_list')
+    def test_requests_should_reuse_the_same_client(
+        self, client: TestClient
+    ) -> None:
+        used_clients: set[int] = set()
+        original_fetch = SwapiDataService.fetch_from_swapi
+
+        async def spy(self: SwapiDataService, params: object) -> object:
+            used_clients.add(id(self.http_client))
+            return await original_fetch(self, params)  # type: ignore[arg-type]
+
+        with patch.object(SwapiDataService, 'fetch_from_swapi', spy):
+            for _ in range(3):
+                response = client.get(
+                    self.API_URL, params={'resource': 'people'}
+                )
+                assert response.status_code == HTTPStatus.OK.value
+
+        assert used_clients == {id(app.state.http_client)}
+
+    def test_lifespan_should_close_client_on_shutdown(self) -> None:
+        with TestClient(app):
+            http_client = app.state.http_client
+
+        assert http_client.is_closed
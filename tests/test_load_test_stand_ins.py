@@ -0,0 +1,77 @@
+from collections.abc import AsyncIterator
+from http import HTTPStatus
+
+import httpx
+import pytest
+from upstash_redis.asyncio import Redis
+
+from benchmarks.fake_swapi import RESOURCE_COUNTS, FakeSwapi, generate_dataset
+from benchmarks.fake_upstash import FakeUpstash
+from schemas.swapi_query_params_schema import SwapiResource
+from services.pagination import SWAPI_PAGE_SIZE
+
+UPSTASH_TOKEN = 'token'  # noqa: S105
+
+
+class TestFakeSwapi:
+    @pytest.fixture
+    async def swapi(self) -> AsyncIterator[FakeSwapi]:
+        async with FakeSwapi(generate_dataset()) as swapi:
+            yield swapi
+
+    def test_dataset_is_deterministic(self) -> None:
+        assert generate_dataset(seed=3) == generate_dataset(seed=3)
+
+    async def test_lists_pages_with_local_links(
+        self, swapi: FakeSwapi
+    ) -> None:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f'{swapi.base_url}people/?page=2')
+
+        body = response.json()
+        assert body['count'] == RESOURCE_COUNTS[SwapiResource.PEOPLE]
+        assert len(body['results']) == SWAPI_PAGE_SIZE
+        assert body['next'] == f'{swapi.base_url}people/?page=3'
+        assert body['results'][0]['homeworld'].startswith(swapi.base_url)
+
+    async def test_searches_and_gets_by_id(self, swapi: FakeSwapi) -> None:
+        async with httpx.AsyncClient() as client:
+            search = await client.get(
+                f'{swapi.base_url}films/', params={'search': 'films 4'}
+            )
+            by_id = await client.get(f'{swapi.base_url}planets/7/')
+            missing = await client.get(f'{swapi.base_url}planets/999/')
+
+        assert [f['title'] for f in search.json()['results']] == ['Films 4']
+        assert by_id.json()['name'] == 'Planets 7'
+        assert missing.status_code == HTTPStatus.NOT_FOUND
+
+    async def test_injects_errors(self) -> None:
+        async with (
+            FakeSwapi(generate_dataset(), error_rate=1.0) as swapi,
+            httpx.AsyncClient() as client,
+        ):
+            response = await client.get(f'{swapi.base_url}people/1/')
+
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert swapi.errors == 1
+
+
+async def test_fake_upstash_serves_the_upstash_client() -> None:
+    async with FakeUpstash(UPSTASH_TOKEN) as upstash:
+        redis = Redis(url=upstash.address, token=UPSTASH_TOKEN)
+        assert await redis.set('key', 'value', ex=60) is True
+        assert await redis.set('key', 'other', nx=True) is False
+
+        pipe = redis.pipeline()
+        pipe.set('other', 'é')
+        pipe.get('key')
+        assert await pipe.exec() == [True, 'value']
+        assert await redis.mget('key', 'other', 'missing') == [
+            'value',
+            'é',
+            None,
+        ]
+        await redis.close()
+
+    assert upstash.store.ttl('key') > 0
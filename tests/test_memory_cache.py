@@ -0,0 +1,85 @@
+from infra.memory_cache import MemoryCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMemoryCache:
+    def test_get_returns_stored_value(self) -> None:
+        cache = MemoryCache(max_items=2, max_bytes=100, ttl_seconds=60)
+
+        cache.set('a', '{"a": 1}')
+
+        assert cache.get('a') == '{"a": 1}'
+        assert cache.stats.hits == 1
+
+    def test_get_counts_miss(self) -> None:
+        cache = MemoryCache(max_items=2, max_bytes=100, ttl_seconds=60)
+
+        assert cache.get('missing') is None
+        assert cache.stats.misses == 1
+
+    def test_evicts_least_recently_used_when_full(self) -> None:
+        cache = MemoryCache(max_items=2, max_bytes=100, ttl_seconds=60)
+
+        cache.set('a', '1')
+        cache.set('b', '2')
+        cache.get('a')
+        cache.set('c', '3')
+
+        assert cache.get('b') is None
+        assert cache.get('a') == '1'
+        assert cache.get('c') == '3'
+        assert cache.stats.evictions == 1
+
+    def test_evicts_until_under_byte_limit(self) -> None:
+        cache = MemoryCache(max_items=10, max_bytes=10, ttl_seconds=60)
+
+        cache.set('a', 'x' * 4)
+        cache.set('b', 'x' * 4)
+        cache.set('c', 'x' * 4)
+
+        assert len(cache) == 2  # noqa: PLR2004
+        assert cache.size_bytes == 8  # noqa: PLR2004
+        assert cache.get('a') is None
+
+    def test_counts_encoded_bytes(self) -> None:
+        cache = MemoryCache(max_items=10, max_bytes=10, ttl_seconds=60)
+
+        cache.set('a', 'ção')
+
+        assert cache.size_bytes == 5  # noqa: PLR2004
+        assert cache.set('b', 'ã' * 6) is False
+
+    def test_rejects_value_larger_than_byte_limit(self) -> None:
+        cache = MemoryCache(max_items=10, max_bytes=10, ttl_seconds=60)
+
+        assert cache.set('a', 'x' * 11) is False
+        assert len(cache) == 0
+
+    def test_overwrite_updates_size(self) -> None:
+        cache = MemoryCache(max_items=10, max_bytes=100, ttl_seconds=60)
+
+        cache.set('a', 'x' * 10)
+        cache.set('a', 'x' * 4)
+
+        assert cache.size_bytes == 4  # noqa: PLR2004
+        assert len(cache) == 1
+
+    def test_expired_entry_is_removed(self) -> None:
+        clock = FakeClock()
+        cache = MemoryCache(
+            max_items=10, max_bytes=100, ttl_seconds=60, clock=clock
+        )
+
+        cache.set('a', '1')
+        clock.now = 61
+
+        assert cache.get('a') is None
+        assert cache.stats.expirations == 1
+        assert cache.size_bytes == 0
@@ -0,0 +1,179 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry, Histogram
+
+from infra.cache_compression import CacheSizeStats
+from infra.cache_write_queue import CacheWriteQueue
+from infra.memory_cache import MemoryCache
+from infra.metrics import RUNTIME_STATS, UpstreamMetrics, observe_duration
+from infra.single_flight import SingleFlight
+from repositories.cache_repository import CacheRepository
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from tests.conftest import sample_value
+
+LOOKUPS = 'swapi_cache_lookups_total'
+REQUEST_COUNT = 'swapi_request_duration_seconds_count'
+MEMORY_EVENTS = 'swapi_memory_cache_events_total'
+SINGLE_FLIGHT = 'swapi_single_flight_total'
+CACHE_WRITES = 'swapi_cache_writes_total'
+LARGEST = 'swapi_cache_largest_value_bytes'
+
+
+class TestObserveDuration:
+    def test_observes_with_the_given_clock(self) -> None:
+        registry = CollectorRegistry()
+        histogram = Histogram(
+            'cpu_seconds', 'CPU.', buckets=(0.1, 1), registry=registry
+        )
+        ticks = iter((1.0, 1.5))
+
+        with observe_duration(histogram, lambda: next(ticks)):
+            pass
+
+        assert registry.get_sample_value('cpu_seconds_sum') == 0.5  # noqa: PLR2004
+        assert (
+            registry.get_sample_value('cpu_seconds_bucket', {'le': '1.0'}) == 1
+        )
+
+
+class TestUpstreamMetrics:
+    def test_tracks_status_latency_and_in_flight(self) -> None:
+        metrics = UpstreamMetrics('test')
+
+        with metrics.track() as call:
+            assert sample_value('swapi_upstream_in_flight') >= 1
+            call.status = 404
+
+        assert (
+            sample_value(
+                'swapi_upstream_request_duration_seconds_count', kind='test'
+            )
+            == 1
+        )
+        assert (
+            sample_value(
+                'swapi_upstream_responses_total', kind='test', status='404'
+            )
+            == 1
+        )
+
+    def test_counts_transport_errors(self) -> None:
+        metrics = UpstreamMetrics('test-error')
+
+        with pytest.raises(ConnectionError), metrics.track():
+            raise ConnectionError
+
+        assert (
+            sample_value(
+                'swapi_upstream_responses_total',
+                kind='test-error',
+                status='error',
+            )
+            == 1
+        )
+
+
+class TestCacheMetrics:
+    async def test_counts_memory_and_redis_lookups(
+        self, cache_repository: CacheRepository
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+        hits = sample_value(LOOKUPS, tier='memory', result='hit')
+        misses = sample_value(LOOKUPS, tier='redis', result='miss')
+
+        await cache_repository.get(params)
+        await cache_repository.set(params, {'count': 82})
+        await cache_repository.get(params)
+
+        assert sample_value(LOOKUPS, tier='redis', result='miss') == misses + 1
+        assert sample_value(LOOKUPS, tier='memory', result='hit') == hits + 1
+
+
+class TestRuntimeStats:
+    def test_exports_memory_cache_events(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        cache = MemoryCache(max_items=1, max_bytes=100, ttl_seconds=60)
+        monkeypatch.setattr(RUNTIME_STATS, 'memory_cache', cache)
+
+        cache.set('a', '1')
+        cache.get('a')
+        cache.set('b', '2')
+        cache.get('a')
+
+        assert [
+            sample_value(MEMORY_EVENTS, event=event)
+            for event in ('hit', 'miss', 'eviction', 'expiration')
+        ] == [1, 1, 1, 0]
+
+    async def test_exports_single_flight_calls(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        single_flight: SingleFlight[str] = SingleFlight()
+        monkeypatch.setattr(RUNTIME_STATS, 'single_flight', single_flight)
+
+        async def fetch() -> str:
+            await asyncio.sleep(0)
+            return 'value'
+
+        await asyncio.gather(
+            *(single_flight.do('key', fetch) for _ in range(3))
+        )
+
+        assert sample_value(SINGLE_FLIGHT, result='executed') == 1
+        assert sample_value(SINGLE_FLIGHT, result='coalesced') == 2  # noqa: PLR2004
+
+    async def test_exports_write_queue_results(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def failing_writer(values: dict[str, str]) -> bool:  # noqa: ARG001
+            return False
+
+        queue = CacheWriteQueue(failing_writer, max_size=1, batch_size=1)
+        monkeypatch.setattr(RUNTIME_STATS, 'write_queue', queue)
+
+        await queue.put('a', '1')
+        await queue.put('b', '2')
+        async with queue:
+            pass
+
+        assert [
+            sample_value(CACHE_WRITES, result=result)
+            for result in ('written', 'dropped', 'failed')
+        ] == [0, 1, 1]
+
+    def test_exports_largest_stored_values(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        size_stats = CacheSizeStats(max_keys=10)
+        monkeypatch.setattr(RUNTIME_STATS, 'size_stats', size_stats)
+
+        size_stats.record('swapi:v1:small', 100, 100)
+        size_stats.record('swapi:v1:large', 5000, 900)
+
+        assert [
+            sample_value(LARGEST, key='swapi:v1:large', form=form)
+            for form in ('raw', 'stored')
+        ] == [5000, 900]
+
+
+class TestMetricsEndpoint:
+    @pytest.mark.usefixtures('mock_person_by_id')
+    def test_exposes_request_latency_per_resource(
+        self, client: TestClient
+    ) -> None:
+        count = sample_value(REQUEST_COUNT, resource='people')
+
+        client.get('/api/v1/swapi', params={'resource': 'people', 'id': 1})
+        response = client.get('/metrics')
+
+        assert sample_value(REQUEST_COUNT, resource='people') == count + 1
+        assert response.headers['content-type'].startswith('text/plain')
+        assert 'swapi_request_duration_seconds_count{resource="people"}' in (
+            response.text
+        )
+        assert 'swapi_upstream_responses_total{kind="fetch",status="200"}' in (
+            response.text
+        )
@@ -0,0 +1,194 @@
+from http import HTTPStatus
+
+import pytest
+from fakeredis.aioredis import FakeRedis as FakeAsyncRedis
+from fastapi import Request
+from fastapi.testclient import TestClient
+
+from infra.rate_limiter import RateLimiter
+from infra.settings import settings
+from repositories.api_key_repository import hash_api_key
+from services.auth_service import rate_limit_for, rate_limit_key
+
+WINDOW = 60
+PERSON_PARAMS = {'resource': 'people', 'id': 1}
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_limiter(
+    clock: FakeClock, client: FakeAsyncRedis | None = None
+) -> RateLimiter:
+    return RateLimiter(
+        client,  # type: ignore[arg-type]
+        window_seconds=WINDOW,
+        sync_interval=1.0,
+        clock=clock,
+    )
+
+
+class TestRateLimiter:
+    def test_denies_over_the_limit(self) -> None:
+        limiter = create_limiter(FakeClock(WINDOW * 10))
+
+        decisions = [limiter.check('key', 3) for _ in range(4)]
+
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert [d.remaining for d in decisions] == [2, 1, 0, 0]
+        assert decisions[-1].headers() == {
+            'RateLimit-Limit': '3',
+            'RateLimit-Remaining': '0',
+            'RateLimit-Reset': str(WINDOW),
+            'RateLimit-Policy': f'3;w={WINDOW}',
+            'Retry-After': str(WINDOW),
+        }
+
+    def test_limits_keys_separately(self) -> None:
+        limiter = create_limiter(FakeClock(WINDOW * 10))
+        limiter.check('key', 1)
+
+        assert limiter.check('other', 1).allowed
+        assert not limiter.check('key', 1).allowed
+
+    def test_weights_the_previous_window(self) -> None:
+        clock = FakeClock(WINDOW * 10)
+        limiter = create_limiter(clock)
+        for _ in range(4):
+            limiter.check('key', 4)
+
+        clock.now += WINDOW * 1.5
+        assert [limiter.check('key', 4).allowed for _ in range(3)] == [
+            True,
+            True,
+            False,
+        ]
+
+        denied = limiter.check('key', 4)
+        assert denied.reset_seconds == WINDOW // 4
+
+    async def test_shares_counts_through_redis(
+        self, redis_client: FakeAsyncRedis
+    ) -> None:
+        clock = FakeClock(WINDOW * 10)
+        first = create_limiter(clock, redis_client)
+        second = create_limiter(clock, redis_client)
+
+        for _ in range(3):
+            first.check('key', 5)
+        second.check('key', 5)
+        await first.sync()
+        await second.sync()
+
+        assert second.check('key', 5).allowed
+        assert not second.check('key', 5).allowed
+        assert await redis_client.get('ratelimit:key:10') == '4'
+
+    async def test_survives_a_failed_sync_on_exit(
+        self, redis_client: FakeAsyncRedis, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def fail() -> list[object]:
+            msg = 'Redis down'
+            raise ConnectionError(msg)
+
+        pipeline = redis_client.pipeline()
+        monkeypatch.setattr(pipeline, 'exec', fail)
+        monkeypatch.setattr(redis_client, 'pipeline', lambda: pipeline)
+
+        limiter = create_limiter(FakeClock(WINDOW * 10), redis_client)
+        async with limiter:
+            limiter.check('key', 5)
+
+    async def test_prunes_idle_keys_without_redis(self) -> None:
+        clock = FakeClock(WINDOW * 10)
+        limiter = create_limiter(clock)
+        for caller in range(100):
+            limiter.check(f'ip:{caller}', 5)
+
+        clock.now += WINDOW * 2
+        await limiter.sync()
+
+        assert not limiter._buckets  # noqa: SLF001
+
+
+class TestRateLimitedEndpoint:
+    @pytest.fixture(autouse=True)
+    def small_tier(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, 'RATE_LIMIT_ENABLED', True)
+        monkeypatch.setattr(
+            settings, 'RATE_LIMIT_TIERS', {'tiny': 2, 'standard': 0}
+        )
+        monkeypatch.setattr(
+            settings, 'RATE_LIMIT_KEY_TIERS', {hash_api_key('key'): 'tiny'}
+        )
+
+    @pytest.mark.usefixtures('mock_person_by_id')
+    def test_returns_rate_limit_headers(self, client: TestClient) -> None:
+        response = client.get(
+            '/api/v1/swapi', params=PERSON_PARAMS, headers={'X-API-Key': 'key'}
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers['ratelimit-limit'] == '2'
+        assert response.headers['ratelimit-remaining'] == '1'
+
+    @pytest.mark.usefixtures('mock_person_by_id')
+    def test_returns_too_many_requests(self, client: TestClient) -> None:
+        for _ in range(2):
+            client.get(
+                '/api/v1/swapi',
+                params=PERSON_PARAMS,
+                headers={'X-API-Key': 'key'},
+            )
+
+        response = client.get(
+            '/api/v1/swapi', params=PERSON_PARAMS, headers={'X-API-Key': 'key'}
+        )
+
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        assert int(response.headers['retry-after']) >= 1
+        assert response.headers['ratelimit-remaining'] == '0'
+        assert response.json() == {
+            'error': 'TooManyRequestsError',
+            'detail': HTTPStatus.TOO_MANY_REQUESTS.description,
+        }
+
+    @pytest.mark.usefixtures('mock_person_by_id')
+    def test_skips_keys_in_unlimited_tiers(self, client: TestClient) -> None:
+        response = client.get(
+            '/api/v1/swapi', params=PERSON_PARAMS, headers={'X-API-Key': 'new'}
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert 'ratelimit-limit' not in response.headers
+
+
+class TestRateLimitFor:
+    @pytest.fixture(autouse=True)
+    def tiers(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            settings, 'RATE_LIMIT_TIERS', {'tiny': 2, 'standard': 10}
+        )
+        monkeypatch.setattr(
+            settings, 'RATE_LIMIT_KEY_TIERS', {hash_api_key('key'): 'tiny'}
+        )
+
+    def test_uses_the_configured_tier(self) -> None:
+        assert rate_limit_for(hash_api_key('key')) == 2  # noqa: PLR2004
+
+    @pytest.mark.parametrize('tier', [None, 'premium'])
+    def test_falls_back_to_the_default_tier(self, tier: str | None) -> None:
+        assert rate_limit_for(hash_api_key('other'), tier) == 10  # noqa: PLR2004
+
+    def test_keys_the_limiter_by_the_key_digest(self) -> None:
+        request = Request({'type': 'http', 'client': ('10.0.0.1', 1234)})
+
+        assert rate_limit_key(request, hash_api_key('key')) == hash_api_key(
+            'key'
+        )
+        assert rate_limit_key(request, None) == 'ip:10.0.0.1'
@@ -0,0 +1,121 @@
+import pytest
+from fastapi.testclient import TestClient
+from respx import MockRouter
+
+from infra import json_codec
+from repositories.cache_repository import CacheRepository
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from services.swapi_data_service import SwapiDataService
+from tests.mock_data import LUKE_SKYWALKER
+
+PLANET_URL = 'https://swapi.dev/api/planets/1/'
+
+
+class TestResponseCache:
+    @pytest.mark.usefixtures('mock_person_with_expand')
+    async def test_expanded_response_is_served_from_cache(
+        self, service: SwapiDataService, respx_mock: MockRouter
+    ) -> None:
+        params = SwapiQueryParams(
+            resource=SwapiResource.PEOPLE, id=1, expand='all'
+        )
+
+        first = await service.get_swapi_data(params)
+        calls_after_first = respx_mock.calls.call_count
+        second = await service.get_swapi_data(params)
+
+        assert second == first
+        assert respx_mock.calls.call_count == calls_after_first
+
+    @pytest.mark.usefixtures('mock_person_with_expand')
+    async def test_equivalent_expand_fields_share_cache_entry(
+        self, service: SwapiDataService, respx_mock: MockRouter
+    ) -> None:
+        await service.get_swapi_data(
+            SwapiQueryParams(
+                resource=SwapiResource.PEOPLE, id=1, expand='films,homeworld'
+            )
+        )
+        calls_after_first = respx_mock.calls.call_count
+
+        await service.get_swapi_data(
+            SwapiQueryParams(
+                resource=SwapiResource.PEOPLE, id=1, expand='homeworld,films'
+            )
+        )
+
+        assert respx_mock.calls.call_count == calls_after_first
+
+    @pytest.mark.usefixtures('mock_person_expand_with_error')
+    async def test_partial_expansion_is_not_cached(
+        self, service: SwapiDataService, respx_mock: MockRouter
+    ) -> None:
+        params = SwapiQueryParams(
+            resource=SwapiResource.PEOPLE, id=1, expand='all'
+        )
+
+        await service.get_swapi_data(params)
+        await service.get_swapi_data(params)
+
+        planet_calls = [
+            call
+            for call in respx_mock.calls
+            if str(call.request.url) == PLANET_URL
+        ]
+        assert len(planet_calls) == 2  # noqa: PLR2004
+
+    @pytest.mark.usefixtures('mock_people_for_sort')
+    async def test_sorted_response_is_cached(
+        self, service: SwapiDataService
+    ) -> None:
+        params = SwapiQueryParams(
+            resource=SwapiResource.PEOPLE, sort_by='height'
+        )
+
+        sorted_data = await service.get_swapi_data(params)
+
+        cached = await service.cache_repository.get_response(params)
+        assert cached == sorted_data
+
+
+class TestRawResponseBody:
+    @pytest.mark.usefixtures('mock_person_with_expand')
+    async def test_cached_body_is_returned_without_reencoding(
+        self, service: SwapiDataService, cache_repository: CacheRepository
+    ) -> None:
+        params = SwapiQueryParams(
+            resource=SwapiResource.PEOPLE, id=1, expand='all'
+        )
+
+        first = await service.get_swapi_body(params)
+        entry = await cache_repository.get_response_entry(params)
+        second = await service.get_swapi_body(params)
+
+        assert entry is not None
+        assert second.content == entry.body.encode()
+        assert second.etag == first.etag == entry.etag
+        assert json_codec.loads(second.content) == json_codec.loads(
+            first.content
+        )
+
+    @pytest.mark.usefixtures('mock_person_by_id')
+    def test_endpoint_returns_json_body(self, client: TestClient) -> None:
+        response = client.get(
+            '/api/v1/swapi/', params={'resource': 'people', 'id': 1}
+        )
+
+        assert response.headers['content-type'] == 'application/json'
+        assert response.json() == LUKE_SKYWALKER
+
+
+class TestJsonCodec:
+    @pytest.mark.parametrize('fast', [True, False])
+    def test_codec_round_trips_with_and_without_orjson(
+        self, monkeypatch: pytest.MonkeyPatch, *, fast: bool
+    ) -> None:
+        if not fast:
+            monkeypatch.setattr(json_codec, 'orjson', None)
+        data = {'name': 'Luke', 'films': ['1', '2'], 'height': 172}
+
+        assert json_codec.loads(json_codec.dumps(data)) == data
+        assert json_codec.loads(json_codec.dumps_bytes(data)) == data
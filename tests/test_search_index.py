@@ -0,0 +1,55 @@
+from repositories.search_index import SearchIndex
+from schemas.swapi_query_params_schema import SwapiResource
+
+PEOPLE = [
+    {'name': 'Luke Skywalker'},
+    {'name': 'C-3PO'},
+    {'name': 'Anakin Skywalker'},
+    {'name': 'Yoda'},
+]
+
+STARSHIPS = [
+    {'name': 'X-wing', 'model': 'T-65 X-wing'},
+    {'name': 'Millennium Falcon', 'model': 'YT-1300 light freighter'},
+]
+
+
+class TestSearchIndex:
+    def test_should_match_substring_case_insensitive(self) -> None:
+        index = SearchIndex.for_resource(SwapiResource.PEOPLE, PEOPLE)
+
+        results = index.search('SKYwalk')
+
+        assert results == [PEOPLE[0], PEOPLE[2]]
+
+    def test_should_match_middle_of_name(self) -> None:
+        index = SearchIndex.for_resource(SwapiResource.PEOPLE, PEOPLE)
+
+        assert index.search('kin sky') == [PEOPLE[2]]
+
+    def test_should_match_short_terms(self) -> None:
+        index = SearchIndex.for_resource(SwapiResource.PEOPLE, PEOPLE)
+
+        assert index.search('3p') == [PEOPLE[1]]
+        assert index.search('o') == [PEOPLE[1], PEOPLE[3]]
+
+    def test_should_return_empty_when_no_match(self) -> None:
+        index = SearchIndex.for_resource(SwapiResource.PEOPLE, PEOPLE)
+
+        assert index.search('vader') == []
+
+    def test_should_search_model_of_starships(self) -> None:
+        index = SearchIndex.for_resource(SwapiResource.STARSHIPS, STARSHIPS)
+
+        assert index.search('freighter') == [STARSHIPS[1]]
+
+    def test_should_not_match_across_fields(self) -> None:
+        index = SearchIndex.for_resource(SwapiResource.STARSHIPS, STARSHIPS)
+
+        assert index.search('wingt-65') == []
+
+    def test_should_search_title_of_films(self) -> None:
+        films = [{'title': 'A New Hope'}, {'title': 'Return of the Jedi'}]
+        index = SearchIndex.for_resource(SwapiResource.FILMS, films)
+
+        assert index.search('jedi') == [films[1]]
@@ -0,0 +1,97 @@
+import asyncio
+from http import HTTPStatus
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+from starlette.types import Receive, Scope, Send
+
+from infra.server_timing import (
+    ServerTimingMiddleware,
+    format_server_timing,
+    timed,
+)
+from infra.settings import settings
+
+PERSON_PARAMS = {'resource': 'people', 'id': 1}
+PROFILE_HEADERS = {'X-Profile': '1', 'X-API-Key': 'profile-key'}
+
+
+class TestTimed:
+    def test_is_a_no_op_outside_requests(self) -> None:
+        with timed('cache'):
+            pass
+
+    def test_formats_milliseconds(self) -> None:
+        assert format_server_timing({'cache': 0.0012, 'total': 0.05}) == (
+            'cache;dur=1.2, total;dur=50.0'
+        )
+
+
+@pytest.mark.usefixtures('mock_person_by_id')
+class TestServerTimingMiddleware:
+    def test_reports_upstream_and_total(self, client: TestClient) -> None:
+        response = client.get('/api/v1/swapi', params=PERSON_PARAMS)
+
+        server_timing = response.headers['server-timing']
+        assert 'upstream;dur=' in server_timing
+        assert 'total;dur=' in server_timing
+
+    def test_returns_profile_for_profile_key(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, 'PROFILE_API_KEY', 'profile-key')
+
+        response = client.get(
+            '/api/v1/swapi',
+            params=PERSON_PARAMS,
+            headers=PROFILE_HEADERS,
+        )
+
+        assert response.headers['content-type'].startswith('text/plain')
+        assert response.text.startswith('status: 200')
+        assert 'function calls' in response.text
+
+    def test_ignores_profile_header_without_profile_key(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, 'PROFILE_API_KEY', 'profile-key')
+
+        response = client.get(
+            '/api/v1/swapi',
+            params=PERSON_PARAMS,
+            headers={'X-Profile': '1', 'X-API-Key': 'other-key'},
+        )
+
+        assert response.headers['content-type'] == 'application/json'
+
+
+async def test_rejects_overlapping_profiles(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, 'PROFILE_API_KEY', 'profile-key')
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_app(scope: Scope, receive: Receive, send: Send) -> None:
+        started.set()
+        await release.wait()
+        await PlainTextResponse('ok')(scope, receive, send)
+
+    transport = httpx.ASGITransport(app=ServerTimingMiddleware(slow_app))
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://test'
+    ) as client:
+        first = asyncio.create_task(client.get('/', headers=PROFILE_HEADERS))
+        await started.wait()
+        second = await client.get('/', headers=PROFILE_HEADERS)
+        release.set()
+        first_response = await first
+        third = await client.get('/', headers=PROFILE_HEADERS)
+
+    assert second.status_code == HTTPStatus.CONFLICT
+    assert second.headers['retry-after'] == '1'
+    assert second.json()['error'] == 'ConflictError'
+    assert first_response.text.startswith('status: 200')
+    assert third.text.startswith('status: 200')
@@ -0,0 +1,139 @@
+import asyncio
+from http import HTTPStatus
+from unittest.mock import AsyncMock
+from urllib.parse import urljoin
+
+import httpx
+from respx import MockRouter
+
+from infra.settings import settings
+from infra.single_flight import SingleFlight
+from repositories.cache_repository import CacheRepository
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from services.swapi_data_service import SwapiDataService
+
+CONCURRENT_CALLERS = 50
+
+
+class SlowCall:
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return 'ok'
+
+
+def _slow_upstream(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        HTTPStatus.OK,
+        json={'count': 1, 'results': [], 'url': str(request.url)},
+    )
+
+
+async def _slow_side_effect(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(0.05)
+    return _slow_upstream(request)
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_execution(
+        self, single_flight: SingleFlight
+    ) -> None:
+        fn = SlowCall()
+
+        results = await asyncio.gather(
+            *[single_flight.do('key', fn) for _ in range(CONCURRENT_CALLERS)]
+        )
+
+        assert results == ['ok'] * CONCURRENT_CALLERS
+        assert fn.calls == 1
+        assert single_flight.stats.executions == 1
+        assert single_flight.stats.coalesced == CONCURRENT_CALLERS - 1
+        assert single_flight.in_flight == 0
+
+    async def test_different_keys_run_independently(
+        self, single_flight: SingleFlight
+    ) -> None:
+        fn = SlowCall()
+
+        await asyncio.gather(
+            single_flight.do('a', fn), single_flight.do('b', fn)
+        )
+
+        assert fn.calls == 2  # noqa: PLR2004
+
+    async def test_error_is_propagated_to_all_callers(
+        self, single_flight: SingleFlight
+    ) -> None:
+        async def fail() -> None:
+            await asyncio.sleep(0.01)
+            msg = 'upstream down'
+            raise RuntimeError(msg)
+
+        results = await asyncio.gather(
+            single_flight.do('key', fail),
+            single_flight.do('key', fail),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert single_flight.in_flight == 0
+
+    async def test_cancelled_caller_does_not_cancel_the_flight(
+        self, single_flight: SingleFlight
+    ) -> None:
+        fn = SlowCall(delay=0.02)
+
+        first = asyncio.create_task(single_flight.do('key', fn))
+        second = asyncio.create_task(single_flight.do('key', fn))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == 'ok'
+
+
+class TestSwapiDataServiceCoalescing:
+    async def test_concurrent_misses_call_upstream_once_per_key(
+        self,
+        service: SwapiDataService,
+        cache_repository: CacheRepository,
+        single_flight: SingleFlight,
+        respx_mock: MockRouter,
+    ) -> None:
+        route = respx_mock.get(urljoin(settings.SWAPI_BASE_URL, 'people/'))
+        route.side_effect = _slow_side_effect
+        cache_set = AsyncMock(wraps=cache_repository.set)
+        cache_repository.set = cache_set
+        pages = [1, 2, 3]
+
+        results = await asyncio.gather(
+            *[
+                service.get_swapi_data(
+                    SwapiQueryParams(resource=SwapiResource.PEOPLE, page=page)
+                )
+                for page in pages
+                for _ in range(CONCURRENT_CALLERS)
+            ]
+        )
+
+        assert len(results) == len(pages) * CONCURRENT_CALLERS
+        assert route.call_count == len(pages)
+        assert cache_set.await_count == len(pages)
+        assert single_flight.stats.coalesced == len(pages) * (
+            CONCURRENT_CALLERS - 1
+        )
+
+    async def test_callers_after_flight_are_served_from_cache(
+        self, service: SwapiDataService, respx_mock: MockRouter
+    ) -> None:
+        route = respx_mock.get(urljoin(settings.SWAPI_BASE_URL, 'people/'))
+        route.side_effect = _slow_upstream
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE)
+
+        await service.get_swapi_data(params)
+        await service.get_swapi_data(params)
+
+        assert route.call_count == 1
@@ -0,0 +1,190 @@
+from http import HTTPStatus
+from unittest.mock import MagicMock, patch
+from urllib.parse import urljoin
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from respx import MockRouter
+
+from exceptions.errors import NotFoundError
+from main import app
+from repositories.snapshot_repository import SnapshotRepository
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from services.snapshot_crawler_service import SnapshotCrawlerService
+from services.snapshot_swapi_data_service import SnapshotSwapiDataService
+from services.swapi_data_service import SwapiDataService
+from tests.conftest import BASE_URL
+from tests.mock_data import (
+    FILM_1,
+    FILM_2,
+    LUKE_SKYWALKER,
+    STARSHIP_12,
+    TATOOINE,
+    VEHICLE_14,
+)
+
+PEOPLE_COUNT = 25
+
+
+def _person(item_id: int) -> dict[str, str]:
+    return {
+        'name': f'Person {item_id}',
+        'url': f'https://swapi.dev/api/people/{item_id}/',
+    }
+
+
+@pytest.fixture
+def snapshot_records(snapshot_repository: SnapshotRepository) -> None:
+    people = [_person(i) for i in range(2, PEOPLE_COUNT + 1)]
+    snapshot_repository.write(
+        {
+            SwapiResource.PEOPLE: [LUKE_SKYWALKER, *people],
+            SwapiResource.PLANETS: [TATOOINE],
+            SwapiResource.FILMS: [FILM_1, FILM_2],
+            SwapiResource.VEHICLES: [VEHICLE_14],
+            SwapiResource.STARSHIPS: [STARSHIP_12],
+        }
+    )
+
+
+@pytest.mark.usefixtures('snapshot_records')
+class TestSnapshotSwapiDataService:
+    def test_should_return_first_page(
+        self, snapshot_service: SnapshotSwapiDataService
+    ) -> None:
+        data = snapshot_service.fetch(
+            SwapiQueryParams(resource=SwapiResource.PEOPLE)
+        )
+
+        assert data['count'] == PEOPLE_COUNT
+        assert data['next'] == 'https://swapi.dev/api/people/?page=2'
+        assert data['previous'] is None
+        assert data['results'][0] == LUKE_SKYWALKER
+        assert len(data['results']) == 10  # noqa: PLR2004
+
+    def test_should_return_last_page(
+        self, snapshot_service: SnapshotSwapiDataService
+    ) -> None:
+        data = snapshot_service.fetch(
+            SwapiQueryParams(resource=SwapiResource.PEOPLE, page=3)
+        )
+
+        assert data['next'] is None
+        assert data['previous'] == 'https://swapi.dev/api/people/?page=2'
+        assert [r['name'] for r in data['results']] == [
+            f'Person {i}' for i in range(21, PEOPLE_COUNT + 1)
+        ]
+
+    def test_should_raise_not_found_past_last_page(
+        self, snapshot_service: SnapshotSwapiDataService
+    ) -> None:
+        with pytest.raises(NotFoundError):
+            snapshot_service.fetch(
+                SwapiQueryParams(resource=SwapiResource.PEOPLE, page=4)
+            )
+
+    def test_should_return_record_by_id(
+        self, snapshot_service: SnapshotSwapiDataService
+    ) -> None:
+        data = snapshot_service.fetch(
+            SwapiQueryParams(resource=SwapiResource.PLANETS, id=1)
+        )
+
+        assert data == TATOOINE
+
+    def test_should_raise_not_found_for_unknown_id(
+        self, snapshot_service: SnapshotSwapiDataService
+    ) -> None:
+        with pytest.raises(NotFoundError):
+            snapshot_service.fetch(
+                SwapiQueryParams(resource=SwapiResource.PLANETS, id=99)
+            )
+
+    def test_should_search_case_insensitive_substring(
+        self, snapshot_service: SnapshotSwapiDataService
+    ) -> None:
+        data = snapshot_service.fetch(
+            SwapiQueryParams(resource=SwapiResource.FILMS, search='NEW')
+        )
+
+        assert data['count'] == 1
+        assert data['results'] == [FILM_1]
+
+    def test_search_pages_keep_search_term(
+        self, snapshot_service: SnapshotSwapiDataService
+    ) -> None:
+        data = snapshot_service.fetch(
+            SwapiQueryParams(resource=SwapiResource.PEOPLE, search='person')
+        )
+
+        assert data['count'] == PEOPLE_COUNT - 1
+        assert data['next'] == (
+            'https://swapi.dev/api/people/?search=person&page=2'
+        )
+
+
+@pytest.mark.usefixtures('snapshot_records')
+class TestSwapiDataServiceSnapshotBackend:
+    async def test_should_serve_expanded_data_without_network(
+        self, service: SwapiDataService, respx_mock: MockRouter
+    ) -> None:
+        service.use_snapshot = True
+        service.expand_service.use_snapshot = True
+
+        data = await service.get_swapi_data(
+            SwapiQueryParams(resource=SwapiResource.PEOPLE, id=1, expand='all')
+        )
+
+        assert data['homeworld'] == TATOOINE
+        assert data['films'][:2] == [FILM_1, FILM_2]  # type: ignore[index]
+        assert data['films'][2]['error'] == 'Failed to fetch resource'  # type: ignore[index]
+        assert respx_mock.calls.call_count == 0
+
+
+class TestSnapshotCrawler:
+    async def test_should_crawl_every_page_of_every_resource(
+        self,
+        http_client: httpx.AsyncClient,
+        snapshot_repository: SnapshotRepository,
+        respx_mock: MockRouter,
+    ) -> None:
+        people = [_person(i) for i in range(1, 13)]
+        pages = {'1': people[:10], '2': people[10:]}
+
+        def people_page(request: httpx.Request) -> httpx.Response:
+            page = request.url.params['page']
+            return httpx.Response(
+                HTTPStatus.OK,
+                json={'count': len(people), 'results': pages[page]},
+            )
+
+        respx_mock.get(urljoin(BASE_URL, 'people/')).mock(
+            side_effect=people_page
+        )
+        for resource in SwapiResource:
+            if resource is not SwapiResource.PEOPLE:
+                respx_mock.get(urljoin(BASE_URL, f'{resource.value}/')).mock(
+                    return_value=httpx.Response(
+                        HTTPStatus.OK, json={'count': 0, 'results': []}
+                    )
+                )
+        crawler = SnapshotCrawlerService(http_client, snapshot_repository)
+
+        total = await crawler.build_snapshot()
+
+        assert total == len(people)
+        assert snapshot_repository.list_records(SwapiResource.PEOPLE) == people
+        assert snapshot_repository.get_record('people', 12) == people[-1]
+
+
+class TestSnapshotStartup:
+    def test_snapshot_backend_loads_file_on_startup(self) -> None:
+        repository = MagicMock(spec=SnapshotRepository)
+
+        with (
+            patch('main.settings.SWAPI_BACKEND', 'snapshot'),
+            patch('main.get_snapshot_repository', return_value=repository),
+            TestClient(app),
+        ):
+            repository.load.assert_called_once()
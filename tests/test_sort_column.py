@@ -0,0 +1,20 @@
+import pytest
+
+from benchmarks.sort_benchmark import make_records, row_sort_positions
+from schemas.swapi_query_params_schema import SortOrder
+from services.sort_swapi_data_service import SortColumn
+
+
+class TestSortColumn:
+    @pytest.mark.parametrize('sort_order', list(SortOrder))
+    @pytest.mark.parametrize('sort_by', ['name', 'population'])
+    def test_columnar_sort_matches_row_sort(
+        self, sort_by: str, sort_order: SortOrder
+    ) -> None:
+        records = make_records(1_000)
+
+        column = SortColumn.from_records(records, sort_by)
+
+        assert column.argsort(sort_order) == row_sort_positions(
+            records, sort_by, sort_order
+        )
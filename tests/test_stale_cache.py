@@ -0,0 +1,137 @@
+import asyncio
+import time
+from http import HTTPStatus
+from urllib.parse import urljoin
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from infra.http_cache import cache_control
+from infra.single_flight import SingleFlight
+from repositories.cache_repository import CacheRepository
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from services.swapi_data_service import SwapiDataService
+from tests.conftest import BASE_URL
+from tests.mock_data import LUKE_SKYWALKER
+
+PERSON_URL = urljoin(urljoin(BASE_URL, 'people/'), '1')
+OLD_LUKE = LUKE_SKYWALKER | {'name': 'Old Luke'}
+
+
+async def cache_aged(
+    cache_repository: CacheRepository,
+    params: SwapiQueryParams,
+    age: float,
+) -> None:
+    now = time.time()
+    cache_repository.clock = lambda: now - age
+    await cache_repository.set(params, OLD_LUKE)
+    cache_repository.clock = time.time
+
+
+async def wait_for_refresh(single_flight: SingleFlight) -> None:
+    await asyncio.wait(single_flight._in_flight.values())  # noqa: SLF001
+
+
+class TestStaleWhileRevalidate:
+    params = SwapiQueryParams(resource=SwapiResource.PEOPLE, id=1)
+
+    async def test_should_serve_stale_and_refresh_in_background(
+        self,
+        service: SwapiDataService,
+        cache_repository: CacheRepository,
+        single_flight: SingleFlight,
+        mock_person_by_id: MockRouter,
+    ) -> None:
+        await cache_aged(
+            cache_repository, self.params, cache_repository.soft_ttl + 1
+        )
+
+        assert await service.get_swapi_data(self.params) == OLD_LUKE
+        assert service.cache_status == 'stale'
+
+        await wait_for_refresh(single_flight)
+        assert mock_person_by_id.calls.call_count == 1
+        assert await cache_repository.get(self.params) == LUKE_SKYWALKER
+
+    @pytest.mark.usefixtures('mock_person_by_id')
+    async def test_should_count_max_age_from_the_entry_age(
+        self, service: SwapiDataService, cache_repository: CacheRepository
+    ) -> None:
+        await cache_aged(cache_repository, self.params, 600)
+
+        body = await service.get_swapi_body(self.params)
+
+        assert cache_control(body.fresh_until) == (
+            f'private, max-age={cache_repository.soft_ttl - 600}'
+        )
+
+    @pytest.mark.usefixtures('mock_person_by_id')
+    async def test_should_send_zero_max_age_for_stale_entries(
+        self, service: SwapiDataService, cache_repository: CacheRepository
+    ) -> None:
+        await cache_aged(
+            cache_repository, self.params, cache_repository.soft_ttl + 1
+        )
+
+        body = await service.get_swapi_body(self.params)
+
+        assert cache_control(body.fresh_until) == 'private, max-age=0'
+
+    async def test_should_serve_fresh_entries_without_upstream(
+        self,
+        service: SwapiDataService,
+        cache_repository: CacheRepository,
+        mock_person_by_id: MockRouter,
+    ) -> None:
+        await cache_aged(cache_repository, self.params, 0)
+
+        assert await service.get_swapi_data(self.params) == OLD_LUKE
+        assert service.cache_status is None
+        assert mock_person_by_id.calls.call_count == 0
+
+    async def test_should_serve_expired_entry_on_upstream_failure(
+        self,
+        service: SwapiDataService,
+        cache_repository: CacheRepository,
+        respx_mock: MockRouter,
+    ) -> None:
+        respx_mock.get(PERSON_URL).mock(
+            return_value=httpx.Response(HTTPStatus.SERVICE_UNAVAILABLE)
+        )
+        await cache_aged(
+            cache_repository, self.params, cache_repository.hard_ttl + 1
+        )
+
+        assert await service.get_swapi_data(self.params) == OLD_LUKE
+        assert service.cache_status == 'stale-if-error'
+
+    @pytest.mark.usefixtures('mock_person_by_id')
+    async def test_should_replace_expired_entry_when_upstream_is_up(
+        self,
+        service: SwapiDataService,
+        cache_repository: CacheRepository,
+    ) -> None:
+        await cache_aged(
+            cache_repository, self.params, cache_repository.hard_ttl + 1
+        )
+
+        assert await service.get_swapi_data(self.params) == LUKE_SKYWALKER
+        assert service.cache_status is None
+
+    async def test_should_not_mask_client_errors_with_stale_data(
+        self,
+        service: SwapiDataService,
+        cache_repository: CacheRepository,
+        respx_mock: MockRouter,
+    ) -> None:
+        respx_mock.get(PERSON_URL).mock(
+            return_value=httpx.Response(HTTPStatus.NOT_FOUND)
+        )
+        await cache_aged(
+            cache_repository, self.params, cache_repository.hard_ttl + 1
+        )
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await service.get_swapi_data(self.params)
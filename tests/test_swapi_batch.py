@@ -0,0 +1,142 @@
+import asyncio
+import time
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from fakeredis.aioredis import FakeRedis as FakeAsyncRedis
+from fastapi.testclient import TestClient
+from respx import MockRouter
+
+from infra.single_flight import SingleFlight
+from repositories.cache_repository import CacheRepository
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from services.batch_swapi_data_service import BatchSwapiDataService
+from services.swapi_data_service import SwapiDataService
+from tests.mock_data import LUKE_SKYWALKER
+
+OLD_LUKE = LUKE_SKYWALKER | {'name': 'Old Luke'}
+
+
+class TestSwapiBatch:
+    API_URL = '/api/v1/swapi/batch'
+
+    @pytest.mark.usefixtures('mock_person_by_id', 'mock_not_found')
+    def test_should_return_results_in_request_order(
+        self, client: TestClient
+    ) -> None:
+        response = client.post(
+            self.API_URL,
+            json={
+                'queries': [
+                    {'resource': 'people', 'id': 999},
+                    {'resource': 'people', 'id': 1},
+                ]
+            },
+        )
+
+        assert response.status_code == HTTPStatus.OK.value
+        assert response.json()['results'] == [
+            {
+                'status': HTTPStatus.NOT_FOUND.value,
+                'data': None,
+                'error': 'NotFoundError',
+                'detail': HTTPStatus.NOT_FOUND.description,
+            },
+            {
+                'status': HTTPStatus.OK.value,
+                'data': LUKE_SKYWALKER,
+                'error': None,
+                'detail': None,
+            },
+        ]
+
+    def test_should_resolve_duplicate_queries_once(
+        self, client: TestClient, mock_person_by_id: MockRouter
+    ) -> None:
+        query = {'resource': 'people', 'id': 1}
+
+        response = client.post(self.API_URL, json={'queries': [query] * 3})
+
+        results = response.json()['results']
+        assert [result['data'] for result in results] == [LUKE_SKYWALKER] * 3
+        assert mock_person_by_id.calls.call_count == 1
+
+    def test_should_reject_empty_batch(self, client: TestClient) -> None:
+        response = client.post(self.API_URL, json={'queries': []})
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_CONTENT.value
+
+    @pytest.mark.usefixtures('mock_person_by_id')
+    def test_should_report_invalid_query_in_its_slot(
+        self, client: TestClient
+    ) -> None:
+        response = client.post(
+            self.API_URL,
+            json={
+                'queries': [
+                    {'resource': 'people', 'id': 1, 'page': 2},
+                    {'resource': 'people', 'id': 1},
+                ]
+            },
+        )
+
+        invalid, valid = response.json()['results']
+        assert response.status_code == HTTPStatus.OK.value
+        assert invalid['status'] == HTTPStatus.UNPROCESSABLE_CONTENT.value
+        assert invalid['error'] == 'RequestValidationError'
+        assert invalid['detail'][0]['type'] == 'value_error'
+        assert valid['data'] == LUKE_SKYWALKER
+
+    async def test_should_refresh_stale_cached_queries(
+        self,
+        service: SwapiDataService,
+        cache_repository: CacheRepository,
+        single_flight: SingleFlight,
+        mock_person_by_id: MockRouter,
+    ) -> None:
+        query = SwapiQueryParams(resource=SwapiResource.PEOPLE, id=1)
+        now = time.time()
+        cache_repository.clock = lambda: now - cache_repository.soft_ttl - 1
+        await cache_repository.set(query, OLD_LUKE)
+        cache_repository.clock = time.time
+        batch_service = BatchSwapiDataService(
+            swapi_service=service, cache_repository=cache_repository
+        )
+
+        batch = await batch_service.get_batch([query])
+
+        assert batch.results[0].data == OLD_LUKE
+        await asyncio.gather(*single_flight._in_flight.values())  # noqa: SLF001
+        assert mock_person_by_id.calls.call_count == 1
+        assert await cache_repository.get(query) == LUKE_SKYWALKER
+
+    @pytest.mark.usefixtures('mock_person_by_id')
+    async def test_should_read_cache_with_single_mget(
+        self,
+        service: SwapiDataService,
+        cache_repository: CacheRepository,
+        redis_client: FakeAsyncRedis,
+    ) -> None:
+        cached_query = SwapiQueryParams(resource=SwapiResource.PLANETS, id=1)
+        await cache_repository.set(cached_query, {'name': 'Tatooine'})
+        cache_repository.memory_cache.clear()
+        batch_service = BatchSwapiDataService(
+            swapi_service=service, cache_repository=cache_repository
+        )
+
+        with patch.object(
+            redis_client, 'mget', wraps=redis_client.mget
+        ) as mget:
+            batch = await batch_service.get_batch(
+                [
+                    cached_query,
+                    SwapiQueryParams(resource=SwapiResource.PEOPLE, id=1),
+                ]
+            )
+
+        assert [item.data for item in batch.results] == [
+            {'name': 'Tatooine'},
+            LUKE_SKYWALKER,
+        ]
+        mget.assert_called_once()
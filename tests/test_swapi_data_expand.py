@@ -1,8 +1,17 @@
+import asyncio
 from http import HTTPStatus
+from typing import Any
+from urllib.parse import urljoin
 
+import httpx
 import pytest
+from fakeredis.aioredis import FakeRedis as FakeAsyncRedis
 from fastapi.testclient import TestClient
+from respx import MockRouter
 
+from schemas.swapi_query_params_schema import SwapiQueryParams, SwapiResource
+from services.swapi_data_service import SwapiDataService
+from tests.conftest import BASE_URL
 from tests.mock_data import (
     FILM_1,
     FILM_2,
@@ -93,3 +102,134 @@ class TestSwapiDataExpand:
         assert data['films'] == [FILM_1, FILM_2]
         assert data['vehicles'] == ['https://swapi.dev/api/vehicles/14/']
         assert data['starships'] == ['https://swapi.dev/api/starships/12/']
+
+
+@pytest.mark.usefixtures('mock_people_for_sort')
+class TestExpandResourceCache:
+    def _linked_calls(self, respx_mock: MockRouter) -> list[str]:
+        people_list_url = urljoin(BASE_URL, 'people/')
+        return [
+            str(call.request.url)
+            for call in respx_mock.calls
+            if str(call.request.url) != people_list_url
+        ]
+
+    @pytest.mark.usefixtures('mock_linked_resources')
+    async def test_should_fetch_each_linked_url_once_per_response(
+        self, service: SwapiDataService, respx_mock: MockRouter
+    ) -> None:
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE, expand='all')
+
+        data = await service.get_swapi_data(params)
+
+        calls = self._linked_calls(respx_mock)
+        assert len(calls) == len(set(calls))
+        luke = data['results'][0]  # type: ignore[index]
+        assert luke['homeworld'] == {'url': 'https://swapi.dev/api/planets/1/'}
+
+    @pytest.mark.usefixtures('mock_linked_resources')
+    async def test_should_resolve_linked_urls_from_resource_cache(
+        self, service: SwapiDataService, respx_mock: MockRouter
+    ) -> None:
+        await service.get_swapi_data(
+            SwapiQueryParams(resource=SwapiResource.PEOPLE, expand='all')
+        )
+        calls_after_first = len(self._linked_calls(respx_mock))
+
+        await service.get_swapi_data(
+            SwapiQueryParams(
+                resource=SwapiResource.PEOPLE, expand='films,homeworld'
+            )
+        )
+
+        assert len(self._linked_calls(respx_mock)) == calls_after_first
+
+    @pytest.mark.usefixtures('mock_linked_resources')
+    async def test_should_store_linked_resources_in_own_namespace(
+        self, service: SwapiDataService, redis_client: FakeAsyncRedis
+    ) -> None:
+        await service.get_swapi_data(
+            SwapiQueryParams(resource=SwapiResource.PEOPLE, expand='homeworld')
+        )
+
+        keys = await redis_client.keys('swapi:v1:resource:*')
+        assert sorted(keys) == [
+            'swapi:v1:resource:planets:1',
+            'swapi:v1:resource:planets:28',
+        ]
+
+
+@pytest.mark.usefixtures('mock_people_for_sort')
+class TestExpandBudget:
+    def _errors(self, data: dict[str, Any]) -> list[str]:
+        return [
+            resource['error']
+            for person in data['results']
+            for value in person.values()
+            for resource in (value if isinstance(value, list) else [value])
+            if isinstance(resource, dict) and 'error' in resource
+        ]
+
+    async def test_should_bound_concurrent_fetches(
+        self, service: SwapiDataService, respx_mock: MockRouter
+    ) -> None:
+        running = 0
+        peak = 0
+
+        async def slow_resource(request: httpx.Request) -> httpx.Response:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return httpx.Response(
+                HTTPStatus.OK, json={'url': str(request.url)}
+            )
+
+        respx_mock.get(url__regex=r'^https://swapi\.dev/api/\w+/\d+/$').mock(
+            side_effect=slow_resource
+        )
+        service.expand_service.semaphore = asyncio.Semaphore(2)
+
+        data = await service.get_swapi_data(
+            SwapiQueryParams(resource=SwapiResource.PEOPLE, expand='all')
+        )
+
+        assert peak == 2  # noqa: PLR2004
+        assert self._errors(data) == []
+
+    @pytest.mark.usefixtures('mock_linked_resources')
+    async def test_should_mark_links_over_fanout_budget(
+        self, service: SwapiDataService, respx_mock: MockRouter
+    ) -> None:
+        service.expand_service.max_fanout = 3
+        params = SwapiQueryParams(resource=SwapiResource.PEOPLE, expand='all')
+
+        data = await service.get_swapi_data(params)
+
+        errors = self._errors(data)
+        assert errors
+        assert set(errors) == {'Expansion budget exceeded'}
+        linked_calls = respx_mock.calls.call_count - 1
+        assert linked_calls == 3  # noqa: PLR2004
+        assert await service.cache_repository.get_response(params) is None
+
+    async def test_should_mark_links_past_deadline(
+        self, service: SwapiDataService, respx_mock: MockRouter
+    ) -> None:
+        async def stalled_resource(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(1)
+            return httpx.Response(
+                HTTPStatus.OK, json={'url': str(request.url)}
+            )
+
+        respx_mock.get(url__regex=r'^https://swapi\.dev/api/\w+/\d+/$').mock(
+            side_effect=stalled_resource
+        )
+        service.expand_service.timeout = 0.01
+
+        data = await service.get_swapi_data(
+            SwapiQueryParams(resource=SwapiResource.PEOPLE, expand='homeworld')
+        )
+
+        assert set(self._errors(data)) == {'Expansion deadline exceeded'}